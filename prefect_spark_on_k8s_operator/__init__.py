@@ -1,9 +1,21 @@
 from . import _version
+from prefect_spark_on_k8s_operator.admission import (  # noqa F401
+    AdmissionPolicy,
+)
 from prefect_spark_on_k8s_operator.app import (  # noqa F401
     SparkApplication,
 )
 from prefect_spark_on_k8s_operator.flows import (  # noqa F401
     run_spark_application,
 )
+from prefect_spark_on_k8s_operator.limiter import (  # noqa F401
+    RateLimit,
+)
+from prefect_spark_on_k8s_operator.polling import (  # noqa F401
+    PollingPolicy,
+)
+from prefect_spark_on_k8s_operator.workers import (  # noqa F401
+    configure_io_executor,
+)
 
 __version__ = _version.get_versions()["version"]
@@ -0,0 +1,762 @@
+"""Module to admit spark applications once the cluster can likely run them"""
+
+import asyncio
+import threading
+from collections import deque
+from time import monotonic
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from kubernetes.client.exceptions import ApiException
+from kubernetes.utils import parse_quantity
+from prefect.logging import get_logger
+from prefect_kubernetes.credentials import KubernetesCredentials
+from pydantic import BaseModel, Field
+
+from prefect_spark_on_k8s_operator.client import (
+    acquire_client_session,
+    get_credentials_key,
+    release_client_session,
+)
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.limiter import RateLimit
+
+constants = model()
+
+logger = get_logger("prefect_spark_on_k8s_operator.admission")
+
+
+class AdmissionPolicy(BaseModel):
+    """When the applications of a namespace are admitted for submission.
+    `trigger` holds an application in a process-wide queue until the resources
+    estimated from its spec likely fit in the free allocatable of the nodes and
+    in the `ResourceQuota` of the namespace, so that the applications don't
+    pile up in SUBMITTED with pending pods.
+
+    Attributes:
+        check_nodes:
+            Whether the free allocatable of the ready, schedulable nodes is
+            checked. Requires listing the nodes and the pods of the cluster,
+            it is skipped with a warning if forbidden. Defaults to `True`.
+        check_quota:
+            Whether the `ResourceQuota` of the namespace is checked.
+            Defaults to `True`.
+        headroom:
+            The fraction of the allocatable of each node kept free.
+            Defaults to `0.1`.
+        refresh_interval_seconds:
+            The number of seconds a read of the capacity of the cluster is used
+            for by the queued applications. Defaults to `10` seconds.
+        reservation_ttl_seconds:
+            The number of seconds the resources of an admitted application are
+            reserved for at most, in case its run isn't waited for.
+            Defaults to `600` seconds.
+        max_wait_seconds:
+            The number of seconds an application is held for before being
+            admitted anyway. Defaults to `None`, which holds it until it fits.
+    """
+
+    check_nodes: bool = Field(
+        default=True,
+        description="Whether the free allocatable of the ready, schedulable nodes "
+        "is checked.",
+    )
+    check_quota: bool = Field(
+        default=True,
+        description="Whether the `ResourceQuota` of the namespace is checked.",
+    )
+    headroom: float = Field(
+        default=0.1,
+        description="The fraction of the allocatable of each node kept free.",
+    )
+    refresh_interval_seconds: float = Field(
+        default=10,
+        description="The number of seconds a read of the capacity of the cluster "
+        "is used for by the queued applications.",
+    )
+    reservation_ttl_seconds: float = Field(
+        default=600,
+        description="The number of seconds the resources of an admitted "
+        "application are reserved for at most.",
+    )
+    max_wait_seconds: Optional[float] = Field(
+        default=None,
+        description="The number of seconds an application is held for before "
+        "being admitted anyway.",
+    )
+
+
+class ResourceEstimate(NamedTuple):
+    """The resources requested by the pods of a spark application.
+
+    Attributes:
+        cpu: The cores requested by the driver and the executors.
+        memory: The bytes of memory requested by the driver and the executors,
+            overhead included.
+        cpu_limit: The cores the driver and the executors are limited to.
+        pods: The number of pods, the driver and the initial executors.
+        pod_cpu: The cores requested by the largest pod.
+        pod_memory: The bytes of memory requested by the largest pod.
+    """
+
+    cpu: float
+    memory: float
+    cpu_limit: float
+    pods: int
+    pod_cpu: float
+    pod_memory: float
+
+    def quota_usage(self) -> Dict[str, float]:
+        """Returns the usage of the application, one sparkapplication included,
+        by the names of the estimate of `QUOTA_RESOURCES`.
+        """
+        return {
+            "cpu": self.cpu,
+            "cpu_limit": self.cpu_limit,
+            "memory": self.memory,
+            "pods": self.pods,
+            "applications": 1,
+        }
+
+
+def parse_jvm_memory(value: Any) -> float:
+    """Parses a JVM memory string as used by spark, e.g. `512m` or `2g`, into
+    bytes. A number without unit is a number of mebibytes.
+    """
+    value = str(value).strip().lower()
+    if value.endswith("b"):
+        value = value[:-1]
+    unit = value[-1:]
+    if unit in constants.JVM_MEMORY_UNITS:
+        return float(value[:-1]) * constants.JVM_MEMORY_UNITS[unit]
+    return float(value) * constants.JVM_MEMORY_UNITS["m"]
+
+
+def _estimate_pod(
+    pod_spec: Dict[str, Any], overhead_factor: float
+) -> Tuple[float, float, float]:
+    """Returns the requested cores, memory and cores limit of a driver or an
+    executor pod from its spec.
+    """
+    cores = pod_spec.get(constants.CORES) or constants.DEFAULT_CORES
+    cpu = float(parse_quantity(pod_spec.get(constants.CORE_REQUEST) or cores))
+    cpu_limit = pod_spec.get(constants.CORE_LIMIT)
+    memory = parse_jvm_memory(
+        pod_spec.get(constants.MEMORY) or constants.DEFAULT_MEMORY
+    )
+    memory_overhead = pod_spec.get(constants.MEMORY_OVERHEAD)
+    if memory_overhead:
+        memory += parse_jvm_memory(memory_overhead)
+    else:
+        memory += max(memory * overhead_factor, constants.MIN_MEMORY_OVERHEAD)
+    return (
+        cpu,
+        memory,
+        max(float(parse_quantity(cpu_limit)), cpu) if cpu_limit else cpu,
+    )
+
+
+def estimate_resources(manifest: Dict[str, Any]) -> ResourceEstimate:
+    """Estimates the resources requested by the pods of a spark application
+    from its spec, as the spark-on-k8s-operator would submit them: the cores
+    or `coreRequest`, and the memory plus its overhead, of the driver and of the
+    initial executors of the application.
+
+    Args:
+        manifest: The manifest of the application.
+
+    Returns:
+        The estimated resources.
+    """
+    spec = manifest.get(constants.SPEC) or {}
+    overhead_factor = spec.get(constants.MEMORY_OVERHEAD_FACTOR)
+    if overhead_factor is not None:
+        overhead_factor = float(overhead_factor)
+    elif spec.get(constants.TYPE) in constants.NON_JVM_TYPES:
+        overhead_factor = constants.NON_JVM_MEMORY_OVERHEAD_FACTOR
+    else:
+        overhead_factor = constants.DEFAULT_MEMORY_OVERHEAD_FACTOR
+
+    executor_spec = spec.get(constants.EXECUTOR) or {}
+    dynamic_allocation = spec.get(constants.DYNAMIC_ALLOCATION) or {}
+    if dynamic_allocation.get(constants.ENABLED):
+        executors = max(
+            executor_spec.get(constants.INSTANCES) or 0,
+            dynamic_allocation.get(constants.INITIAL_EXECUTORS) or 0,
+            dynamic_allocation.get(constants.MIN_EXECUTORS) or 0,
+        )
+    else:
+        executors = executor_spec.get(constants.INSTANCES)
+        if executors is None:
+            executors = 1
+
+    driver = _estimate_pod(spec.get(constants.DRIVER) or {}, overhead_factor)
+    executor = _estimate_pod(executor_spec, overhead_factor)
+    return ResourceEstimate(
+        cpu=driver[0] + executors * executor[0],
+        memory=driver[1] + executors * executor[1],
+        cpu_limit=driver[2] + executors * executor[2],
+        pods=1 + executors,
+        pod_cpu=max(driver[0], executor[0]) if executors else driver[0],
+        pod_memory=max(driver[1], executor[1]) if executors else driver[1],
+    )
+
+
+def _get_pod_requests(pod) -> Tuple[float, float]:
+    """Returns the cores and memory requested by a pod, as counted by the
+    scheduler: its containers, or its largest init container, plus its overhead.
+    """
+
+    def _requests(container) -> Tuple[float, float]:
+        resources = container.resources
+        requests = (resources and (resources.requests or resources.limits)) or {}
+        return (
+            float(parse_quantity(requests.get("cpu", 0))),
+            float(parse_quantity(requests.get("memory", 0))),
+        )
+
+    containers = [_requests(container) for container in pod.spec.containers or []]
+    cpu = sum(container[0] for container in containers)
+    memory = sum(container[1] for container in containers)
+    for init_container in pod.spec.init_containers or []:
+        init_cpu, init_memory = _requests(init_container)
+        cpu, memory = max(cpu, init_cpu), max(memory, init_memory)
+    overhead = pod.spec.overhead or {}
+    cpu += float(parse_quantity(overhead.get("cpu", 0)))
+    memory += float(parse_quantity(overhead.get("memory", 0)))
+    return cpu, memory
+
+
+def _is_schedulable(node) -> bool:
+    """Returns whether pods can be scheduled on a node."""
+    if node.spec is not None and node.spec.unschedulable:
+        return False
+    return any(
+        condition.type == constants.NODE_READY
+        and condition.status == constants.CONDITION_TRUE
+        for condition in (node.status.conditions or [])
+    )
+
+
+class ClusterCapacity(NamedTuple):
+    """The capacity of the cluster read by an `AdmissionController`.
+
+    Attributes:
+        read_at: The monotonic time the read started at.
+        allocatable: The allocatable cores and memory of the schedulable nodes,
+            less the headroom, None if the nodes aren't checked.
+        free: The free cores and memory of the schedulable nodes, their
+            allocatable less the requests of their pods.
+        pending: The cores and memory requested by the pods not scheduled yet.
+        quota_hard: The lowest hard limit of the `ResourceQuota` of the
+            namespace by the names of the estimate of `QUOTA_RESOURCES`.
+        quota_free: The lowest free quota by the same names.
+    """
+
+    read_at: float
+    allocatable: Optional[List[Tuple[float, float]]] = None
+    free: Optional[List[Tuple[float, float]]] = None
+    pending: Tuple[float, float] = (0.0, 0.0)
+    quota_hard: Optional[Dict[str, float]] = None
+    quota_free: Optional[Dict[str, float]] = None
+
+
+def get_node_capacity(
+    nodes: Iterable, pods: Iterable, headroom: float = 0.0
+) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]], Tuple[float, float]]:
+    """Computes the allocatable and free cores and memory of the schedulable
+    nodes, and the requests of the pods not scheduled yet.
+
+    Args:
+        nodes: The `V1Node` of the cluster.
+        pods: The `V1Pod` of the cluster which are neither succeeded nor failed.
+        headroom: The fraction of the allocatable of each node kept free.
+
+    Returns:
+        The allocatable and free cores and memory of each schedulable node, and
+        the cores and memory requested by the pending pods.
+    """
+    allocatable = {}
+    for node in nodes:
+        if not _is_schedulable(node):
+            continue
+        node_allocatable = node.status.allocatable or {}
+        allocatable[node.metadata.name] = (
+            float(parse_quantity(node_allocatable.get("cpu", 0))) * (1 - headroom),
+            float(parse_quantity(node_allocatable.get("memory", 0))) * (1 - headroom),
+        )
+    requested = {name: [0.0, 0.0] for name in allocatable}
+    pending = [0.0, 0.0]
+    for pod in pods:
+        cpu, memory = _get_pod_requests(pod)
+        node_name = pod.spec.node_name
+        if node_name is None:
+            pending[0] += cpu
+            pending[1] += memory
+        elif node_name in requested:
+            requested[node_name][0] += cpu
+            requested[node_name][1] += memory
+    free = [
+        (
+            max(allocatable[name][0] - requested[name][0], 0.0),
+            max(allocatable[name][1] - requested[name][1], 0.0),
+        )
+        for name in allocatable
+    ]
+    return list(allocatable.values()), free, (pending[0], pending[1])
+
+
+def get_quota_capacity(
+    quotas: Iterable,
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Computes the lowest hard limit and free quota of the `ResourceQuota` of
+    a namespace by the names of the estimate of `QUOTA_RESOURCES`.
+
+    Args:
+        quotas: The `V1ResourceQuota` of the namespace.
+
+    Returns:
+        The hard limits and the free quota.
+    """
+    quota_hard, quota_free = {}, {}
+    for quota in quotas:
+        status = quota.status
+        hard = (status and status.hard) or (quota.spec and quota.spec.hard) or {}
+        used = (status and status.used) or {}
+        for resource, limit in hard.items():
+            name = constants.QUOTA_RESOURCES.get(resource)
+            if name is None:
+                continue
+            limit = float(parse_quantity(limit))
+            free = limit - float(parse_quantity(used.get(resource, 0)))
+            quota_hard[name] = min(quota_hard.get(name, limit), limit)
+            quota_free[name] = min(quota_free.get(name, free), free)
+    return quota_hard, quota_free
+
+
+def get_shortage(
+    estimate: ResourceEstimate,
+    capacity: ClusterCapacity,
+    reserved: Iterable[ResourceEstimate] = (),
+) -> Optional[str]:
+    """Checks whether an application likely fits in the capacity of the cluster
+    left by the reserved applications.
+
+    Returns:
+        The reason the application doesn't fit, or None if it fits.
+    """
+    reserved = list(reserved)
+    if capacity.free is not None:
+        if not any(
+            cpu >= estimate.pod_cpu and memory >= estimate.pod_memory
+            for cpu, memory in capacity.free
+        ):
+            return "no node has room for its largest pod"
+        free_cpu = (
+            sum(cpu for cpu, _ in capacity.free)
+            - capacity.pending[0]
+            - sum(reservation.cpu for reservation in reserved)
+        )
+        free_memory = (
+            sum(memory for _, memory in capacity.free)
+            - capacity.pending[1]
+            - sum(reservation.memory for reservation in reserved)
+        )
+        if estimate.cpu > free_cpu:
+            return f"{estimate.cpu:g} cores requested, {free_cpu:g} free on the nodes"
+        if estimate.memory > free_memory:
+            return (
+                f"{estimate.memory / 2**20:.0f}Mi of memory requested, "
+                f"{free_memory / 2**20:.0f}Mi free on the nodes"
+            )
+    if capacity.quota_free is not None:
+        for name, usage in estimate.quota_usage().items():
+            if name not in capacity.quota_free:
+                continue
+            free = capacity.quota_free[name] - sum(
+                reservation.quota_usage()[name] for reservation in reserved
+            )
+            if usage > free:
+                return f"{usage:g} {name} requested, {free:g} left in the quota"
+    return None
+
+
+def fits_ever(estimate: ResourceEstimate, capacity: ClusterCapacity) -> bool:
+    """Returns whether an application fits in the cluster once it is empty."""
+    empty = capacity._replace(
+        free=capacity.allocatable,
+        pending=(0.0, 0.0),
+        quota_free=capacity.quota_hard,
+    )
+    return get_shortage(estimate, empty) is None
+
+
+class Reservation:
+    """The resources reserved for an admitted application until they are
+    accounted for in the capacity read from the cluster.
+
+    Args:
+        estimate: The reserved resources.
+        on_release: Called once the reservation is released.
+    """
+
+    def __init__(
+        self,
+        estimate: ResourceEstimate,
+        on_release: Optional[Callable[[], None]] = None,
+    ):
+        self.estimate = estimate
+        self.admitted_at = monotonic()
+        self.released_at: Optional[float] = None
+        self._on_release = on_release
+
+    def release(self):
+        """Releases the reservation once the pods of the application are
+        scheduled, or the application ended or wasn't created. The resources
+        stay reserved until the next read of the capacity of the cluster.
+        """
+        if self.released_at is None:
+            self.released_at = monotonic()
+            if self._on_release is not None:
+                self._on_release()
+
+
+class _Waiter:
+    """An application queued for admission, woken up from any thread on the
+    event loop it waits on.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def wake(self):
+        """Wakes the waiter up."""
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # the event loop of the waiter is already closed.
+            pass
+
+    async def wait(self, timeout: Optional[float] = None):
+        """Waits to be woken up, for up to `timeout` seconds."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+
+
+class AdmissionController:
+    """A queue of the applications to submit to a namespace, admitting them in
+    order once their estimated resources likely fit in the capacity of the
+    cluster, so that the submissions keep pace with what the cluster can
+    schedule instead of flooding the scheduler and the operator.
+
+    Only the application at the head of the queue checks the capacity, the
+    others sleep until they reach the head. The head is woken up when a
+    reservation is released, and otherwise sleeps until the capacity it read is
+    stale, a reservation expires or it waited for `max_wait_seconds`. The
+    capacity is read at most every `refresh_interval_seconds` while
+    applications are queued. The resources of the admitted applications are
+    reserved until their pods are scheduled, as the capacity read meanwhile
+    doesn't account for them yet. A failure to read the capacity admits the
+    applications rather than holding them.
+
+    Args:
+        credentials: The credentials of the cluster.
+        namespace: The namespace of the applications.
+        policy: When the applications are admitted.
+        client_backend: The client reading the capacity of the cluster.
+        rate_limit: The rate limit of the reads.
+    """
+
+    def __init__(
+        self,
+        credentials: KubernetesCredentials,
+        namespace: str,
+        policy: Optional[AdmissionPolicy] = None,
+        client_backend: str = "threaded",
+        rate_limit: Optional[RateLimit] = None,
+    ):
+        self.policy = policy or AdmissionPolicy()
+        self._credentials = credentials
+        self._namespace = namespace
+        self._client_backend = client_backend
+        self._rate_limit = rate_limit
+        self._lock = threading.Lock()
+        self._queue: Deque[_Waiter] = deque()
+        self._reservations: List[Reservation] = []
+        self._capacity: Optional[ClusterCapacity] = None
+        self._refreshing = False
+        self._check_nodes = self.policy.check_nodes
+        self._counters: Dict[str, float] = {
+            "admitted": 0,
+            "admitted_unfit": 0,
+            "reads": 0,
+            "waited_seconds": 0.0,
+        }
+
+    @property
+    def counters(self) -> Dict[str, float]:
+        """A copy of the counters of the controller: the `admitted`
+        applications, those of them admitted without fitting
+        (`admitted_unfit`), the `reads` of the capacity and the
+        `waited_seconds` of the admitted applications in the queue.
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    @property
+    def queued(self) -> int:
+        """The number of applications waiting to be admitted."""
+        with self._lock:
+            return len(self._queue)
+
+    async def admit(self, manifest: Dict[str, Any]) -> Reservation:
+        """Waits for an application to be admitted, after the applications
+        queued before it.
+
+        Args:
+            manifest: The manifest of the application.
+
+        Returns:
+            The reservation of the resources of the application, to release
+            once its pods are scheduled.
+        """
+        estimate = estimate_resources(manifest)
+        waiter = _Waiter()
+        queued_at = monotonic()
+        with self._lock:
+            self._queue.append(waiter)
+        shortage = None
+        try:
+            while True:
+                with self._lock:
+                    is_head = self._queue[0] is waiter
+                if not is_head:
+                    await waiter.wait()
+                    continue
+                await self._refresh()
+                with self._lock:
+                    if self._capacity is not None:
+                        reason = self._admit(estimate, queued_at)
+                        if reason is None:
+                            reservation = Reservation(estimate, self._wake_head)
+                            self._reservations.append(reservation)
+                            self._queue.popleft()
+                            self._counters["admitted"] += 1
+                            self._counters["waited_seconds"] += monotonic() - queued_at
+                            return reservation
+                        if reason != shortage:
+                            shortage = reason
+                            logger.info(f"Holding the submission: {reason}.")
+                    timeout = self._until_next_check(queued_at)
+                await waiter.wait(timeout)
+        finally:
+            with self._lock:
+                if waiter in self._queue:
+                    self._queue.remove(waiter)
+                # the next application may be at the head now.
+                if self._queue:
+                    self._queue[0].wake()
+
+    def _wake_head(self):
+        """Wakes the application at the head of the queue up, if any."""
+        with self._lock:
+            if self._queue:
+                self._queue[0].wake()
+
+    def _until_next_check(self, queued_at: float) -> float:
+        """Returns the number of seconds the head of the queue sleeps for before
+        checking the capacity again, unless woken up.
+        """
+        now = monotonic()
+        deadlines = [
+            reservation.admitted_at + self.policy.reservation_ttl_seconds
+            for reservation in self._reservations
+        ]
+        if self._capacity is not None:
+            deadlines.append(
+                self._capacity.read_at + self.policy.refresh_interval_seconds
+            )
+        if self.policy.max_wait_seconds is not None:
+            deadlines.append(queued_at + self.policy.max_wait_seconds)
+        return max(min(deadlines, default=now) - now, constants.ADMISSION_CHECK_SECONDS)
+
+    def _admit(self, estimate: ResourceEstimate, queued_at: float) -> Optional[str]:
+        """Returns why the application at the head of the queue can't be
+        admitted yet, or None if it is admitted.
+        """
+        now = monotonic()
+        capacity = self._capacity
+        # the capacity accounts for the pods of the reservations released before
+        # the read, and expired reservations are forgotten.
+        self._reservations = [
+            reservation
+            for reservation in self._reservations
+            if (
+                reservation.released_at is None
+                or reservation.released_at >= capacity.read_at
+            )
+            and now - reservation.admitted_at < self.policy.reservation_ttl_seconds
+        ]
+        shortage = get_shortage(
+            estimate,
+            capacity,
+            [reservation.estimate for reservation in self._reservations],
+        )
+        if shortage is None:
+            return None
+        if not fits_ever(estimate, capacity):
+            logger.warning(
+                "Admitting an application which doesn't fit in the cluster: "
+                f"{shortage}."
+            )
+        elif (
+            self.policy.max_wait_seconds is not None
+            and now - queued_at >= self.policy.max_wait_seconds
+        ):
+            logger.warning(
+                f"Admitting an application held for more than "
+                f"{self.policy.max_wait_seconds} seconds: {shortage}."
+            )
+        else:
+            return shortage
+        self._counters["admitted_unfit"] += 1
+        return None
+
+    async def _refresh(self):
+        """Reads the capacity of the cluster if the last read is stale and no
+        other read is in flight.
+        """
+        with self._lock:
+            if self._refreshing or (
+                self._capacity is not None
+                and monotonic() - self._capacity.read_at
+                < self.policy.refresh_interval_seconds
+            ):
+                return
+            self._refreshing = True
+        capacity = None
+        try:
+            capacity = await self._read_capacity()
+        except Exception as exc:
+            logger.warning(f"Failed to read the capacity of the cluster: {exc!r}")
+            capacity = ClusterCapacity(read_at=monotonic())
+        finally:
+            with self._lock:
+                self._refreshing = False
+                if capacity is not None:
+                    self._capacity = capacity
+                    self._counters["reads"] += 1
+
+    async def _read_capacity(self) -> ClusterCapacity:
+        """Reads the nodes, the active pods and the `ResourceQuota` as per the
+        policy.
+        """
+        read_at = monotonic()
+        capacity = ClusterCapacity(read_at=read_at)
+        session = acquire_client_session(
+            self._credentials, self._client_backend, self._rate_limit
+        )
+        try:
+            if self._check_nodes:
+                try:
+                    nodes = await self._list(session, "list_node")
+                    pods = await self._list(
+                        session,
+                        "list_pod_for_all_namespaces",
+                        field_selector=constants.ACTIVE_POD_FIELD_SELECTOR,
+                    )
+                except ApiException as exc:
+                    if exc.status != constants.HTTP_FORBIDDEN:
+                        raise
+                    logger.warning(
+                        "Not allowed to list the nodes and pods of the cluster, "
+                        "only the quota of the namespace is checked."
+                    )
+                    self._check_nodes = False
+                else:
+                    allocatable, free, pending = get_node_capacity(
+                        nodes, pods, self.policy.headroom
+                    )
+                    capacity = capacity._replace(
+                        allocatable=allocatable, free=free, pending=pending
+                    )
+            if self.policy.check_quota:
+                quotas = await self._list(
+                    session,
+                    "list_namespaced_resource_quota",
+                    namespace=self._namespace,
+                )
+                quota_hard, quota_free = get_quota_capacity(quotas)
+                if quota_hard:
+                    capacity = capacity._replace(
+                        quota_hard=quota_hard, quota_free=quota_free
+                    )
+        finally:
+            await release_client_session(session)
+        return capacity
+
+    async def _list(self, session, method: str, **kwargs) -> List:
+        """Lists all the items of a core resource, page by page."""
+        items, _continue = [], None
+        while True:
+            if _continue:
+                kwargs["_continue"] = _continue
+            result = await session.call(
+                constants.CORE_CLIENT,
+                method,
+                limit=constants.LIST_PAGE_SIZE,
+                **kwargs,
+            )
+            items.extend(result.items)
+            _continue = result.metadata._continue
+            if not _continue:
+                return items
+
+
+_admission_controllers: Dict[Tuple[str, str], AdmissionController] = {}
+_admission_controllers_lock = threading.Lock()
+
+
+def get_admission_controller(
+    credentials: KubernetesCredentials,
+    namespace: str,
+    policy: Optional[AdmissionPolicy] = None,
+    client_backend: str = "threaded",
+    rate_limit: Optional[RateLimit] = None,
+) -> AdmissionController:
+    """Returns the process-wide admission controller of a namespace, creating
+    it on first use. The policy given on first use applies to all the
+    applications submitted to the namespace.
+
+    Args:
+        credentials: The credentials of the cluster.
+        namespace: The namespace of the applications.
+        policy: The policy of the controller created on first use.
+            Defaults to `AdmissionPolicy()`.
+        client_backend: The client of the controller created on first use.
+        rate_limit: The rate limit of the controller created on first use.
+
+    Returns:
+        The shared `AdmissionController` of the namespace.
+    """
+    key = (get_credentials_key(credentials), namespace)
+    with _admission_controllers_lock:
+        controller = _admission_controllers.get(key)
+        if controller is None:
+            controller = _admission_controllers[key] = AdmissionController(
+                credentials, namespace, policy, client_backend, rate_limit
+            )
+        return controller
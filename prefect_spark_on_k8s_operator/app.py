@@ -1,26 +1,82 @@
 """Module to define SparkApplication and monitor its Run"""
 
+import asyncio
+import copy
 import random
 import string
+import uuid
 from asyncio import sleep
+from datetime import datetime, timezone
 from pathlib import Path
-from time import perf_counter
-from typing import Any, Dict, List, Optional, Type, Union
+from time import monotonic, perf_counter
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import yaml
+from kubernetes.client.exceptions import ApiException
+from kubernetes.client.models import V1DeleteOptions
 from prefect.blocks.abstract import JobBlock, JobRun
+from prefect.context import FlowRunContext, TaskRunContext
 from prefect.utilities.asyncutils import sync_compatible
 from prefect_kubernetes.credentials import KubernetesCredentials
-from prefect_kubernetes.custom_objects import (
-    create_namespaced_custom_object,
-    delete_namespaced_custom_object,
-    get_namespaced_custom_object_status,
-)
-from prefect_kubernetes.pods import list_namespaced_pod, read_namespaced_pod_log
-from pydantic import Field
-from typing_extensions import Self
+from pydantic import Field, PrivateAttr
+from typing_extensions import Literal, Self
 
+from prefect_spark_on_k8s_operator.admission import (
+    AdmissionController,
+    AdmissionPolicy,
+    get_admission_controller,
+)
+from prefect_spark_on_k8s_operator.client import (
+    ClientSession,
+    acquire_client_session,
+    get_credentials_key,
+    release_client_session,
+)
 from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.decode import decode_status
+from prefect_spark_on_k8s_operator.events import (
+    CleanedUp,
+    DriverAssigned,
+    ExecutorsChanged,
+    RunEvent,
+    StateChanged,
+    TerminalStateReached,
+)
+from prefect_spark_on_k8s_operator.executors import ExecutorProgress
+from prefect_spark_on_k8s_operator.hooks import HookDispatcher
+from prefect_spark_on_k8s_operator.limiter import (
+    RateLimit,
+    RateLimiter,
+    get_rate_limiter,
+)
+from prefect_spark_on_k8s_operator.polling import DurationPrediction, PollingPolicy
+from prefect_spark_on_k8s_operator.status import (
+    SparkApplicationStatus,
+    classify_pending_driver,
+    get_decided_state,
+)
+from prefect_spark_on_k8s_operator.timeline import (
+    RunTimeline,
+    TimelineEvent,
+    publish_timeline,
+)
+from prefect_spark_on_k8s_operator.tracking import (
+    SparkApplicationWatcher,
+    acquire_shared_poller,
+    acquire_shared_watcher,
+    release_shared_tracker,
+)
 
 constants = model()
 
@@ -36,6 +92,47 @@ def generate_pod_selectors(name: str, app_id: str, submission_id: str) -> List[s
     return labels
 
 
+def _get_flow_run_id() -> Optional[str]:
+    """Returns the id of the current flow run, if any."""
+    task_run_context = TaskRunContext.get()
+    if task_run_context is not None:
+        return str(task_run_context.task_run.flow_run_id)
+    flow_run_context = FlowRunContext.get()
+    if flow_run_context is not None:
+        return str(flow_run_context.flow_run.id)
+    return None
+
+
+def merge_manifest(
+    manifest: Dict[str, Any], override: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Deep merges an override into a copy of a manifest. Dicts are merged key
+    by key, any other value of the override, lists included, replaces the one
+    of the manifest.
+    """
+    merged = copy.deepcopy(manifest)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_manifest(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+class TriggerManyResult(NamedTuple):
+    """The result of `SparkApplication.trigger_many`.
+
+    Attributes:
+        runs: The runs of the applications in the order they were given,
+            None for the applications which failed to be created.
+        errors: The errors of the applications which failed to be created,
+            by their index.
+    """
+
+    runs: List[Optional["SparkApplicationRun"]]
+    errors: Dict[int, Exception]
+
+
 class SparkApplication(JobBlock):
     """A block representing a spark application configuration.
     The object instance can be created by `from_yaml_file` classmethod.
@@ -68,6 +165,75 @@ class SparkApplication(JobBlock):
             Defaults to `False`.
         api_kwargs:
             Additional arguments to include in Kubernetes API calls.
+        status_tracking:
+            How the status of the application is tracked. `poll` reads the status
+            every `interval_seconds`. `watch` streams the changes of the
+            application over a single watch connection and falls back to
+            polling while the stream is not established. `informer` shares one
+            process-wide watch of all the applications in the namespace between
+            the runs, which keeps the API server load flat for many concurrent runs.
+            `batch` refreshes the runs sharing the same namespace and
+            `interval_seconds` with one LIST call of the applications created
+            by this library every `interval_seconds`.
+            Defaults to `poll`.
+        polling_policy:
+            A state-aware schedule of the status checks, used instead of the fixed
+            `interval_seconds` between the checks when set.
+            Defaults to `None`.
+        duration_prediction:
+            Schedules the status checks of a RUNNING application around its end
+            time predicted from the durations of its past runs, when set.
+            Defaults to `None`.
+        pending_timeout_seconds:
+            The number of seconds to wait for the driver pod of a SUBMITTED
+            application to start. Once elapsed, the driver pod, its conditions
+            and its events are inspected and the application is terminated with
+            the classified reason if the driver is still pending.
+            Defaults to `None`, which waits indefinitely.
+        max_runtime_seconds:
+            The number of seconds the application may run for, in any state,
+            before it is terminated. Driver logs are collected before the
+            termination if `collect_driver_logs` is set.
+            Defaults to `None`, which doesn't limit the runtime.
+        reattach:
+            Whether `trigger` resumes waiting on the application it created
+            earlier in the same flow run, e.g. before a restart of the worker,
+            as long as the outcome of that application isn't decided yet.
+            Applications created in a flow run are labeled with its id.
+            Defaults to `False`.
+        client_backend:
+            The client making the Kubernetes API calls. `threaded` runs the calls
+            of the `kubernetes` client on the dedicated thread pool of the library,
+            see `configure_io_executor`. `asyncio` runs the calls of the
+            `kubernetes_asyncio` client on the event loop, which tracks
+            many applications from one event loop without as many threads, and
+            requires the `asyncio` extra.
+            Defaults to `threaded`.
+        rate_limit:
+            The client side rate limit of the Kubernetes API calls, shared by
+            all the runs of the process using the same credentials. Throttled
+            calls wait for the `Retry-After` of the API server and are retried,
+            and so are the reads failing with transient server errors. The rate
+            limit of the first block using the credentials applies.
+            Defaults to `None`, which applies the `RateLimit` defaults.
+        fast_status_decode:
+            Whether the status checks read the undecoded response and decode it
+            with `orjson` if installed, keeping only the resourceVersion and the
+            status of the application instead of the whole object, which saves
+            CPU and memory for large manifests.
+            Defaults to `False`.
+        admission:
+            Holds `trigger` in a process-wide queue of the namespace until the
+            cores and memory of the driver and executors, estimated from the
+            spec, likely fit in the free allocatable of the nodes and in the
+            `ResourceQuota` of the namespace. The admission policy of the first
+            block using the credentials and namespace applies.
+            Defaults to `None`, which submits the applications right away.
+
+    Lifecycle hooks can be registered with `on_submitted`, `on_running`,
+    `on_state_change`, `on_terminal` and `on_cleanup`. They are dispatched from
+    `wait_for_completion` without blocking the status checks and aren't saved
+    with the block.
     """
 
     # Duplicated description until griffe supports pydantic Fields.
@@ -114,6 +280,85 @@ class SparkApplication(JobBlock):
             " Logs for successful runs will be collected by setting this option to True"
         ),
     )
+    status_tracking: Literal["poll", "watch", "informer", "batch"] = Field(
+        default="poll",
+        description=(
+            "How the status of the application is tracked. `poll` reads the status"
+            " every `interval_seconds`. `watch` streams the changes of the"
+            " application and falls back to polling while the stream is not"
+            " established. `informer` shares one watch of all the applications"
+            " in the namespace between the runs of the process. `batch` refreshes"
+            " the runs of the process with one LIST call every `interval_seconds`."
+        ),
+    )
+    polling_policy: Optional[PollingPolicy] = Field(
+        default=None,
+        description=(
+            "A state-aware schedule of the status checks, used instead of the"
+            " fixed `interval_seconds` between the checks when set."
+        ),
+    )
+    duration_prediction: Optional[DurationPrediction] = Field(
+        default=None,
+        description=(
+            "Schedules the status checks of a RUNNING application around its end"
+            " time predicted from the durations of its past runs, when set."
+        ),
+    )
+    pending_timeout_seconds: Optional[int] = Field(
+        default=None,
+        description=(
+            "The number of seconds to wait for the driver pod of a SUBMITTED"
+            " application to start before terminating it with the classified"
+            " reason the driver is pending."
+        ),
+    )
+    max_runtime_seconds: Optional[int] = Field(
+        default=None,
+        description=(
+            "The number of seconds the application may run for, in any state,"
+            " before it is terminated."
+        ),
+    )
+    reattach: bool = Field(
+        default=False,
+        description=(
+            "Whether `trigger` resumes waiting on the application it created"
+            " earlier in the same flow run, as long as its outcome isn't decided."
+        ),
+    )
+    client_backend: Literal["threaded", "asyncio"] = Field(
+        default="threaded",
+        description=(
+            "The client making the Kubernetes API calls. `threaded` runs the calls"
+            " of the `kubernetes` client on a dedicated thread pool, `asyncio` runs"
+            " the calls of the `kubernetes_asyncio` client on the event loop."
+        ),
+    )
+    rate_limit: Optional[RateLimit] = Field(
+        default=None,
+        description=(
+            "The client side rate limit of the Kubernetes API calls, shared by all"
+            " the runs of the process using the same credentials."
+        ),
+    )
+    fast_status_decode: bool = Field(
+        default=False,
+        description=(
+            "Whether the status checks decode the raw response with `orjson` if"
+            " installed, keeping only the resourceVersion and the status."
+        ),
+    )
+
+    admission: Optional[AdmissionPolicy] = Field(
+        default=None,
+        description=(
+            "Holds `trigger` in a process-wide queue of the namespace until the"
+            " resources estimated from the spec likely fit in the cluster."
+        ),
+    )
+
+    _hooks: Dict[str, List[Callable]] = PrivateAttr(default_factory=dict)
 
     _block_type_name = "Spark On K8s Operator"
     _block_type_slug = "spark-on-k8s-operator"
@@ -128,24 +373,115 @@ class SparkApplication(JobBlock):
         Returns:
             SparkApplicationRun object.
         """
+        return await self._trigger()
 
-        # randomize the application run instance name.
-        name = (
-            self.manifest.get(constants.METADATA).get(constants.NAME)
-            + "-"
-            + "".join(random.choices(string.ascii_lowercase + string.digits, k=4))
+    async def _trigger(self, max_retries: int = 0) -> "SparkApplicationRun":
+        """Applies the spark application, retrying its creation up to max_retries
+        times on transient failures.
+        """
+        metadata = self.manifest.get(constants.METADATA)
+        # keep the name of the application across the randomized run instances.
+        base_name = metadata.setdefault(constants.ANNOTATIONS, {}).setdefault(
+            constants.BASE_NAME_ANNOTATION, metadata.get(constants.NAME)
         )
-        self.manifest.get(constants.METADATA)[constants.NAME] = name
 
-        manifest = await create_namespaced_custom_object.fn(
-            kubernetes_credentials=self.credentials,
-            group=constants.GROUP,
-            version=constants.VERSION,
-            plural=constants.PLURAL,
-            body=self.manifest,
-            namespace=self.namespace,
-            **self.api_kwargs,
-        )
+        flow_run_id = _get_flow_run_id()
+        if flow_run_id is not None:
+            if self.reattach:
+                application = await self._find_in_flight(flow_run_id, base_name)
+                if application is not None:
+                    self.logger.info(
+                        "Reattaching to spark application: "
+                        f"{application.get(constants.METADATA).get(constants.NAME)}"
+                    )
+                    return SparkApplicationRun._from_object(self, application)
+            metadata.setdefault(constants.LABELS, {})[
+                constants.FLOW_RUN_ID_LABEL
+            ] = flow_run_id
+
+        self._randomize_name(base_name)
+        metadata.setdefault(constants.LABELS, {}).update(constants.MANAGED_BY_LABEL)
+
+        reservation = None
+        if self.admission is not None:
+            reservation = await self.admission_controller.admit(self.manifest)
+        try:
+            app_run = await self._create(base_name, max_retries)
+        except BaseException:
+            if reservation is not None:
+                reservation.release()
+            raise
+        app_run._reservation = reservation
+        return app_run
+
+    async def _create(self, base_name: str, max_retries: int) -> "SparkApplicationRun":
+        """Creates the spark application, retrying up to max_retries times on
+        transient failures.
+        """
+        metadata = self.manifest[constants.METADATA]
+        annotations = metadata.setdefault(constants.ANNOTATIONS, {})
+        # the stamps of the attempts which may have created the application.
+        ambiguous_attempts = set()
+        attempt = 0
+        while True:
+            annotations[constants.ATTEMPT_ANNOTATION] = uuid.uuid4().hex
+            try:
+                manifest = await self._call(
+                    constants.CUSTOM_OBJECTS_CLIENT,
+                    "create_namespaced_custom_object",
+                    group=constants.GROUP,
+                    version=constants.VERSION,
+                    plural=constants.PLURAL,
+                    body=self.manifest,
+                    namespace=self.namespace,
+                )
+                break
+            except ApiException as exc:
+                status = exc.status
+                if status == constants.HTTP_CONFLICT and ambiguous_attempts:
+                    # a previous attempt may have created the application before
+                    # failing, adopt it only if it bears the stamp of one.
+                    application = await self._call(
+                        constants.CUSTOM_OBJECTS_CLIENT,
+                        "get_namespaced_custom_object",
+                        group=constants.GROUP,
+                        version=constants.VERSION,
+                        plural=constants.PLURAL,
+                        name=metadata[constants.NAME],
+                        namespace=self.namespace,
+                    )
+                    stamp = (
+                        application.get(constants.METADATA, {})
+                        .get(constants.ANNOTATIONS, {})
+                        .get(constants.ATTEMPT_ANNOTATION)
+                    )
+                    if stamp in ambiguous_attempts:
+                        return SparkApplicationRun._from_object(self, application)
+                # throttled creations are already retried by the rate limiter.
+                if attempt >= max_retries or (
+                    status != constants.HTTP_CONFLICT
+                    and status not in constants.RETRYABLE_CREATE_STATUSES
+                ):
+                    raise
+                if status == constants.HTTP_CONFLICT:
+                    # the randomized name is taken by another application.
+                    self._randomize_name(base_name)
+                    ambiguous_attempts.clear()
+                else:
+                    # a creation failed on a server error may still have been applied.
+                    ambiguous_attempts.add(annotations[constants.ATTEMPT_ANNOTATION])
+                attempt += 1
+                self.logger.warning(
+                    f"Creating spark application {metadata[constants.NAME]} failed: "
+                    f"{exc!r}, retrying ({attempt}/{max_retries})."
+                )
+                await sleep(
+                    min(
+                        constants.TRIGGER_BACKOFF_SECONDS * 2 ** (attempt - 1),
+                        constants.TRIGGER_MAX_BACKOFF_SECONDS,
+                    )
+                    * random.uniform(0.5, 1)
+                )
         self.logger.info(
             "Created spark application: "
             f"{manifest.get(constants.METADATA).get(constants.NAME)}"
@@ -155,6 +491,187 @@ class SparkApplication(JobBlock):
         self.name = manifest.get(constants.METADATA).get(constants.NAME)
         return SparkApplicationRun(spark_application=self)
 
+    def _randomize_name(self, base_name: str):
+        """Sets the name of the application run instance to the base name with
+        a random suffix.
+        """
+        self.manifest[constants.METADATA][constants.NAME] = (
+            base_name
+            + "-"
+            + "".join(random.choices(string.ascii_lowercase + string.digits, k=4))
+        )
+
+    @sync_compatible
+    async def trigger_many(
+        self,
+        overrides: Optional[List[Dict[str, Any]]] = None,
+        manifests: Optional[List[Dict[str, Any]]] = None,
+        max_concurrency: int = constants.TRIGGER_MAX_CONCURRENCY,
+        max_retries: int = constants.TRIGGER_MAX_RETRIES,
+    ) -> TriggerManyResult:
+        """Applies many spark applications concurrently, each like `trigger`.
+        Their creations are retried on transient failures, and an application
+        created by an attempt which failed afterwards is picked up by the next
+        attempt instead of being created twice. The applications are always
+        created anew, `reattach` can't tell them apart.
+
+        Args:
+            overrides: The overrides of the manifest of this block, one per
+                application, deep merged into a copy of the manifest.
+                Lists are replaced, not merged.
+            manifests: The manifests of the applications, applied with the
+                settings of this block. Exclusive with `overrides`.
+            max_concurrency: The maximum number of applications being created
+                at once.
+            max_retries: The number of times the creation of an application is
+                retried on transient failures.
+
+        Returns:
+            A `TriggerManyResult` with the runs and the errors of the applications,
+            in the order of the overrides or manifests.
+        """
+        if (overrides is None) == (manifests is None):
+            raise ValueError("Exactly one of overrides or manifests must be given.")
+        if manifests is None:
+            manifests = [
+                merge_manifest(self.manifest, override) for override in overrides
+            ]
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _trigger_one(manifest: Dict[str, Any]) -> "SparkApplicationRun":
+            # the hooks are shared with the block, they may not be copyable.
+            spark_application = self.copy(
+                update={"manifest": copy.deepcopy(manifest), "reattach": False}
+            )
+            spark_application._hooks = self._hooks
+            async with semaphore:
+                return await spark_application._trigger(max_retries=max_retries)
+
+        results = await asyncio.gather(
+            *[_trigger_one(manifest) for manifest in manifests],
+            return_exceptions=True,
+        )
+        runs, errors = [], {}
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                errors[index] = result
+                runs.append(None)
+            else:
+                runs.append(result)
+        if errors:
+            self.logger.warning(
+                f"Failed to create {len(errors)} of {len(manifests)} spark "
+                "applications."
+            )
+        return TriggerManyResult(runs=runs, errors=errors)
+
+    async def _call(self, client_type: str, method: str, **kwargs) -> Any:
+        """Calls the Kubernetes API through the shared client session of the
+        credentials and `client_backend` of the block.
+        """
+        session = acquire_client_session(
+            self.credentials, self.client_backend, self.rate_limit
+        )
+        try:
+            return await session.call(client_type, method, **kwargs, **self.api_kwargs)
+        finally:
+            await release_client_session(session)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """The process-wide rate limiter of the cluster of the credentials,
+        whose `counters` tell how many calls were throttled or retried.
+        """
+        return get_rate_limiter(get_credentials_key(self.credentials), self.rate_limit)
+
+    @property
+    def admission_controller(self) -> AdmissionController:
+        """The process-wide admission controller of the namespace, whose
+        `counters` tell how many applications were admitted and how long they
+        were held.
+        """
+        return get_admission_controller(
+            self.credentials,
+            self.namespace,
+            self.admission,
+            self.client_backend,
+            self.rate_limit,
+        )
+
+    def _add_hook(self, name: str, hook: Callable) -> Callable:
+        """Registers a hook and returns it, to allow using the methods registering
+        hooks as decorators.
+        """
+        self._hooks.setdefault(name, []).append(hook)
+        return hook
+
+    def on_submitted(self, hook: Callable) -> Callable:
+        """Registers a sync or async hook called with the run once the application
+        is observed SUBMITTED.
+        """
+        return self._add_hook(constants.ON_SUBMITTED, hook)
+
+    def on_running(self, hook: Callable) -> Callable:
+        """Registers a sync or async hook called with the run once the application
+        is observed RUNNING.
+        """
+        return self._add_hook(constants.ON_RUNNING, hook)
+
+    def on_state_change(self, hook: Callable) -> Callable:
+        """Registers a sync or async hook called with the run, the previous state
+        and the new state each time the application is observed in a new state.
+        """
+        return self._add_hook(constants.ON_STATE_CHANGE, hook)
+
+    def on_terminal(self, hook: Callable) -> Callable:
+        """Registers a sync or async hook called with the run and its terminal
+        state as soon as it is decided, before the driver logs are collected and
+        the application is cleaned up.
+        """
+        return self._add_hook(constants.ON_TERMINAL, hook)
+
+    def on_cleanup(self, hook: Callable) -> Callable:
+        """Registers a sync or async hook called with the run and whether the
+        application was deleted once it is cleaned up.
+        """
+        return self._add_hook(constants.ON_CLEANUP, hook)
+
+    async def _find_in_flight(
+        self, flow_run_id: str, base_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Returns the most recent application created in the flow run from this
+        block whose outcome isn't decided yet, if any.
+        """
+        applications = await self._call(
+            constants.CUSTOM_OBJECTS_CLIENT,
+            "list_namespaced_custom_object",
+            group=constants.GROUP,
+            version=constants.VERSION,
+            plural=constants.PLURAL,
+            namespace=self.namespace,
+            label_selector=f"{constants.FLOW_RUN_ID_LABEL}={flow_run_id}",
+        )
+        in_flight = []
+        for application in applications.get(constants.ITEMS, []):
+            metadata = application.get(constants.METADATA)
+            annotations = metadata.get(constants.ANNOTATIONS) or {}
+            if annotations.get(constants.BASE_NAME_ANNOTATION) != base_name:
+                continue
+            status = SparkApplicationStatus.from_object(application)
+            spec = application.get(constants.SPEC, {})
+            if get_decided_state(status.state, spec, status) is None:
+                in_flight.append(application)
+        return max(
+            in_flight,
+            key=lambda application: application.get(constants.METADATA).get(
+                constants.CREATION_TIMESTAMP, ""
+            ),
+            default=None,
+        )
+
     @classmethod
     def from_yaml_file(
         cls: Type[Self], manifest_path: Union[Path, str], **kwargs
@@ -201,6 +718,7 @@ class SparkApplicationRun(JobRun[Dict[str, Any]]):
     def __init__(
         self,
         spark_application: "SparkApplication",
+        started_at: Optional[float] = None,
     ):
         self.application_logs = None
 
@@ -211,19 +729,122 @@ class SparkApplicationRun(JobRun[Dict[str, Any]]):
         self._spark_application = spark_application
         self._status = None
         self._cleanup_status = False
+        self._tracker = None
+        self._started_at = monotonic() if started_at is None else started_at
+        self._predicted_duration = None
+        self._pending_since = None
+        self._deadline_exceeded = False
+        self._timeline = RunTimeline(self._started_at)
+        self._timeline.record(
+            constants.TRIGGERED if started_at is None else constants.ATTACHED,
+            spark_application.name,
+        )
+        executor_spec = spark_application.manifest.get(constants.SPEC, {}).get(
+            constants.EXECUTOR, {}
+        )
+        self._executors = ExecutorProgress(executor_spec.get(constants.INSTANCES))
+        self._driver_pod_name = None
+        self._events: List[RunEvent] = []
+        self._subscribers: List[asyncio.Queue] = []
+        self._events_closed = False
+        self._waiter = None
+        self._hook_dispatcher = HookDispatcher(self, spark_application._hooks)
+        self._session = None
+        self._reservation = None
+
+    @property
+    def timeline(self) -> List[TimelineEvent]:
+        """The timestamped milestones and observed states of the run so far."""
+        return self._timeline.events
+
+    @property
+    def executor_progress(self) -> Dict[str, int]:
+        """The number of executors last observed in each state."""
+        return self._executors.counts
+
+    @property
+    def executor_summary(self) -> Dict[str, Any]:
+        """The summary of the executors of the run so far."""
+        return self._executors.summary()
+
+    @classmethod
+    def _from_object(
+        cls, spark_application: "SparkApplication", application: Dict[str, Any]
+    ) -> "SparkApplicationRun":
+        """Creates a run of an existing application, timed from its creation."""
+        metadata = application.get(constants.METADATA)
+        spark_application.manifest = application
+        spark_application.name = metadata.get(constants.NAME)
+
+        started_at = monotonic()
+        creation_timestamp = metadata.get(constants.CREATION_TIMESTAMP)
+        if creation_timestamp:
+            created_at = datetime.strptime(
+                creation_timestamp, constants.TIMESTAMP_FORMAT
+            ).replace(tzinfo=timezone.utc)
+            age = (datetime.now(timezone.utc) - created_at).total_seconds()
+            started_at -= max(age, 0)
+        return cls(spark_application=spark_application, started_at=started_at)
+
+    @classmethod
+    @sync_compatible
+    async def attach(
+        cls,
+        spark_application: "SparkApplication",
+        name: str,
+        namespace: Optional[str] = None,
+    ) -> "SparkApplicationRun":
+        """Attaches to an existing application, e.g. to resume waiting on it after
+        a restart of the worker, instead of triggering a new one.
+        The deadlines and durations of the run are timed from the creation of the
+        application.
+
+        Args:
+            spark_application: The `SparkApplication` block providing the
+                credentials and the run params. It is left unchanged.
+            name: The name of the existing application.
+            namespace: The namespace of the existing application.
+                Defaults to the namespace of `spark_application`.
+
+        Returns:
+            SparkApplicationRun object.
+        """
+        spark_application = spark_application.copy(
+            update={"namespace": namespace or spark_application.namespace}
+        )
+        application = await spark_application._call(
+            constants.CUSTOM_OBJECTS_CLIENT,
+            "get_namespaced_custom_object",
+            group=constants.GROUP,
+            version=constants.VERSION,
+            plural=constants.PLURAL,
+            name=name,
+            namespace=spark_application.namespace,
+        )
+        spark_application.logger.info(f"Attached to spark application: {name}")
+        return cls._from_object(spark_application, application)
+
+    @property
+    def _base_name(self) -> str:
+        """The name of the application before the randomized suffix."""
+        metadata = self._spark_application.manifest.get(constants.METADATA)
+        return (metadata.get(constants.ANNOTATIONS) or {}).get(
+            constants.BASE_NAME_ANNOTATION, metadata.get(constants.NAME)
+        )
 
     async def _cleanup(self) -> bool:
         """Deletes the resources created by the spark application.
         Produces Resourceleak warning in case the delete was unsuccessful.
         """
-        deleted = await delete_namespaced_custom_object.fn(
-            kubernetes_credentials=self._spark_application.credentials,
+        deleted = await self._call(
+            constants.CUSTOM_OBJECTS_CLIENT,
+            "delete_namespaced_custom_object",
             group=constants.GROUP,
             version=constants.VERSION,
             plural=constants.PLURAL,
             name=self._spark_application.name,
             namespace=self._spark_application.namespace,
-            **self._spark_application.api_kwargs,
+            body=V1DeleteOptions(),
         )
         status = deleted.get(constants.STATUS) == constants.SUCCESS
         if status:
@@ -238,137 +859,535 @@ class SparkApplicationRun(JobRun[Dict[str, Any]]):
 
         return status
 
-    async def _fetch_status(self) -> Dict[str, Any]:
+    def _get_session(self) -> ClientSession:
+        """Returns the client session of the run, which keeps its connections
+        open for the whole run and shares them with the other runs using the
+        same credentials.
+        """
+        if self._session is None:
+            self._session = acquire_client_session(
+                self._spark_application.credentials,
+                self._spark_application.client_backend,
+                self._spark_application.rate_limit,
+            )
+        return self._session
+
+    async def _call(self, client_type: str, method: str, **kwargs) -> Any:
+        """Calls the Kubernetes API through the client session of the run."""
+        return await self._get_session().call(
+            client_type, method, **kwargs, **self._spark_application.api_kwargs
+        )
+
+    async def _call_raw(self, client_type: str, method: str, **kwargs) -> bytes:
+        """Calls the Kubernetes API through the client session of the run and
+        returns the undecoded body of the response.
+        """
+        return await self._get_session().call_raw(
+            client_type, method, **kwargs, **self._spark_application.api_kwargs
+        )
+
+    async def _close_session(self):
+        """Releases the client session of the run."""
+        if self._session is not None:
+            await release_client_session(self._session)
+            self._session = None
+
+    async def _fetch_status(self) -> SparkApplicationStatus:
         """Reads the runtime status of the spark application."""
-        self._status = await get_namespaced_custom_object_status.fn(
-            kubernetes_credentials=self._spark_application.credentials,
+        kwargs = dict(
             group=constants.GROUP,
             version=constants.VERSION,
             plural=constants.PLURAL,
             name=self._spark_application.name,
             namespace=self._spark_application.namespace,
-            **self._spark_application.api_kwargs,
         )
+        if self._spark_application.fast_status_decode:
+            application = decode_status(
+                await self._call_raw(
+                    constants.CUSTOM_OBJECTS_CLIENT,
+                    "get_namespaced_custom_object_status",
+                    **kwargs,
+                )
+            )
+        else:
+            application = await self._call(
+                constants.CUSTOM_OBJECTS_CLIENT,
+                "get_namespaced_custom_object_status",
+                **kwargs,
+            )
+        self._status = SparkApplicationStatus.from_object(application)
         return self._status
 
+    async def _next_status(self, delay: float) -> SparkApplicationStatus:
+        """Returns the status of the spark application after `delay` seconds.
+        While the application is tracked by a watch or a batch poller, returns
+        as soon as a change is observed and doesn't call the API server
+        if nothing changed.
+        """
+        name = self._spark_application.name
+        if (
+            self._tracker is not None
+            and self._tracker.synced
+            and self._tracker.get(name) is not None
+        ):
+            status = await self._tracker.wait_for_change(
+                name,
+                self._status.resource_version if self._status else None,
+                timeout=delay,
+            )
+            if status is not None:
+                self._status = status
+            if self._status is not None:
+                return self._status
+        else:
+            await sleep(delay)
+        return await self._fetch_status()
+
+    async def _diagnose_pending_driver(self) -> Optional[Tuple[str, str]]:
+        """Reads the driver pod and its events to classify why it doesn't start.
+
+        Returns:
+            The category and the message of the reason the driver is pending,
+            or None if the driver pod is not pending.
+        """
+        pod_name = self._status.driver_info.get(constants.POD_NAME) or (
+            self._spark_application.name + constants.DRIVER_POD_NAME_SUFFIX
+        )
+        try:
+            pod = await self._call(
+                constants.CORE_CLIENT,
+                "read_namespaced_pod",
+                name=pod_name,
+                namespace=self._spark_application.namespace,
+            )
+        except ApiException as exc:
+            if exc.status != constants.HTTP_NOT_FOUND:
+                raise
+            return classify_pending_driver(None, [])
+
+        events = await self._call(
+            constants.CORE_CLIENT,
+            "list_namespaced_event",
+            namespace=self._spark_application.namespace,
+            field_selector=f"involvedObject.name={pod_name}",
+        )
+        return classify_pending_driver(pod, events.items)
+
+    async def _check_pending_driver(self, app_state: str) -> bool:
+        """Terminates the run if the application stays SUBMITTED with a pending
+        driver pod for more than `pending_timeout_seconds`.
+
+        Returns:
+            True if the run is terminated, False otherwise.
+        """
+        pending_timeout_seconds = self._spark_application.pending_timeout_seconds
+        if pending_timeout_seconds is None or app_state != constants.SUBMITTED:
+            self._pending_since = None
+            return False
+        if self._pending_since is None:
+            self._pending_since = monotonic()
+        if monotonic() - self._pending_since <= pending_timeout_seconds:
+            return False
+
+        pending_reason = await self._diagnose_pending_driver()
+        if pending_reason is None:
+            # the driver has started, the operator is yet to report it.
+            self._pending_since = None
+            return False
+
+        category, message = pending_reason
+        self.logger.warning(
+            f"The driver of {self._spark_application.name} is pending for more than"
+            f" {pending_timeout_seconds} seconds - {category}: {message}"
+        )
+        self._error_msg = f"{category}: {message}"
+        self._timed_out = True
+        self._terminal_state = app_state
+        return True
+
+    def _check_deadline(self, app_state: str) -> bool:
+        """Terminates the run if it has been running for more than
+        `max_runtime_seconds`.
+
+        Returns:
+            True if the run is terminated, False otherwise.
+        """
+        max_runtime_seconds = self._spark_application.max_runtime_seconds
+        if max_runtime_seconds is None:
+            return False
+        if monotonic() - self._started_at < max_runtime_seconds:
+            return False
+
+        self.logger.warning(
+            f"{self._spark_application.name} is running for more than"
+            f" {max_runtime_seconds} seconds, last observed state was {app_state}."
+        )
+        self._error_msg = (
+            f"The application exceeded max_runtime_seconds={max_runtime_seconds}."
+        )
+        self._timed_out = True
+        self._deadline_exceeded = True
+        self._terminal_state = app_state
+        return True
+
+    def _until_deadline(self, delay: float) -> float:
+        """Shortens the delay before the next status check to the deadline."""
+        max_runtime_seconds = self._spark_application.max_runtime_seconds
+        if max_runtime_seconds is None:
+            return delay
+        remaining = max_runtime_seconds - (monotonic() - self._started_at)
+        return max(min(delay, remaining), 0)
+
+    def _poll_interval(self, app_state: str, polls_in_state: int) -> float:
+        """Returns the number of seconds to wait before the next status check."""
+        polling_policy = self._spark_application.polling_policy
+        if polling_policy is None:
+            interval = self._spark_application.interval_seconds
+        else:
+            interval = polling_policy.next_interval(app_state, polls_in_state)
+
+        if self._predicted_duration is not None and app_state == constants.RUNNING:
+            interval = self._spark_application.duration_prediction.next_interval(
+                monotonic() - self._started_at, self._predicted_duration, interval
+            )
+        return interval
+
+    def _start_tracking(self):
+        """Starts streaming the status changes as per `status_tracking`."""
+        status_tracking = self._spark_application.status_tracking
+        if status_tracking == "watch":
+            self._tracker = SparkApplicationWatcher(
+                credentials=self._spark_application.credentials,
+                namespace=self._spark_application.namespace,
+                field_selector=f"metadata.name={self._spark_application.name}",
+            )
+            self._tracker.start()
+        elif status_tracking == "informer":
+            self._tracker = acquire_shared_watcher(
+                credentials=self._spark_application.credentials,
+                namespace=self._spark_application.namespace,
+            )
+        elif status_tracking == "batch":
+            self._tracker = acquire_shared_poller(
+                credentials=self._spark_application.credentials,
+                namespace=self._spark_application.namespace,
+                interval_seconds=self._spark_application.interval_seconds,
+            )
+
+    async def _stop_tracking(self):
+        """Stops streaming the status changes, waiting for the background thread
+        of a tracker stopped for good off the event loop.
+        """
+        tracker, self._tracker = self._tracker, None
+        if tracker is None:
+            return
+        if self._spark_application.status_tracking == "watch":
+            tracker.stop()
+        else:
+            release_shared_tracker(tracker)
+        if tracker.stopped:
+            await asyncio.get_running_loop().run_in_executor(None, tracker.join)
+
+    async def _wait_for_terminal_state(self):
+        """Waits for the outcome of the application to be decided, or for it to stay
+        in UNKNOWN state for `timeout_seconds`.
+        """
+        duration_prediction = self._spark_application.duration_prediction
+        if duration_prediction is not None:
+            self._predicted_duration = duration_prediction.predict(self._base_name)
+            self.logger.info(
+                f"Predicted duration of {self._base_name}: "
+                f"{self._predicted_duration} seconds"
+            )
+
+        # wait for the status to change from ""(empty string) to something.
+        status = await self._next_status(0)
+        while not status.has_status:
+            if self._check_deadline(constants.NEW):
+                return
+            status = await self._next_status(self._until_deadline(1))
+        self._timeline.record(constants.FIRST_STATUS, status.state)
+
+        unknown_since = None
+        previous_state = None
+        polls_in_state = 0
+        resource_version = None
+        while True:
+            # an unchanged resourceVersion means an unchanged status,
+            # only the timers need to be checked again.
+            if resource_version is None or resource_version != status.resource_version:
+                resource_version = status.resource_version
+                app_state = status.state
+                self.logger.info(f"Last obeserved heartbeat: {app_state}")
+                if app_state != previous_state:
+                    self._timeline.record(app_state)
+                    self._emit(StateChanged(previous_state, app_state))
+                if app_state not in constants.SUBMITTING_STATES:
+                    self._release_reservation()
+                self._observe_pods(app_state, status)
+                decided_state = get_decided_state(
+                    app_state,
+                    self._spark_application.manifest.get(constants.SPEC, {}),
+                    status,
+                )
+                if decided_state is not None:
+                    if decided_state != app_state:
+                        self.logger.info(
+                            f"The application will end up {decided_state} from"
+                            f" {app_state} as per its restartPolicy,"
+                            " not waiting any further."
+                        )
+                        self._timeline.record(
+                            decided_state, f"decided from {app_state}"
+                        )
+                    self._terminal_state = decided_state
+                    break
+            polls_in_state = polls_in_state + 1 if app_state == previous_state else 1
+            previous_state = app_state
+
+            # happens when node/kubelet crashes.
+            # Stop the application if this state doesn't change until timeout_seconds.
+            if app_state == constants.UNKNOWN:
+                if unknown_since is None:
+                    unknown_since = perf_counter()
+                elif (
+                    perf_counter() - unknown_since
+                    > self._spark_application.timeout_seconds
+                ):
+                    self._timed_out = True
+                    self._terminal_state = app_state
+                    break
+            else:
+                unknown_since = None
+
+            if self._check_deadline(app_state):
+                break
+            if await self._check_pending_driver(app_state):
+                break
+
+            status = await self._next_status(
+                self._until_deadline(self._poll_interval(app_state, polls_in_state))
+            )
+
     @sync_compatible
     async def wait_for_completion(self):
         """Waits for the application to reach a terminal state.
         The terminal states currently used are:
         COMPLETED:
-            The application has run successfully.
+            The application has run successfully. Also used as soon as the
+            application is SUCCEEDING and its restartPolicy rules out a rerun.
         FAILED:
-            The application has encounterend some error.
+            The application has encounterend some error. Also used as soon as the
+            application is FAILING or SUBMISSION_FAILED and its restartPolicy
+            rules out a retry.
         UNKNOWN:
             The application is in UNKNOWN state. This happens if the
             Kubernetes node hosting the driver pod crashes. If the
             state doesn't change for `timeout_seconds`, then the application
             is terminated.
+        SUBMITTED:
+            The driver pod of the application doesn't start. If
+            `pending_timeout_seconds` is set and the driver pod is still pending
+            once it elapses, then the application is terminated and the
+            classified reason is reported by `fetch_result`.
+        Any other state:
+            The application is terminated once it has been running for
+            `max_runtime_seconds`, if set.
         For more information on the spark-on-k8s-operator state-machine please
         refer [here](https://github.com/GoogleCloudPlatform/spark-on-k8s-operator/
         blob/master/pkg/controller/sparkapplication/controller.go#L485)
+
+        Calling it while `events` already drives the run joins the same wait.
         """
-        self.application_logs = {}
+        if self._waiter is None:
+            self._waiter = asyncio.ensure_future(self._complete())
+        await self._waiter
 
-        # wait for the status to change from ""(empty string) to something.
-        while True:
-            status = await self._fetch_status()
-            if constants.STATUS not in status:
-                await sleep(1)
-                continue
-            break
-
-        # wait for the application to reach a terminal_state
-        # which is either COMPLETED or FAILED
-        # or UNKNOWN(for timeout_seconds)
-        while not self._completed:
-            status = await self._fetch_status()
-            app_state = (
-                status.get(constants.STATUS)
-                .get(constants.APPLICATION_STATE)
-                .get(constants.STATE)
-            )
-            self.logger.info(f"Last obeserved heartbeat: {app_state}")
-            if app_state in [constants.COMPLETED, constants.FAILED]:
-                self._completed = True
-                self._terminal_state = app_state
-                self.logger.info(f"{self._completed}")
-                self.logger.info(f"{self._terminal_state}")
+    async def _complete(self):
+        """Completes the run and ends the `events` streams."""
+        try:
+            await self._run_to_completion()
+            await self._hook_dispatcher.drain()
+        finally:
+            self._release_reservation()
+            await self._close_session()
+            self._close_events()
 
-            # happens when node/kubelet crashes.
-            # Stop the application if this state doesn't change until timeout_seconds.
-            elif app_state == constants.UNKNOWN:
-                timer_start = int(perf_counter())
-                while not self._timed_out:
-                    await sleep(self._spark_application.interval_seconds)
-                    status = await self._fetch_status()
-                    app_state = (
-                        status.get(constants.STATUS)
-                        .get(constants.APPLICATION_STATE)
-                        .get(constants.STATE)
-                    )
-                    if app_state != constants.UNKNOWN:
-                        timer_start = 0
-                        break
-                    if (
-                        int(perf_counter()) - timer_start
-                        > self._spark_application.timeout_seconds
-                    ):
-                        self._completed = True
-                        self._timed_out = True
-                        self._terminal_state = app_state
-            else:
-                await sleep(self._spark_application.interval_seconds)
+    def _release_reservation(self):
+        """Releases the resources reserved for the application on admission,
+        once its pods are scheduled or the run is over.
+        """
+        if self._reservation is not None:
+            self._reservation.release()
+            self._reservation = None
 
-        # restore the value after getting rid of loops.
-        if self._terminal_state != constants.COMPLETED:
-            self._completed = False
+    async def _run_to_completion(self):
+        """Waits for the terminal state, collects the logs and cleans up."""
+        self.application_logs = {}
+
+        self._start_tracking()
+        try:
+            await self._wait_for_terminal_state()
+        finally:
+            await self._stop_tracking()
+        if self._timed_out:
+            self._timeline.record(constants.TERMINATED, self._error_msg)
+        executor_summary = self.executor_summary
+        if executor_summary["observed"]:
+            self.logger.info(f"Executors of the application: {executor_summary}")
+
+        self._completed = self._terminal_state == constants.COMPLETED
+        duration_prediction = self._spark_application.duration_prediction
+        if self._completed and duration_prediction is not None:
+            duration_prediction.record(self._base_name, monotonic() - self._started_at)
 
         _tail_logs = False
         if self._terminal_state == constants.FAILED:
             _tail_logs = True
         if self._spark_application.collect_driver_logs:
             _tail_logs = True
-        if self._terminal_state == constants.UNKNOWN:
+        if self._timed_out:
             _tail_logs = False
+        # runaway applications still have their driver running.
+        if self._deadline_exceeded:
+            _tail_logs = (
+                self._spark_application.collect_driver_logs
+                and self._terminal_state == constants.RUNNING
+            )
 
         if _tail_logs:
-            self._error_msg = (
-                self._status.get(constants.STATUS)
-                .get(constants.APPLICATION_STATE)
-                .get(constants.ERROR_MESSAGE, self._error_msg)
-            )
-            app_id = self._status.get(constants.STATUS).get(
-                constants.SPARK_APPLICATION_ID
-            )
-            app_submission_id = self._status.get(constants.STATUS).get(
-                constants.SUBMISSION_ID
-            )
+            self._error_msg = self._status.error_message or self._error_msg
+        # the outcome is known, reacting to it doesn't wait for the logs.
+        self._emit(
+            TerminalStateReached(self._terminal_state, self._completed, self._error_msg)
+        )
+        # let the async terminal hooks start before the logs are collected.
+        await asyncio.sleep(0)
+
+        if _tail_logs:
+            app_id = self._status.spark_application_id
+            app_submission_id = self._status.submission_id
 
-            v1_pod_list = await list_namespaced_pod.fn(
-                kubernetes_credentials=self._spark_application.credentials,
+            v1_pod_list = await self._call(
+                constants.CORE_CLIENT,
+                "list_namespaced_pod",
                 namespace=self._spark_application.namespace,
                 label_selector=generate_pod_selectors(
                     self._spark_application.name,
                     app_id,
                     app_submission_id,
                 ),
-                **self._spark_application.api_kwargs,
             )
             self.logger.info(f"pod_list: {len(v1_pod_list.items)}")
             for pod in v1_pod_list.items:
                 pod_name = pod.metadata.name
                 self.logger.info(f"Capturing logs for pod {pod_name!r}.")
-                self.application_logs[pod_name] = await read_namespaced_pod_log.fn(
-                    kubernetes_credentials=self._spark_application.credentials,
+                self.application_logs[pod_name] = await self._call(
+                    constants.CORE_CLIENT,
+                    "read_namespaced_pod_log",
                     namespace=self._spark_application.namespace,
-                    pod_name=pod_name,
+                    name=pod_name,
                     container=constants.SPARK_DRIVER_CONAINER_NAME,
-                    **self._spark_application.api_kwargs,
                 )
+            self._timeline.record(
+                constants.LOGS_COLLECTED, f"{len(self.application_logs)} pod(s)"
+            )
 
         if self._spark_application.delete_after_completion or self._timed_out:
             self._cleanup_status = await self._cleanup()
+            self._timeline.record(
+                constants.CLEANED_UP,
+                "deleted" if self._cleanup_status else "failed to delete",
+            )
+            self._emit(CleanedUp(self._cleanup_status))
+
+        await self._publish_timeline()
+
+    def _observe_pods(self, app_state: str, status: SparkApplicationStatus):
+        """Tracks the driver and the executors of a new status of the run."""
+        pod_name = status.driver_info.get(constants.POD_NAME)
+        if pod_name and pod_name != self._driver_pod_name:
+            self._driver_pod_name = pod_name
+            self._emit(DriverAssigned(pod_name))
+
+        counts = self._executors.counts
+        self._executors.update(app_state, status.executor_state)
+        if self._executors.counts != counts:
+            self._emit(ExecutorsChanged(self._executors.counts))
+
+    def _emit(self, event: RunEvent):
+        """Publishes an event to the current and future `events` streams."""
+        self._events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+        self._hook_dispatcher.dispatch_event(event)
+
+    def _close_events(self):
+        """Ends the `events` streams."""
+        self._events_closed = True
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[RunEvent]:
+        """Streams the events of the run: the observed state changes, the changes
+        of the executor counts, the assignment of the driver pod, the terminal
+        state and finally the cleanup of the application. The events observed before
+        the call are replayed first.
+
+        The events are produced by the status checks of `wait_for_completion`,
+        which is started on the first call if it isn't running yet. Leaving
+        the stream early doesn't stop the run, awaiting `wait_for_completion`
+        afterwards joins it.
+
+        Yields:
+            `StateChanged`, `ExecutorsChanged`, `DriverAssigned`,
+            `TerminalStateReached` and `CleanedUp` events.
+
+        Example:
+            ```python
+            app_run = await spark_app.trigger()
+            async for event in app_run.events():
+                if isinstance(event, StateChanged) and event.state == "RUNNING":
+                    await prepare_downstream()
+            result = await app_run.fetch_result()
+            ```
+        """
+        queue = asyncio.Queue()
+        for event in self._events:
+            queue.put_nowait(event)
+        if self._events_closed:
+            queue.put_nowait(None)
+        self._subscribers.append(queue)
+        if self._waiter is None:
+            self._waiter = asyncio.ensure_future(self._complete())
+
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            self._subscribers.remove(queue)
+        # surface the errors of the run at the end of the stream.
+        await self._waiter
+
+    async def _publish_timeline(self):
+        """Publishes the timeline of the run as a table artifact of the current
+        flow or task run. A failure to publish doesn't fail the run.
+        """
+        try:
+            await publish_timeline(
+                self._timeline,
+                self._base_name,
+                description=(
+                    "Timeline of the spark application "
+                    f"`{self._spark_application.name}`, "
+                    f"ended up {self._terminal_state}."
+                ),
+            )
+        except Exception as exc:
+            self.logger.warning(f"Failed to publish the timeline of the run: {exc!r}")
 
     @sync_compatible
     async def fetch_result(self) -> Dict[str, Any]:
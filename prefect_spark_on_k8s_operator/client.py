@@ -0,0 +1,416 @@
+"""Module to share long-lived Kubernetes API clients between runs"""
+
+import asyncio
+import hashlib
+import threading
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from kubernetes import client as kubernetes_client
+from kubernetes import config as kube_config
+from kubernetes.client.exceptions import ApiException
+from prefect_kubernetes.credentials import KubernetesCredentials
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.limiter import (
+    RateLimit,
+    RateLimiter,
+    get_rate_limiter,
+)
+from prefect_spark_on_k8s_operator.singleflight import SingleFlight, get_call_key
+from prefect_spark_on_k8s_operator.workers import get_io_executor
+
+try:
+    from kubernetes_asyncio import client as async_client
+    from kubernetes_asyncio import config as async_config
+except ImportError:
+    async_client = None
+    async_config = None
+
+constants = model()
+
+
+def get_credentials_key(credentials: KubernetesCredentials) -> str:
+    """Returns a stable key identifying the cluster configured by the credentials."""
+    return hashlib.sha256(credentials.json(sort_keys=True).encode()).hexdigest()
+
+
+_configurations: Dict[str, Any] = {}
+_configurations_lock = threading.Lock()
+_async_configurations: Dict[str, Any] = {}
+
+
+def _load_configuration(credentials: KubernetesCredentials) -> Any:
+    """Loads the client configuration the way `KubernetesCredentials` does:
+    from the cluster config of the credentials if any, else from the
+    in-cluster config or the local kubeconfig.
+    """
+    configuration = kubernetes_client.Configuration()
+    cluster_config = credentials.cluster_config
+    if cluster_config is not None:
+        kube_config.load_kube_config_from_dict(
+            config_dict=cluster_config.config,
+            context=cluster_config.context_name,
+            client_configuration=configuration,
+        )
+        return configuration
+    try:
+        kube_config.load_incluster_config(client_configuration=configuration)
+    except kube_config.ConfigException:
+        kube_config.load_kube_config(client_configuration=configuration)
+    return configuration
+
+
+def get_configuration(credentials: KubernetesCredentials) -> Any:
+    """Returns the client configuration of the credentials, resolved once per
+    process instead of parsing the kubeconfig and running its auth plugin for
+    each client. The loaders of `kubernetes` install a `refresh_api_key_hook`
+    on the configuration, which reloads the bearer token of exec, OIDC and
+    in-cluster auth only once it nears expiry. The retries of urllib3 are
+    disabled, the calls are retried by the `RateLimiter` of the cluster only.
+
+    Args:
+        credentials: The credentials to configure the clients from.
+
+    Returns:
+        The shared `kubernetes.client.Configuration` of the credentials.
+    """
+    key = get_credentials_key(credentials)
+    with _configurations_lock:
+        configuration = _configurations.get(key)
+        if configuration is None:
+            configuration = _configurations[key] = _load_configuration(credentials)
+            # urllib3 would retry throttled reads itself, out of the rate limiter.
+            configuration.retries = False
+        return configuration
+
+
+def create_client(api_client: Any, client_type: str) -> Any:
+    """Returns the `kubernetes` client of the given type, e.g. `custom_objects`
+    or `core`, making its calls through api_client.
+    """
+    client_class = getattr(kubernetes_client, constants.CLIENT_CLASSES[client_type])
+    return client_class(api_client)
+
+
+class KubernetesClientSession:
+    """Keeps the API clients configured from the credentials open, so that
+    their keep-alive connection pool is reused by every call instead of
+    handshaking TLS again for each one. The clients share the cached
+    configuration of the credentials, see `get_configuration`.
+    The clients are opened on first use and closed by `close`. Concurrent
+    identical reads share one call.
+
+    Args:
+        credentials: The credentials to configure the clients from.
+        rate_limiter: The limiter the calls are made through.
+            Defaults to the shared limiter of the cluster.
+    """
+
+    def __init__(
+        self,
+        credentials: KubernetesCredentials,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self._credentials = credentials
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            get_credentials_key(credentials)
+        )
+        self.single_flight = SingleFlight()
+        self._exit_stack = ExitStack()
+        self._api_client = None
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._users = 0
+
+    def client(self, client_type: str) -> Any:
+        """Returns the open client of the given type, e.g. `custom_objects`
+        or `core`.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The Kubernetes client session is closed.")
+            if self._api_client is None:
+                self._api_client = self._exit_stack.enter_context(
+                    kubernetes_client.ApiClient(
+                        configuration=get_configuration(self._credentials)
+                    )
+                )
+            client = self._clients.get(client_type)
+            if client is None:
+                client = self._clients[client_type] = create_client(
+                    self._api_client, client_type
+                )
+            return client
+
+    async def call(self, client_type: str, method: str, **kwargs) -> Any:
+        """Calls a method of the client of the given type on the I/O thread
+        pool of the library, within the rate limit of the cluster.
+
+        Args:
+            client_type: The type of the client, e.g. `custom_objects` or `core`.
+            method: The name of the method to call.
+            **kwargs: The keyword arguments of the method.
+
+        Returns:
+            The result of the call.
+        """
+        return await _coalesce(self, client_type, method, kwargs, raw=False)
+
+    async def call_raw(self, client_type: str, method: str, **kwargs) -> bytes:
+        """Like `call`, but returns the undecoded body of the response, to let
+        the caller decode only what it needs.
+        """
+        return await _coalesce(self, client_type, method, kwargs, raw=True)
+
+    async def _call(
+        self, client_type: str, method: str, kwargs: Dict[str, Any], raw: bool
+    ) -> Any:
+        """Makes a call on the I/O thread pool within the rate limit of the cluster."""
+        func = getattr(self.client(client_type), method)
+        if raw:
+            return await self.rate_limiter.call(
+                method, lambda: get_io_executor().run(_read_raw, func, **kwargs)
+            )
+        return await self.rate_limiter.call(
+            method, lambda: get_io_executor().run(func, **kwargs)
+        )
+
+    def close(self):
+        """Closes the clients and their connection pool."""
+        with self._lock:
+            self._closed = True
+            self._clients.clear()
+            self._api_client = None
+            self._exit_stack.close()
+
+
+class AsyncKubernetesClientSession:
+    """The asyncio-native counterpart of `KubernetesClientSession`, built on
+    `kubernetes_asyncio`. The calls run on the event loop instead of worker
+    threads, so the number of concurrent calls isn't capped by the thread pool.
+    The session is bound to the event loop it is used from. Concurrent
+    identical reads share one call.
+    Requires the `asyncio` extra: `pip install prefect-spark-on-k8s-operator[asyncio]`.
+
+    Args:
+        credentials: The credentials to configure the clients from.
+        rate_limiter: The limiter the calls are made through.
+            Defaults to the shared limiter of the cluster.
+    """
+
+    def __init__(
+        self,
+        credentials: KubernetesCredentials,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        if async_client is None:
+            raise ImportError(
+                "The asyncio client backend requires kubernetes_asyncio, install it "
+                "with `pip install prefect-spark-on-k8s-operator[asyncio]`."
+            )
+        self._credentials = credentials
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            get_credentials_key(credentials)
+        )
+        self.single_flight = SingleFlight()
+        self._api_client = None
+        self._clients: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        self._closed = False
+        self._users = 0
+
+    async def _get_configuration(self) -> Any:
+        """Returns the `kubernetes_asyncio` counterpart of `get_configuration`,
+        resolved once per process.
+        """
+        key = get_credentials_key(self._credentials)
+        configuration = _async_configurations.get(key)
+        if configuration is None:
+            configuration = _async_configurations.setdefault(
+                key, await self._load_configuration()
+            )
+        return configuration
+
+    async def _load_configuration(self) -> Any:
+        """Loads the client configuration the way `KubernetesCredentials` does:
+        from the cluster config of the credentials if any, else from the
+        in-cluster config or the local kubeconfig.
+        """
+        configuration = async_client.Configuration()
+        cluster_config = self._credentials.cluster_config
+        if cluster_config is not None:
+            await async_config.load_kube_config_from_dict(
+                config_dict=cluster_config.config,
+                context=cluster_config.context_name,
+                client_configuration=configuration,
+            )
+            return configuration
+        try:
+            async_config.load_incluster_config(client_configuration=configuration)
+        except async_config.ConfigException:
+            await async_config.load_kube_config(client_configuration=configuration)
+        return configuration
+
+    async def client(self, client_type: str) -> Any:
+        """Returns the open client of the given type, e.g. `custom_objects`
+        or `core`.
+        """
+        async with self._lock:
+            if self._closed:
+                raise RuntimeError("The Kubernetes client session is closed.")
+            if self._api_client is None:
+                self._api_client = async_client.ApiClient(
+                    configuration=await self._get_configuration()
+                )
+            client = self._clients.get(client_type)
+            if client is None:
+                client_class = getattr(
+                    async_client, constants.CLIENT_CLASSES[client_type]
+                )
+                client = self._clients[client_type] = client_class(self._api_client)
+            return client
+
+    async def call(self, client_type: str, method: str, **kwargs) -> Any:
+        """Calls a method of the client of the given type on the event loop,
+        within the rate limit of the cluster. The errors of the API are raised
+        as `kubernetes` `ApiException`s, like the errors of the default backend.
+
+        Args:
+            client_type: The type of the client, e.g. `custom_objects` or `core`.
+            method: The name of the method to call.
+            **kwargs: The keyword arguments of the method.
+
+        Returns:
+            The result of the call.
+        """
+        return await _coalesce(self, client_type, method, kwargs, raw=False)
+
+    async def call_raw(self, client_type: str, method: str, **kwargs) -> bytes:
+        """Like `call`, but returns the undecoded body of the response, to let
+        the caller decode only what it needs.
+        """
+        return await _coalesce(self, client_type, method, kwargs, raw=True)
+
+    async def _call(
+        self, client_type: str, method: str, kwargs: Dict[str, Any], raw: bool
+    ) -> Any:
+        """Makes a call on the event loop within the rate limit of the cluster."""
+        client = await self.client(client_type)
+
+        async def _make_call():
+            try:
+                if not raw:
+                    return await getattr(client, method)(**kwargs)
+                response = await getattr(client, method)(
+                    _preload_content=False, **kwargs
+                )
+                try:
+                    return await response.read()
+                finally:
+                    response.release()
+            except async_client.ApiException as exc:
+                api_exception = ApiException(status=exc.status, reason=exc.reason)
+                api_exception.body = exc.body
+                api_exception.headers = exc.headers
+                raise api_exception from exc
+
+        return await self.rate_limiter.call(method, _make_call)
+
+    async def close(self):
+        """Closes the clients and their connection pool."""
+        async with self._lock:
+            self._closed = True
+            self._clients.clear()
+            if self._api_client is not None:
+                await self._api_client.close()
+
+
+ClientSession = Union[KubernetesClientSession, AsyncKubernetesClientSession]
+
+
+def _read_raw(func: Callable, **kwargs) -> bytes:
+    """Calls a method of a `kubernetes` client and returns the undecoded body
+    of the response.
+    """
+    response = func(_preload_content=False, **kwargs)
+    try:
+        return response.data
+    finally:
+        response.release_conn()
+
+
+async def _coalesce(
+    session: ClientSession,
+    client_type: str,
+    method: str,
+    kwargs: Dict[str, Any],
+    raw: bool,
+) -> Any:
+    """Makes a call through a session, sharing the in-flight call of the
+    session if the same read is already being made.
+    """
+    key = get_call_key(client_type, method, kwargs)
+    if key is None:
+        return await session._call(client_type, method, kwargs, raw)
+    return await session.single_flight.do(
+        (key, raw), lambda: session._call(client_type, method, kwargs, raw)
+    )
+
+
+_client_sessions: Dict[Tuple, ClientSession] = {}
+_client_sessions_lock = threading.Lock()
+
+
+def acquire_client_session(
+    credentials: KubernetesCredentials,
+    backend: str = "threaded",
+    rate_limit: Optional[RateLimit] = None,
+) -> ClientSession:
+    """Returns the process-wide client session of the credentials, opening it on
+    first use. All the runs using the same credentials, backend and event loop
+    share its connection pools. Each call must be paired with
+    `release_client_session`.
+
+    Args:
+        credentials: The credentials to configure the clients from.
+        backend: `threaded` for a `KubernetesClientSession` or `asyncio` for an
+            `AsyncKubernetesClientSession` bound to the running event loop.
+        rate_limit: The rate limit of the cluster, applied if this is the first
+            use of the cluster in the process.
+
+    Returns:
+        The shared client session.
+    """
+    credentials_key = get_credentials_key(credentials)
+    if backend == "asyncio":
+        key = (credentials_key, backend, asyncio.get_running_loop())
+        session_class = AsyncKubernetesClientSession
+    else:
+        key = (credentials_key, backend)
+        session_class = KubernetesClientSession
+    rate_limiter = get_rate_limiter(credentials_key, rate_limit)
+    with _client_sessions_lock:
+        session = _client_sessions.get(key)
+        if session is None:
+            session = _client_sessions[key] = session_class(credentials, rate_limiter)
+        session._users += 1
+        return session
+
+
+async def release_client_session(session: ClientSession):
+    """Releases a session returned by `acquire_client_session`. The session is
+    closed once it has no users left.
+    """
+    with _client_sessions_lock:
+        session._users -= 1
+        if session._users > 0:
+            return
+        for key, shared_session in list(_client_sessions.items()):
+            if shared_session is session:
+                del _client_sessions[key]
+    if isinstance(session, AsyncKubernetesClientSession):
+        await session.close()
+    else:
+        session.close()
@@ -1,5 +1,5 @@
 """Module to define constants required for SparkApplication"""
-from typing import Any, Dict, Final
+from typing import Any, Dict, Final, Tuple
 
 
 class SparkApplicationModel:
@@ -27,6 +27,10 @@ class SparkApplicationModel:
     TYPE: Final[str] = "type"
     TEMPLATE: Final[str] = "template"
     NEVER: Final[str] = "Never"
+    ON_FAILURE: Final[str] = "OnFailure"
+    ALWAYS: Final[str] = "Always"
+    ON_FAILURE_RETRIES: Final[str] = "onFailureRetries"
+    ON_SUBMISSION_FAILURE_RETRIES: Final[str] = "onSubmissionFailureRetries"
 
     # spark-on-k8s-operator supported kinds.
     SPARK_APPLICATION_KIND: Final[str] = "SparkApplication"
@@ -48,12 +52,111 @@ class SparkApplicationModel:
     ERROR_MESSAGE: Final[str] = "errorMessage"
     SPARK_APPLICATION_ID: Final[str] = "sparkApplicationId"
     SUBMISSION_ID: Final[str] = "submissionID"
+    EXECUTION_ATTEMPTS: Final[str] = "executionAttempts"
+    DRIVER_INFO: Final[str] = "driverInfo"
+    EXECUTOR_STATE: Final[str] = "executorState"
+    LAST_SUBMISSION_ATTEMPT_TIME: Final[str] = "lastSubmissionAttemptTime"
+    TERMINATION_TIME: Final[str] = "terminationTime"
+    POD_NAME: Final[str] = "podName"
+    SUBMISSION_ATTEMPTS: Final[str] = "submissionAttempts"
+    RESOURCE_VERSION: Final[str] = "resourceVersion"
+    ITEMS: Final[str] = "items"
+    CONTINUE: Final[str] = "continue"
+    LABELS: Final[str] = "labels"
+    ANNOTATIONS: Final[str] = "annotations"
+    LIST_PAGE_SIZE: Final[int] = 500
+
+    # label stamped on every application created by this library.
+    MANAGED_BY_LABEL: Final[Dict[str, str]] = {
+        "app.kubernetes.io/managed-by": "prefect-spark-on-k8s-operator"
+    }
+    MANAGED_BY_SELECTOR: Final[
+        str
+    ] = "app.kubernetes.io/managed-by=prefect-spark-on-k8s-operator"
+    # annotation keeping the name of the application before randomization.
+    BASE_NAME_ANNOTATION: Final[str] = "prefect-spark-on-k8s-operator/base-name"
+    # annotation stamping the creation attempt which applied the application.
+    ATTEMPT_ANNOTATION: Final[str] = "prefect-spark-on-k8s-operator/attempt"
+    # label keeping the flow run which created the application.
+    FLOW_RUN_ID_LABEL: Final[str] = "prefect.io/flow-run-id"
+    CREATION_TIMESTAMP: Final[str] = "creationTimestamp"
+    TIMESTAMP_FORMAT: Final[str] = "%Y-%m-%dT%H:%M:%SZ"
+
+    # types of the Kubernetes API clients.
+    CUSTOM_OBJECTS_CLIENT: Final[str] = "custom_objects"
+    CORE_CLIENT: Final[str] = "core"
+    CLIENT_CLASSES: Final[Dict[str, str]] = {
+        CUSTOM_OBJECTS_CLIENT: "CustomObjectsApi",
+        CORE_CLIENT: "CoreV1Api",
+    }
+
+    # client side rate limiting of the Kubernetes API calls.
+    HTTP_TOO_MANY_REQUESTS: Final[int] = 429
+    RETRY_AFTER: Final[str] = "Retry-After"
+    RETRYABLE_READ_STATUSES: Final[Tuple[int, ...]] = (429, 500, 502, 503, 504)
+    READ_METHOD_PREFIXES: Final[Tuple[str, ...]] = ("get_", "list_", "read_")
+
+    # watch stream specific constants.
+    WATCH_TIMEOUT_SECONDS: Final[int] = 300
+    WATCH_MAX_BACKOFF_SECONDS: Final[int] = 30
+    TRACKER_STOP_TIMEOUT_SECONDS: Final[int] = 5
+    EVENT_TYPE: Final[str] = "type"
+    EVENT_OBJECT: Final[str] = "object"
+    ADDED: Final[str] = "ADDED"
+    MODIFIED: Final[str] = "MODIFIED"
+    DELETED: Final[str] = "DELETED"
+    BOOKMARK: Final[str] = "BOOKMARK"
+    HTTP_GONE: Final[int] = 410
 
     # spark-on-k8s application terminal states.
     COMPLETED: Final[str] = "COMPLETED"
     FAILED: Final[str] = "FAILED"
+    TERMINAL_STATES = [COMPLETED, FAILED]
+
+    # spark-on-k8s application non-terminal states.
+    NEW: Final[str] = ""
+    SUBMITTED: Final[str] = "SUBMITTED"
+    RUNNING: Final[str] = "RUNNING"
+    SUBMISSION_FAILED: Final[str] = "SUBMISSION_FAILED"
+    PENDING_RERUN: Final[str] = "PENDING_RERUN"
+    INVALIDATING: Final[str] = "INVALIDATING"
+    SUCCEEDING: Final[str] = "SUCCEEDING"
+    FAILING: Final[str] = "FAILING"
     UNKNOWN: Final[str] = "UNKNOWN"
 
+    # spark-on-k8s executor states.
+    EXECUTOR_PENDING: Final[str] = "PENDING"
+    EXECUTOR_STATES = [EXECUTOR_PENDING, RUNNING, COMPLETED, FAILED, UNKNOWN]
+    EXECUTOR: Final[str] = "executor"
+    INSTANCES: Final[str] = "instances"
+
+    # states grouped by the phase of the application run.
+    SUBMITTING_STATES = [NEW, SUBMITTED, PENDING_RERUN, INVALIDATING]
+    FINISHING_STATES = [SUCCEEDING, FAILING, SUBMISSION_FAILED]
+
+    # transitions of the spark-on-k8s-operator v1beta2 state machine
+    # without the retries, which depend on the restartPolicy of the application.
+    # INVALIDATING can be reached from any state upon an update of the spec.
+    APPLICATION_STATE_TRANSITIONS: Final[Dict[str, Tuple[str, ...]]] = {
+        NEW: (SUBMITTED, SUBMISSION_FAILED),
+        SUBMITTED: (RUNNING, SUCCEEDING, FAILING, UNKNOWN),
+        RUNNING: (SUCCEEDING, FAILING, UNKNOWN),
+        UNKNOWN: (SUBMITTED, RUNNING, SUCCEEDING, FAILING),
+        SUBMISSION_FAILED: (FAILED,),
+        FAILING: (FAILED,),
+        SUCCEEDING: (COMPLETED,),
+        INVALIDATING: (PENDING_RERUN,),
+        PENDING_RERUN: (NEW, SUBMITTED),
+        COMPLETED: (),
+        FAILED: (),
+    }
+    # transitions taken instead when the restartPolicy allows a retry.
+    RETRY_TRANSITIONS: Final[Dict[str, str]] = {
+        SUBMISSION_FAILED: SUBMITTED,
+        FAILING: PENDING_RERUN,
+        SUCCEEDING: PENDING_RERUN,
+    }
+
     LABELS_TEMPLATE: Final[str] = ",".join(
         [
             "spark-app-selector=${app_id}",
@@ -63,3 +166,111 @@ class SparkApplicationModel:
         ]
     )
     SPARK_DRIVER_CONAINER_NAME: Final[str] = "spark-kubernetes-driver"
+    DRIVER_POD_NAME_SUFFIX: Final[str] = "-driver"
+
+    # pod specific constants.
+    POD_PENDING: Final[str] = "Pending"
+    POD_SCHEDULED: Final[str] = "PodScheduled"
+    CONDITION_FALSE: Final[str] = "False"
+    WARNING: Final[str] = "Warning"
+    HTTP_NOT_FOUND: Final[int] = 404
+
+    # categories of the reasons a driver pod doesn't start.
+    DRIVER_NOT_CREATED: Final[str] = "DriverNotCreated"
+    DRIVER_PENDING: Final[str] = "DriverPending"
+    INSUFFICIENT_RESOURCES: Final[str] = "InsufficientResources"
+    UNSCHEDULABLE: Final[str] = "Unschedulable"
+    VOLUME_ERROR: Final[str] = "VolumeError"
+    IMAGE_PULL_ERROR: Final[str] = "ImagePullError"
+    CONTAINER_CONFIG_ERROR: Final[str] = "ContainerConfigError"
+    WAITING_REASON_CATEGORIES: Final[Dict[str, str]] = {
+        "ErrImagePull": IMAGE_PULL_ERROR,
+        "ImagePullBackOff": IMAGE_PULL_ERROR,
+        "InvalidImageName": IMAGE_PULL_ERROR,
+        "CreateContainerConfigError": CONTAINER_CONFIG_ERROR,
+        "CreateContainerError": CONTAINER_CONFIG_ERROR,
+    }
+    EVENT_REASON_CATEGORIES: Final[Dict[str, str]] = {
+        "FailedScheduling": UNSCHEDULABLE,
+        "FailedMount": VOLUME_ERROR,
+        "FailedAttachVolume": VOLUME_ERROR,
+    }
+    UNSCHEDULABLE_MESSAGE_CATEGORIES: Final[Dict[str, str]] = {
+        "persistentvolumeclaim": VOLUME_ERROR,
+        "insufficient": INSUFFICIENT_RESOURCES,
+    }
+
+    # milestones of the timeline of a run, next to the observed states.
+    TRIGGERED: Final[str] = "TRIGGERED"
+    ATTACHED: Final[str] = "ATTACHED"
+    FIRST_STATUS: Final[str] = "FIRST_STATUS"
+    TERMINATED: Final[str] = "TERMINATED"
+    LOGS_COLLECTED: Final[str] = "LOGS_COLLECTED"
+    CLEANED_UP: Final[str] = "CLEANED_UP"
+    TIMELINE_ARTIFACT_KEY_SUFFIX: Final[str] = "-timeline"
+
+    # lifecycle hooks of a run.
+    ON_SUBMITTED: Final[str] = "on_submitted"
+    ON_RUNNING: Final[str] = "on_running"
+    ON_STATE_CHANGE: Final[str] = "on_state_change"
+    ON_TERMINAL: Final[str] = "on_terminal"
+    ON_CLEANUP: Final[str] = "on_cleanup"
+    HOOK_MAX_WORKERS: Final[int] = 4
+
+    # thread pool of the blocking Kubernetes API calls.
+    IO_MAX_WORKERS: Final[int] = 16
+
+    # bulk submission of spark applications.
+    HTTP_CONFLICT: Final[int] = 409
+    TRIGGER_MAX_CONCURRENCY: Final[int] = 16
+    TRIGGER_MAX_RETRIES: Final[int] = 3
+    TRIGGER_BACKOFF_SECONDS: Final[float] = 0.5
+    TRIGGER_MAX_BACKOFF_SECONDS: Final[float] = 10
+    RETRYABLE_CREATE_STATUSES: Final[Tuple[int, ...]] = (500, 502, 503, 504)
+
+    # resources of the spark applications, see the spark-on-k8s-operator
+    # v1beta2 API and the spark defaults.
+    DRIVER: Final[str] = "driver"
+    CORES: Final[str] = "cores"
+    CORE_REQUEST: Final[str] = "coreRequest"
+    CORE_LIMIT: Final[str] = "coreLimit"
+    MEMORY: Final[str] = "memory"
+    MEMORY_OVERHEAD: Final[str] = "memoryOverhead"
+    MEMORY_OVERHEAD_FACTOR: Final[str] = "memoryOverheadFactor"
+    DYNAMIC_ALLOCATION: Final[str] = "dynamicAllocation"
+    ENABLED: Final[str] = "enabled"
+    INITIAL_EXECUTORS: Final[str] = "initialExecutors"
+    MIN_EXECUTORS: Final[str] = "minExecutors"
+    DEFAULT_CORES: Final[int] = 1
+    DEFAULT_MEMORY: Final[str] = "1g"
+    DEFAULT_MEMORY_OVERHEAD_FACTOR: Final[float] = 0.1
+    NON_JVM_MEMORY_OVERHEAD_FACTOR: Final[float] = 0.4
+    NON_JVM_TYPES: Final[Tuple[str, ...]] = ("Python", "R")
+    MIN_MEMORY_OVERHEAD: Final[int] = 384 * 2**20
+    JVM_MEMORY_UNITS: Final[Dict[str, int]] = {
+        "k": 2**10,
+        "m": 2**20,
+        "g": 2**30,
+        "t": 2**40,
+        "p": 2**50,
+    }
+
+    # capacity of the cluster checked before admitting an application.
+    NODE_READY: Final[str] = "Ready"
+    CONDITION_TRUE: Final[str] = "True"
+    ACTIVE_POD_FIELD_SELECTOR: Final[
+        str
+    ] = "status.phase!=Succeeded,status.phase!=Failed"
+    QUOTA_RESOURCES: Final[Dict[str, str]] = {
+        "cpu": "cpu",
+        "requests.cpu": "cpu",
+        "limits.cpu": "cpu_limit",
+        "memory": "memory",
+        "requests.memory": "memory",
+        "limits.memory": "memory",
+        "pods": "pods",
+        "count/sparkapplications.sparkoperator.k8s.io": "applications",
+    }
+    # the minimum sleep of the head of the admission queue between two checks.
+    ADMISSION_CHECK_SECONDS: Final[float] = 0.5
+    HTTP_FORBIDDEN: Final[int] = 403
@@ -0,0 +1,51 @@
+"""Module to decode only the status of the sparkapplications read from the API"""
+
+import json
+from typing import Any, Dict, Union
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+constants = model()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decodes a JSON document with `orjson` if installed, else with `json`."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def project_status(application: Dict[str, Any]) -> Dict[str, Any]:
+    """Keeps only the fields of a sparkapplications object read by
+    `SparkApplicationStatus.from_object`: the name and resourceVersion of the
+    metadata and the status, dropping the spec which can be much larger.
+    """
+    metadata = application.get(constants.METADATA) or {}
+    projection = {
+        constants.METADATA: {
+            key: metadata[key]
+            for key in (constants.NAME, constants.RESOURCE_VERSION)
+            if key in metadata
+        }
+    }
+    if constants.STATUS in application:
+        projection[constants.STATUS] = application[constants.STATUS]
+    return projection
+
+
+def decode_status(data: Union[bytes, str]) -> Dict[str, Any]:
+    """Decodes the raw body of a sparkapplications read and projects it onto
+    its status fields, see `project_status`.
+
+    Args:
+        data: The undecoded body of the response.
+
+    Returns:
+        The projected sparkapplications object.
+    """
+    return project_status(loads(data))
@@ -0,0 +1,65 @@
+"""Module to define the events streamed by a run of a SparkApplication"""
+
+from typing import Dict, NamedTuple, Optional, Union
+
+
+class StateChanged(NamedTuple):
+    """The application was observed in a new state.
+
+    Attributes:
+        previous_state: The previously observed state, None for the first one.
+        state: The newly observed state.
+    """
+
+    previous_state: Optional[str]
+    state: str
+
+
+class ExecutorsChanged(NamedTuple):
+    """The number of executors in some state changed.
+
+    Attributes:
+        counts: The number of executors in each state.
+    """
+
+    counts: Dict[str, int]
+
+
+class DriverAssigned(NamedTuple):
+    """The driver pod of the application was assigned.
+
+    Attributes:
+        pod_name: The name of the driver pod.
+    """
+
+    pod_name: str
+
+
+class CleanedUp(NamedTuple):
+    """The application was deleted after the run.
+
+    Attributes:
+        deleted: Whether the application was deleted successfully.
+    """
+
+    deleted: bool
+
+
+class TerminalStateReached(NamedTuple):
+    """The outcome of the run is decided. Only the `CleanedUp` event of the
+    application may follow, once the driver logs are collected.
+
+    Attributes:
+        state: The terminal state of the run, see `wait_for_completion`.
+        completed: Whether the application completed successfully.
+        error_message: The errors encountered by the run, if any.
+    """
+
+    state: str
+    completed: bool
+    error_message: str
+
+
+RunEvent = Union[
+    StateChanged, ExecutorsChanged, DriverAssigned, CleanedUp, TerminalStateReached
+]
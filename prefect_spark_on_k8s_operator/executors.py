@@ -0,0 +1,94 @@
+"""Module to track the progress of the executors of a SparkApplication"""
+
+import statistics
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+
+constants = model()
+
+
+class ExecutorProgress:
+    """Tracks the states of the executors of a run from the `executorState`
+    reported by the operator, and how long they took to come up.
+
+    The startup time of an executor is measured from its first observation,
+    or from the first observation of the application RUNNING for an executor
+    first observed RUNNING, until its first observation RUNNING. It is thus as
+    precise as the interval between the status checks.
+
+    Args:
+        requested: The number of executor instances requested by the spec
+            of the application, if any.
+    """
+
+    def __init__(self, requested: Optional[int] = None):
+        self.requested = requested
+        self._states: Dict[str, str] = {}
+        self._first_seen: Dict[str, float] = {}
+        self._startup_seconds: Dict[str, float] = {}
+        self._running_since: Optional[float] = None
+        self._max_running = 0
+
+    def update(self, app_state: str, executor_state: Dict[str, str]):
+        """Updates the progress from a status of the application.
+
+        Args:
+            app_state: The state of the application.
+            executor_state: The states of the executors, keyed by pod name.
+        """
+        now = monotonic()
+        if app_state == constants.RUNNING and self._running_since is None:
+            self._running_since = now
+
+        for pod_name, state in executor_state.items():
+            first_seen = self._first_seen.setdefault(pod_name, now)
+            if state != constants.EXECUTOR_PENDING and (
+                pod_name not in self._startup_seconds
+            ):
+                if self._states.get(pod_name) is None:
+                    # first observed up, count from when the driver was up.
+                    first_seen = min(first_seen, self._running_since or now)
+                self._startup_seconds[pod_name] = now - first_seen
+            self._states[pod_name] = state
+
+        self._max_running = max(
+            self._max_running, self.counts.get(constants.RUNNING, 0)
+        )
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """The number of executors in each state."""
+        counts = dict.fromkeys(constants.EXECUTOR_STATES, 0)
+        for state in self._states.values():
+            counts[state] = counts.get(state, 0) + 1
+        return counts
+
+    @property
+    def startup_seconds(self) -> List[float]:
+        """The startup times of the executors which came up."""
+        return list(self._startup_seconds.values())
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarizes the progress of the executors.
+
+        Returns:
+            A dict with the number of `requested` executors, the number of
+            `observed` ones, the last `counts` per state, the `max_running`
+            executors at once, the number of executors which `never_started`
+            and the `min`, `median` and `max` startup times in seconds.
+        """
+        startup_seconds = self.startup_seconds
+        return {
+            "requested": self.requested,
+            "observed": len(self._states),
+            "counts": self.counts,
+            "max_running": self._max_running,
+            "never_started": len(self._states) - len(startup_seconds),
+            "min_startup_seconds": min(startup_seconds, default=None),
+            "median_startup_seconds": (
+                statistics.median(startup_seconds) if startup_seconds else None
+            ),
+            "max_startup_seconds": max(startup_seconds, default=None),
+        }
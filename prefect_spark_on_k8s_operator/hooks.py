@@ -0,0 +1,94 @@
+"""Module to dispatch the lifecycle hooks of a run of a SparkApplication"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.events import (
+    CleanedUp,
+    RunEvent,
+    StateChanged,
+    TerminalStateReached,
+)
+
+constants = model()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Returns the process-wide executor of the sync hooks, creating it on
+    first use. It is bounded to `HOOK_MAX_WORKERS` threads, so slow hooks
+    queue up instead of piling up threads.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=constants.HOOK_MAX_WORKERS,
+                thread_name_prefix="spark-application-hooks",
+            )
+        return _executor
+
+
+class HookDispatcher:
+    """Dispatches the lifecycle hooks of a run from its events without blocking
+    the status checks: async hooks run as tasks of the event loop and sync hooks
+    run on a bounded thread pool. A failing hook is logged and never fails
+    the run.
+
+    Args:
+        run: The run passed as first argument to the hooks.
+        hooks: The hooks to dispatch, keyed by hook name.
+    """
+
+    def __init__(self, run: Any, hooks: Dict[str, List[Callable]]):
+        self._run = run
+        self._hooks = hooks
+        self._pending: Set[asyncio.Future] = set()
+
+    def dispatch_event(self, event: RunEvent):
+        """Dispatches the hooks triggered by an event of the run."""
+        if isinstance(event, StateChanged):
+            self.dispatch(constants.ON_STATE_CHANGE, event.previous_state, event.state)
+            if event.state == constants.SUBMITTED:
+                self.dispatch(constants.ON_SUBMITTED)
+            elif event.state == constants.RUNNING:
+                self.dispatch(constants.ON_RUNNING)
+        elif isinstance(event, CleanedUp):
+            self.dispatch(constants.ON_CLEANUP, event.deleted)
+        elif isinstance(event, TerminalStateReached):
+            self.dispatch(constants.ON_TERMINAL, event.state)
+
+    def dispatch(self, name: str, *args):
+        """Starts the hooks registered under name, called with the run and args."""
+        for hook in self._hooks.get(name, []):
+            if asyncio.iscoroutinefunction(hook):
+                future = asyncio.ensure_future(hook(self._run, *args))
+            else:
+                future = asyncio.wrap_future(
+                    _get_executor().submit(hook, self._run, *args)
+                )
+            self._pending.add(future)
+            future.add_done_callback(self._done_callback(name, hook))
+
+    def _done_callback(self, name: str, hook: Callable) -> Callable:
+        """Returns a callback logging the failure of a hook."""
+
+        def _callback(future: asyncio.Future):
+            self._pending.discard(future)
+            if not future.cancelled() and future.exception() is not None:
+                self._run.logger.warning(
+                    f"The {name} hook {getattr(hook, '__name__', hook)!r} failed: "
+                    f"{future.exception()!r}"
+                )
+
+        return _callback
+
+    async def drain(self):
+        """Waits for the started hooks to finish."""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
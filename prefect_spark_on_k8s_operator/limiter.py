@@ -0,0 +1,245 @@
+"""Module to rate limit the Kubernetes API calls made to a cluster"""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from kubernetes.client.exceptions import ApiException
+from prefect.logging import get_logger
+from pydantic import BaseModel, Field
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+
+constants = model()
+
+logger = get_logger("prefect_spark_on_k8s_operator.limiter")
+
+
+class RateLimit(BaseModel):
+    """The client side rate limit of the Kubernetes API calls made to a cluster,
+    shared by all the runs of the process using the same credentials.
+
+    Attributes:
+        qps:
+            The number of calls per second sustained towards the cluster.
+            Defaults to `50`.
+        burst:
+            The number of calls which can be made at once above `qps`.
+            Defaults to `100`.
+        max_retries:
+            The number of times a throttled call, or a read failing with a
+            transient server error, is retried. Defaults to `5`.
+        backoff_seconds:
+            The base of the exponential backoff between the retries of a call
+            answered without `Retry-After`. Defaults to `0.5` second.
+        max_backoff_seconds:
+            The upper bound of the backoff between the retries of a call.
+            Defaults to `30` seconds.
+    """
+
+    qps: float = Field(
+        default=50,
+        description="The number of calls per second sustained towards the cluster.",
+    )
+    burst: int = Field(
+        default=100,
+        description="The number of calls which can be made at once above `qps`.",
+    )
+    max_retries: int = Field(
+        default=5,
+        description="The number of times a throttled call, or a read failing with "
+        "a transient server error, is retried.",
+    )
+    backoff_seconds: float = Field(
+        default=0.5,
+        description="The base of the exponential backoff between the retries of "
+        "a call answered without `Retry-After`.",
+    )
+    max_backoff_seconds: float = Field(
+        default=30,
+        description="The upper bound of the backoff between the retries of a call.",
+    )
+
+
+def is_read(method: str) -> bool:
+    """Returns whether a method of the Kubernetes clients is an idempotent read."""
+    return method.startswith(constants.READ_METHOD_PREFIXES)
+
+
+def get_retry_after(exc: ApiException) -> Optional[float]:
+    """Returns the number of seconds to wait from the `Retry-After` header of
+    an API error, given either in seconds or as an HTTP date, if any.
+    """
+    value = (getattr(exc, "headers", None) or {}).get(constants.RETRY_AFTER)
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RateLimiter:
+    """A token bucket limiting the Kubernetes API calls made to a cluster from
+    any thread or event loop of the process.
+
+    Calls take a token from the bucket, refilled at `qps` up to `burst` tokens,
+    and wait for it when the bucket is empty. A `429 Too Many Requests` answer
+    pauses all the calls to the cluster for its `Retry-After`, and the call is
+    retried since the API server rejected it before processing it. Idempotent
+    reads are also retried on transient server errors, with a jittered
+    exponential backoff. The number of calls, throttled calls, retries and
+    failures, and the time spent waiting are kept in `counters`.
+
+    Args:
+        rate_limit: The rate limit of the calls.
+    """
+
+    def __init__(self, rate_limit: Optional[RateLimit] = None):
+        self.rate_limit = rate_limit or RateLimit()
+        self._lock = threading.Lock()
+        self._tokens = float(self.rate_limit.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._counters: Dict[str, float] = {
+            "calls": 0,
+            "throttled": 0,
+            "retried": 0,
+            "failed": 0,
+            "waited_seconds": 0.0,
+        }
+
+    @property
+    def counters(self) -> Dict[str, float]:
+        """A copy of the counters of the calls made through the limiter."""
+        with self._lock:
+            return dict(self._counters)
+
+    def _reserve(self) -> float:
+        """Takes a token and returns the number of seconds to wait before
+        using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.rate_limit.burst),
+                self._tokens + (now - self._updated_at) * self.rate_limit.qps,
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            delay = max(
+                -self._tokens / self.rate_limit.qps, self._paused_until - now, 0.0
+            )
+            self._counters["calls"] += 1
+            self._counters["waited_seconds"] += delay
+            return delay
+
+    async def acquire(self):
+        """Waits for a token of the bucket on the event loop."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self):
+        """Waits for a token of the bucket, blocking the calling thread."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttled(self, exc: ApiException) -> Optional[float]:
+        """Records a throttled call and pauses the calls to the cluster for the
+        `Retry-After` of the answer, if any.
+
+        Returns:
+            The number of seconds the calls are paused for.
+        """
+        retry_after = get_retry_after(exc)
+        with self._lock:
+            self._counters["throttled"] += 1
+            if retry_after is not None:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+        return retry_after
+
+    def _backoff(self, attempt: int) -> float:
+        """Returns the jittered exponential backoff before a retry."""
+        backoff = min(
+            self.rate_limit.backoff_seconds * 2**attempt,
+            self.rate_limit.max_backoff_seconds,
+        )
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    async def call(self, method: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Makes a Kubernetes API call within the rate limit, retrying it when
+        it is throttled or when it is a read failing with a transient server error.
+
+        Args:
+            method: The name of the called method, telling whether it is a read.
+            func: Makes the call.
+
+        Returns:
+            The result of the call.
+        """
+        attempt = 0
+        while True:
+            await self.acquire()
+            try:
+                return await func()
+            except ApiException as exc:
+                retry_after = None
+                if exc.status == constants.HTTP_TOO_MANY_REQUESTS:
+                    retry_after = self.throttled(exc)
+                retryable = exc.status == constants.HTTP_TOO_MANY_REQUESTS or (
+                    is_read(method) and exc.status in constants.RETRYABLE_READ_STATUSES
+                )
+                if not retryable or attempt >= self.rate_limit.max_retries:
+                    with self._lock:
+                        self._counters["failed"] += 1
+                    raise
+                with self._lock:
+                    self._counters["retried"] += 1
+                logger.debug(
+                    f"Retrying {method} after {exc.status} {exc.reason}, "
+                    f"attempt {attempt + 1} of {self.rate_limit.max_retries}."
+                )
+                if retry_after is None:
+                    # a paused bucket already delays the retry by Retry-After.
+                    await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    credentials_key: str, rate_limit: Optional[RateLimit] = None
+) -> RateLimiter:
+    """Returns the process-wide rate limiter of a cluster, creating it on first
+    use. The rate limit given on first use applies to all the calls made to
+    the cluster.
+
+    Args:
+        credentials_key: The key of the credentials of the cluster, see
+            `get_credentials_key`.
+        rate_limit: The rate limit of the limiter created on first use.
+            Defaults to `RateLimit()`.
+
+    Returns:
+        The shared `RateLimiter` of the cluster.
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(credentials_key)
+        if limiter is None:
+            limiter = _rate_limiters[credentials_key] = RateLimiter(rate_limit)
+        return limiter
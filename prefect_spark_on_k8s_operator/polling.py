@@ -0,0 +1,194 @@
+"""Module to define how often the status of a SparkApplication is checked"""
+
+import json
+import os
+import random
+import statistics
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+
+constants = model()
+
+
+class PollingPolicy(BaseModel):
+    """A state-aware schedule of the application status checks.
+    Polls fast while the application is being submitted, backs off exponentially
+    with jitter while it is RUNNING and polls fast again once it is
+    SUCCEEDING or FAILING. Subclasses can override `next_interval` to plug
+    in a different schedule.
+
+    Attributes:
+        submitting_interval_seconds:
+            The number of seconds between status checks until the application
+            is RUNNING. Defaults to `1` second.
+        running_interval_seconds:
+            The number of seconds before the first status check of a RUNNING
+            application. Defaults to `5` seconds.
+        max_running_interval_seconds:
+            The upper bound of the backed off interval while RUNNING.
+            Defaults to `60` seconds.
+        backoff_factor:
+            The factor the interval grows by at each check while RUNNING.
+            Defaults to `2`.
+        jitter:
+            The fraction of the backed off interval randomly added or removed,
+            so that many runs don't poll in lockstep. Defaults to `0.1`.
+        finishing_interval_seconds:
+            The number of seconds between status checks once the application
+            is SUCCEEDING or FAILING. Defaults to `1` second.
+    """
+
+    submitting_interval_seconds: float = Field(
+        default=1,
+        description="The number of seconds between status checks until the "
+        "application is RUNNING.",
+    )
+    running_interval_seconds: float = Field(
+        default=5,
+        description="The number of seconds before the first status check of a "
+        "RUNNING application.",
+    )
+    max_running_interval_seconds: float = Field(
+        default=60,
+        description="The upper bound of the backed off interval while RUNNING.",
+    )
+    backoff_factor: float = Field(
+        default=2,
+        description="The factor the interval grows by at each check while RUNNING.",
+    )
+    jitter: float = Field(
+        default=0.1,
+        description="The fraction of the backed off interval randomly added "
+        "or removed.",
+    )
+    finishing_interval_seconds: float = Field(
+        default=1,
+        description="The number of seconds between status checks once the "
+        "application is SUCCEEDING or FAILING.",
+    )
+
+    def next_interval(self, app_state: str, polls_in_state: int) -> float:
+        """Returns the number of seconds to wait before the next status check.
+
+        Args:
+            app_state: The last observed state of the application.
+            polls_in_state: The number of status checks which already observed
+                the application in `app_state`, starting at `1`.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        if app_state in constants.SUBMITTING_STATES:
+            return self.submitting_interval_seconds
+        if app_state in constants.FINISHING_STATES:
+            return self.finishing_interval_seconds
+        if app_state != constants.RUNNING:
+            return self.running_interval_seconds
+
+        interval = min(
+            self.running_interval_seconds
+            * self.backoff_factor ** max(polls_in_state - 1, 0),
+            self.max_running_interval_seconds,
+        )
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+_history_lock = threading.Lock()
+
+
+class DurationPrediction(BaseModel):
+    """Schedules the status checks of a RUNNING application around its predicted
+    end time, using the durations of the past runs of the same application.
+    Polls sparsely while the predicted end time is far and densely when it is
+    near or overdue.
+
+    The durations are stored in a local JSON file, keyed by the base
+    `metadata.name` of the application.
+
+    Attributes:
+        history_path:
+            The JSON file to read and record the run durations in.
+        max_records:
+            The number of most recent durations kept per application.
+            Defaults to `20`.
+        max_interval_seconds:
+            The upper bound of the interval between status checks, which bounds
+            how late an unexpected early failure is detected.
+            Defaults to `600` seconds.
+    """
+
+    history_path: Path = Field(
+        default=...,
+        description="The JSON file to read and record the run durations in.",
+    )
+    max_records: int = Field(
+        default=20,
+        description="The number of most recent durations kept per application.",
+    )
+    max_interval_seconds: float = Field(
+        default=600,
+        description="The upper bound of the interval between status checks.",
+    )
+
+    def _read(self) -> Dict[str, List[float]]:
+        """Reads the recorded durations."""
+        try:
+            return json.loads(Path(self.history_path).read_text())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def predict(self, base_name: str) -> Optional[float]:
+        """Returns the predicted duration in seconds of a run of the application,
+        or None if the application has no recorded runs.
+
+        Args:
+            base_name: The `metadata.name` of the application before the
+                randomized suffix added by `trigger`.
+        """
+        durations = self._read().get(base_name)
+        if not durations:
+            return None
+        return statistics.median(durations)
+
+    def record(self, base_name: str, duration: float):
+        """Records the duration in seconds of a completed run of the application.
+
+        Args:
+            base_name: The `metadata.name` of the application before the
+                randomized suffix added by `trigger`.
+            duration: The duration of the run.
+        """
+        with _history_lock:
+            history = self._read()
+            durations = history.setdefault(base_name, [])
+            durations.append(round(duration, 3))
+            del durations[: -self.max_records]
+
+            history_path = Path(self.history_path)
+            history_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = history_path.with_name(f".{history_path.name}.{os.getpid()}")
+            temp_path.write_text(json.dumps(history))
+            os.replace(temp_path, history_path)
+
+    def next_interval(
+        self, elapsed: float, predicted_duration: float, interval: float
+    ) -> float:
+        """Returns the number of seconds to wait before the next status check.
+        Waits for half of the predicted remaining time, so the checks get denser
+        as the predicted end time approaches.
+
+        Args:
+            elapsed: The number of seconds since the run started.
+            predicted_duration: The predicted duration of the run.
+            interval: The interval used once the predicted end time is near.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        remaining = predicted_duration - elapsed
+        return max(interval, min(remaining / 2, self.max_interval_seconds))
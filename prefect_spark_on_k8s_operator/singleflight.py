@@ -0,0 +1,71 @@
+"""Module to coalesce identical in-flight Kubernetes API reads"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from prefect_spark_on_k8s_operator.limiter import is_read
+
+
+def get_call_key(
+    client_type: str, method: str, kwargs: Dict[str, Any]
+) -> Optional[Tuple]:
+    """Returns the key identifying a read of the Kubernetes API, or None if the
+    call isn't an idempotent read or its arguments aren't hashable.
+    """
+    if not is_read(method):
+        return None
+    key = (client_type, method, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class SingleFlight:
+    """Shares one in-flight call between the concurrent callers making the same
+    call, which all get its result or its error. A call is made again once the
+    in-flight one is done, so the results are never older than the calls.
+
+    The calls are shared between the callers of the same event loop, and a
+    cancelled caller doesn't cancel the call shared with the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Makes the call, or joins the in-flight call made under the same key.
+
+        Args:
+            key: The key identifying the call.
+            func: Makes the call.
+
+        Returns:
+            The result of the call.
+        """
+        key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = asyncio.ensure_future(func())
+                future.add_done_callback(self._done_callback(key))
+            else:
+                self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _done_callback(self, key: Tuple) -> Callable:
+        """Returns a callback forgetting a done call."""
+
+        def _callback(future: asyncio.Future):
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+            if not future.cancelled():
+                # retrieved here in case all the callers were cancelled.
+                future.exception()
+
+        return _callback
@@ -0,0 +1,213 @@
+"""Module to interpret the runtime status of a SparkApplication"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+
+constants = model()
+
+
+class SparkApplicationStatus:
+    """An immutable snapshot of the fields of a spark application object
+    used to track its runs, parsed once per status check.
+
+    Attributes:
+        name: The `metadata.name` of the application.
+        resource_version: The `metadata.resourceVersion` of the application.
+        has_status: Whether the operator has reported a status yet.
+        state: The `applicationState.state` of the application.
+        error_message: The `applicationState.errorMessage` of the application.
+        spark_application_id: The `sparkApplicationId` of the application.
+        submission_id: The `submissionID` of the application.
+        driver_info: The `driverInfo` of the application.
+        executor_state: The `executorState` of the application, keyed by
+            executor pod name.
+        execution_attempts: The `executionAttempts` of the application.
+        submission_attempts: The `submissionAttempts` of the application.
+        last_submission_attempt_time: The `lastSubmissionAttemptTime` of the
+            application.
+        termination_time: The `terminationTime` of the application.
+    """
+
+    __slots__ = (
+        "name",
+        "resource_version",
+        "has_status",
+        "state",
+        "error_message",
+        "spark_application_id",
+        "submission_id",
+        "driver_info",
+        "executor_state",
+        "execution_attempts",
+        "submission_attempts",
+        "last_submission_attempt_time",
+        "termination_time",
+    )
+
+    def __init__(self, **fields):
+        for field in self.__slots__:
+            object.__setattr__(self, field, fields.get(field))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(name={self.name!r}, "
+            f"resource_version={self.resource_version!r}, state={self.state!r})"
+        )
+
+    @classmethod
+    def from_object(cls, application: Dict[str, Any]) -> "SparkApplicationStatus":
+        """Parses the snapshot from a sparkapplications object.
+
+        Args:
+            application: The object returned by the Kubernetes API.
+
+        Returns:
+            The snapshot of the status of the application.
+        """
+        metadata = application.get(constants.METADATA) or {}
+        status = application.get(constants.STATUS) or {}
+        application_state = status.get(constants.APPLICATION_STATE) or {}
+        return cls(
+            name=metadata.get(constants.NAME),
+            resource_version=metadata.get(constants.RESOURCE_VERSION),
+            has_status=constants.STATUS in application,
+            state=application_state.get(constants.STATE, constants.NEW),
+            error_message=application_state.get(constants.ERROR_MESSAGE),
+            spark_application_id=status.get(constants.SPARK_APPLICATION_ID),
+            submission_id=status.get(constants.SUBMISSION_ID),
+            driver_info=status.get(constants.DRIVER_INFO) or {},
+            executor_state=status.get(constants.EXECUTOR_STATE) or {},
+            execution_attempts=status.get(constants.EXECUTION_ATTEMPTS, 0),
+            submission_attempts=status.get(constants.SUBMISSION_ATTEMPTS, 0),
+            last_submission_attempt_time=status.get(
+                constants.LAST_SUBMISSION_ATTEMPT_TIME
+            ),
+            termination_time=status.get(constants.TERMINATION_TIME),
+        )
+
+
+def should_retry(
+    app_state: str, spec: Dict[str, Any], status: SparkApplicationStatus
+) -> bool:
+    """Whether the operator retries the application from the given state.
+    Mirrors `shouldRetry` of the spark-on-k8s-operator controller.
+
+    Args:
+        app_state: The current state of the application.
+        spec: The spec of the application.
+        status: The status of the application.
+
+    Returns:
+        True if the restartPolicy allows another attempt, False otherwise.
+    """
+    restart_policy = spec.get(constants.RESTART_POLICY_KEY) or {}
+    policy_type = restart_policy.get(constants.TYPE, constants.NEVER)
+
+    if app_state == constants.SUCCEEDING:
+        return policy_type == constants.ALWAYS
+
+    if app_state == constants.FAILING:
+        retries = restart_policy.get(constants.ON_FAILURE_RETRIES)
+        attempts = status.execution_attempts
+    elif app_state == constants.SUBMISSION_FAILED:
+        retries = restart_policy.get(constants.ON_SUBMISSION_FAILURE_RETRIES)
+        attempts = status.submission_attempts
+    else:
+        return False
+
+    if policy_type == constants.ALWAYS:
+        return True
+    if policy_type == constants.ON_FAILURE:
+        return retries is not None and (attempts or 0) <= retries
+    return False
+
+
+def get_decided_state(
+    app_state: str, spec: Dict[str, Any], status: SparkApplicationStatus
+) -> Optional[str]:
+    """Returns the terminal state the application is bound to reach.
+    With `restartPolicy: Never`, SUCCEEDING always ends in COMPLETED while
+    FAILING and SUBMISSION_FAILED always end in FAILED, so there's no need to wait
+    for the operator to get there.
+
+    Args:
+        app_state: The current state of the application.
+        spec: The spec of the application.
+        status: The status of the application.
+
+    Returns:
+        COMPLETED or FAILED once the outcome of the application is decided,
+        None otherwise.
+    """
+    if app_state in constants.TERMINAL_STATES:
+        return app_state
+    if app_state in constants.RETRY_TRANSITIONS and should_retry(
+        app_state, spec, status
+    ):
+        return None
+
+    next_states = constants.APPLICATION_STATE_TRANSITIONS.get(app_state, ())
+    if len(next_states) == 1 and next_states[0] in constants.TERMINAL_STATES:
+        return next_states[0]
+    return None
+
+
+def _classify_unschedulable(message: Optional[str]) -> str:
+    """Classifies the message of an unschedulable pod."""
+    for keyword, category in constants.UNSCHEDULABLE_MESSAGE_CATEGORIES.items():
+        if keyword in (message or "").lower():
+            return category
+    return constants.UNSCHEDULABLE
+
+
+def classify_pending_driver(pod, events: List) -> Optional[Tuple[str, str]]:
+    """Classifies why the driver pod of an application doesn't start from its
+    container waiting reasons, its `PodScheduled` condition and its events.
+
+    Args:
+        pod: The driver `V1Pod`, or None if it doesn't exist.
+        events: The core/v1 events involving the driver pod.
+
+    Returns:
+        The category and the message of the reason the driver is pending,
+        or None if the driver pod is not pending.
+    """
+    if pod is None:
+        return constants.DRIVER_NOT_CREATED, "The driver pod doesn't exist."
+    if pod.status is None or pod.status.phase != constants.POD_PENDING:
+        return None
+
+    for container_status in pod.status.container_statuses or []:
+        waiting = container_status.state and container_status.state.waiting
+        if waiting and waiting.reason in constants.WAITING_REASON_CATEGORIES:
+            return (
+                constants.WAITING_REASON_CATEGORIES[waiting.reason],
+                f"{waiting.reason}: {waiting.message}",
+            )
+
+    for condition in pod.status.conditions or []:
+        if (
+            condition.type == constants.POD_SCHEDULED
+            and condition.status == constants.CONDITION_FALSE
+        ):
+            return (
+                _classify_unschedulable(condition.message),
+                f"{condition.reason}: {condition.message}",
+            )
+
+    # the most recent warnings come last.
+    for event in reversed(events):
+        if (
+            event.type == constants.WARNING
+            and event.reason in constants.EVENT_REASON_CATEGORIES
+        ):
+            category = constants.EVENT_REASON_CATEGORIES[event.reason]
+            if category == constants.UNSCHEDULABLE:
+                category = _classify_unschedulable(event.message)
+            return category, f"{event.reason}: {event.message}"
+
+    return constants.DRIVER_PENDING, "The driver pod is pending."
@@ -0,0 +1,116 @@
+"""Module to record the timeline of a run of a SparkApplication"""
+
+import re
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from prefect.artifacts import create_table_artifact
+from prefect.context import FlowRunContext, TaskRunContext
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+
+constants = model()
+
+
+class TimelineEvent(NamedTuple):
+    """A milestone of a run.
+
+    Attributes:
+        event: The observed state of the application, or a milestone of the run
+            such as TRIGGERED or CLEANED_UP.
+        timestamp: The UTC time the event was recorded at.
+        elapsed_seconds: The number of seconds since the run was triggered.
+        detail: Additional information about the event.
+    """
+
+    event: str
+    timestamp: datetime
+    elapsed_seconds: float
+    detail: str = ""
+
+
+class RunTimeline:
+    """Records the timestamped milestones of a run, to tell whether a slow run
+    spends its time in the operator queue, in pod scheduling or in spark itself.
+
+    Args:
+        started_at: The `time.monotonic` time the run was triggered at.
+            Defaults to now.
+    """
+
+    def __init__(self, started_at: Optional[float] = None):
+        self._started_at = monotonic() if started_at is None else started_at
+        self.events: List[TimelineEvent] = []
+
+    def record(self, event: str, detail: str = "") -> TimelineEvent:
+        """Records an event at the current time.
+
+        Args:
+            event: The observed state or the milestone of the run.
+            detail: Additional information about the event.
+
+        Returns:
+            The recorded event.
+        """
+        timeline_event = TimelineEvent(
+            event=event,
+            timestamp=datetime.now(timezone.utc),
+            elapsed_seconds=monotonic() - self._started_at,
+            detail=detail,
+        )
+        self.events.append(timeline_event)
+        return timeline_event
+
+    def to_table(self) -> List[Dict[str, Any]]:
+        """Returns the events as table rows, each with the number of seconds
+        spent since the previous event.
+        """
+        rows = []
+        previous_elapsed = 0.0
+        for timeline_event in self.events:
+            rows.append(
+                {
+                    "event": timeline_event.event,
+                    "timestamp": timeline_event.timestamp.isoformat(),
+                    "elapsed_seconds": round(timeline_event.elapsed_seconds, 3),
+                    "step_seconds": round(
+                        timeline_event.elapsed_seconds - previous_elapsed, 3
+                    ),
+                    "detail": timeline_event.detail,
+                }
+            )
+            previous_elapsed = timeline_event.elapsed_seconds
+        return rows
+
+
+def get_artifact_key(base_name: str) -> str:
+    """Returns the key of the timeline artifacts of an application. Artifact
+    keys only allow lowercase letters, numbers and dashes.
+    """
+    key = re.sub(r"[^a-z0-9-]+", "-", base_name.lower()).strip("-")
+    return key + constants.TIMELINE_ARTIFACT_KEY_SUFFIX
+
+
+async def publish_timeline(
+    timeline: RunTimeline, base_name: str, description: str
+) -> Optional[Any]:
+    """Publishes the timeline as a table artifact of the current flow or task run.
+    Does nothing outside of a flow or task run.
+
+    Args:
+        timeline: The timeline to publish.
+        base_name: The name of the application before the randomized suffix,
+            to version the timelines of its runs under the same key.
+        description: The markdown description of the artifact.
+
+    Returns:
+        The id of the created artifact, or None outside of a flow or task run.
+    """
+    if FlowRunContext.get() is None and TaskRunContext.get() is None:
+        return None
+    return await create_table_artifact(
+        table=timeline.to_table(),
+        key=get_artifact_key(base_name),
+        description=description,
+    )
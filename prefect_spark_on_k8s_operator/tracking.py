@@ -0,0 +1,447 @@
+"""Module to track the runtime status of many spark applications at once"""
+
+import asyncio
+import functools
+import threading
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from kubernetes import watch
+from kubernetes.client.exceptions import ApiException
+from prefect.logging import get_logger
+from prefect_kubernetes.credentials import KubernetesCredentials
+
+from prefect_spark_on_k8s_operator.client import (
+    KubernetesClientSession,
+    get_credentials_key,
+)
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.limiter import get_rate_limiter
+from prefect_spark_on_k8s_operator.status import SparkApplicationStatus
+
+constants = model()
+
+logger = get_logger("prefect_spark_on_k8s_operator.tracking")
+
+
+def get_resource_version(application: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Returns the `metadata.resourceVersion` of a spark application object."""
+    if not application:
+        return None
+    return application.get(constants.METADATA, {}).get(constants.RESOURCE_VERSION)
+
+
+def _resolve(waiter: asyncio.Future, application: SparkApplicationStatus):
+    """Resolves a waiter from any thread on the event loop owning it."""
+
+    def _set_result():
+        if not waiter.done():
+            waiter.set_result(application)
+
+    try:
+        waiter.get_loop().call_soon_threadsafe(_set_result)
+    except RuntimeError:
+        # the event loop of the waiter is already closed.
+        pass
+
+
+class SparkApplicationTracker(ABC):
+    """Mirrors the status snapshots of the sparkapplications of a namespace from
+    a background thread and wakes up the coroutines waiting for a change
+    of an application.
+    Subclasses define how the mirror is kept up to date in `_run`.
+
+    While the mirror is not up to date, `synced` is `False` and callers are
+    expected to fall back to reading the status themselves.
+
+    Args:
+        credentials: The credentials to configure a client from.
+        namespace: The namespace to track the applications in.
+        field_selector: A field selector to restrict the tracked applications,
+            e.g. `metadata.name=spark-pi-x1y2` to track a single application.
+        label_selector: A label selector to restrict the tracked applications.
+        page_size: The number of applications listed per LIST call.
+    """
+
+    def __init__(
+        self,
+        credentials: KubernetesCredentials,
+        namespace: str,
+        field_selector: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        page_size: int = constants.LIST_PAGE_SIZE,
+    ):
+        self._credentials = credentials
+        self._namespace = namespace
+        self._field_selector = field_selector
+        self._label_selector = label_selector
+        self._page_size = page_size
+        self._rate_limiter = get_rate_limiter(get_credentials_key(credentials))
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, SparkApplicationStatus] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._stopped = threading.Event()
+        self._synced = False
+        self._thread = None
+        self._users = 0
+
+    @property
+    def synced(self) -> bool:
+        """Whether the mirrored applications are kept up to date."""
+        return self._synced
+
+    def start(self):
+        """Starts tracking the applications in a background thread."""
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"{type(self).__name__}-{self._namespace}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def stopped(self) -> bool:
+        """Whether the tracker was stopped."""
+        return self._stopped.is_set()
+
+    def stop(self):
+        """Stops tracking the applications without waiting for the background
+        thread to exit, see `join`.
+        """
+        self._stopped.set()
+        self._synced = False
+        self._interrupt()
+
+    def join(self, timeout: float = constants.TRACKER_STOP_TIMEOUT_SECONDS):
+        """Waits for the background thread of a stopped tracker to exit. It blocks,
+        so call it off the event loop.
+
+        Args:
+            timeout: The maximum number of seconds to wait.
+        """
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _interrupt(self):
+        """Interrupts the blocking call of the background thread, if any."""
+
+    def get(self, name: str) -> Optional[SparkApplicationStatus]:
+        """Returns the last observed status of the application."""
+        with self._lock:
+            return self._index.get(name)
+
+    async def wait_for_change(
+        self, name: str, resource_version: Optional[str], timeout: float
+    ) -> Optional[SparkApplicationStatus]:
+        """Waits for a version of the application other than `resource_version`.
+
+        Args:
+            name: The name of the application.
+            resource_version: The last resourceVersion known to the caller.
+            timeout: The number of seconds to wait for a change.
+
+        Returns:
+            The status of the changed application or `None` if nothing changed
+            within `timeout` seconds.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        with self._lock:
+            application = self._index.get(name)
+            if application is not None and (
+                application.resource_version != resource_version
+            ):
+                return application
+            self._waiters.setdefault(name, []).append(waiter)
+
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(name, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters:
+                    self._waiters.pop(name, None)
+
+    def _update(self, event_type: str, application: Dict[str, Any]):
+        """Applies a watch event to the index and wakes up the waiters."""
+        application = SparkApplicationStatus.from_object(application)
+        name = application.name
+        with self._lock:
+            if event_type == constants.DELETED:
+                self._index.pop(name, None)
+                return
+            self._index[name] = application
+            waiters = self._waiters.pop(name, [])
+        for waiter in waiters:
+            _resolve(waiter, application)
+
+    def _replace(self, applications: List[Dict[str, Any]]):
+        """Replaces the index with the listed applications and wakes up
+        the waiters of the applications which changed, all at once.
+        """
+        snapshots = map(SparkApplicationStatus.from_object, applications)
+        index = {application.name: application for application in snapshots}
+        with self._lock:
+            changed = [
+                name
+                for name, application in index.items()
+                if name not in self._index
+                or self._index[name].resource_version != application.resource_version
+            ]
+            self._index = index
+            wakeups = [
+                (self._waiters.pop(name), index[name])
+                for name in changed
+                if name in self._waiters
+            ]
+        for waiters, application in wakeups:
+            for waiter in waiters:
+                _resolve(waiter, application)
+
+    def _list(self, api_client) -> Tuple[List[Dict[str, Any]], str]:
+        """Lists the tracked applications page by page.
+
+        Returns:
+            The applications and the resourceVersion of the list.
+        """
+        applications = []
+        _continue = None
+        while True:
+            self._rate_limiter.acquire_sync()
+            page = api_client.list_namespaced_custom_object(
+                group=constants.GROUP,
+                version=constants.VERSION,
+                namespace=self._namespace,
+                plural=constants.PLURAL,
+                field_selector=self._field_selector,
+                label_selector=self._label_selector,
+                limit=self._page_size,
+                _continue=_continue,
+            )
+            applications.extend(page.get(constants.ITEMS, []))
+            _continue = page.get(constants.METADATA, {}).get(constants.CONTINUE)
+            if not _continue:
+                return applications, get_resource_version(page)
+
+    @abstractmethod
+    def _run(self):
+        """Keeps the index in sync until the tracker is stopped."""
+
+
+class SparkApplicationWatcher(SparkApplicationTracker):
+    """Tracks the sparkapplications of a namespace with a list+watch stream.
+
+    The stream is resumed from the last observed resourceVersion after a
+    disconnect, and the applications are listed again if the API server answers
+    with `410 Gone`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._watch = None
+        self._response = None
+
+    def _interrupt(self):
+        """Stops the stream and closes its connection, so that the background
+        thread exits without waiting for the next event or the server side
+        watch timeout.
+        """
+        if self._watch is not None:
+            self._watch.stop()
+        self._close_response()
+
+    def _close_response(self):
+        """Closes the response of the current stream, if any."""
+        response = self._response
+        if response is not None:
+            # shutdown interrupts a read blocked in the watch thread, close doesn't.
+            getattr(response, "shutdown", response.close)()
+
+    def _keep_response(self, func: Callable) -> Callable:
+        """Wraps the list call of the stream to keep its response for `stop`."""
+
+        @functools.wraps(func)
+        def _call(*args, **kwargs):
+            self._response = func(*args, **kwargs)
+            if self._stopped.is_set():
+                self._close_response()
+            return self._response
+
+        return _call
+
+    def _run(self):
+        """Keeps the index in sync until the watcher is stopped."""
+        resource_version = None
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                with closing(
+                    KubernetesClientSession(self._credentials, self._rate_limiter)
+                ) as session:
+                    api_client = session.client(constants.CUSTOM_OBJECTS_CLIENT)
+                    if resource_version is None:
+                        applications, resource_version = self._list(api_client)
+                        self._replace(applications)
+                    self._synced = True
+                    self._watch = watch.Watch()
+                    self._rate_limiter.acquire_sync()
+                    for event in self._watch.stream(
+                        self._keep_response(api_client.list_namespaced_custom_object),
+                        group=constants.GROUP,
+                        version=constants.VERSION,
+                        namespace=self._namespace,
+                        plural=constants.PLURAL,
+                        field_selector=self._field_selector,
+                        label_selector=self._label_selector,
+                        resource_version=resource_version,
+                        allow_watch_bookmarks=True,
+                        timeout_seconds=constants.WATCH_TIMEOUT_SECONDS,
+                    ):
+                        application = event[constants.EVENT_OBJECT]
+                        resource_version = get_resource_version(application)
+                        if event[constants.EVENT_TYPE] != constants.BOOKMARK:
+                            self._update(event[constants.EVENT_TYPE], application)
+                        failures = 0
+                continue
+            except ApiException as exc:
+                if exc.status == constants.HTTP_GONE:
+                    # the resourceVersion is too old to resume from, list again.
+                    resource_version = None
+                    continue
+                if exc.status == constants.HTTP_TOO_MANY_REQUESTS:
+                    self._rate_limiter.throttled(exc)
+                logger.warning(f"Watch on sparkapplications failed: {exc.reason}")
+            except Exception as exc:
+                logger.warning(f"Watch on sparkapplications disconnected: {exc!r}")
+            self._synced = False
+            failures += 1
+            self._stopped.wait(min(2**failures, constants.WATCH_MAX_BACKOFF_SECONDS))
+        self._synced = False
+
+
+class SparkApplicationBatchPoller(SparkApplicationTracker):
+    """Tracks the sparkapplications of a namespace with one periodic LIST call
+    shared by all the waiting runs, instead of one GET per run.
+
+    Args:
+        interval_seconds: The number of seconds to wait between the LIST calls.
+        *args: The arguments of `SparkApplicationTracker`.
+        **kwargs: The keyword arguments of `SparkApplicationTracker`.
+    """
+
+    def __init__(self, *args, interval_seconds: float, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._interval_seconds = interval_seconds
+
+    def _run(self):
+        """Lists the applications every `interval_seconds` until stopped,
+        reusing the connections of a client session.
+        """
+        session = KubernetesClientSession(self._credentials, self._rate_limiter)
+        try:
+            while not self._stopped.is_set():
+                try:
+                    api_client = session.client(constants.CUSTOM_OBJECTS_CLIENT)
+                    applications, _ = self._list(api_client)
+                    self._replace(applications)
+                    self._synced = True
+                except Exception as exc:
+                    self._synced = False
+                    if (
+                        isinstance(exc, ApiException)
+                        and exc.status == constants.HTTP_TOO_MANY_REQUESTS
+                    ):
+                        self._rate_limiter.throttled(exc)
+                    logger.warning(f"Listing sparkapplications failed: {exc!r}")
+                self._stopped.wait(self._interval_seconds)
+        finally:
+            session.close()
+            self._synced = False
+
+
+_shared_trackers: Dict[Tuple, SparkApplicationTracker] = {}
+_shared_trackers_lock = threading.Lock()
+
+
+def _acquire_shared_tracker(key: Tuple, factory) -> SparkApplicationTracker:
+    """Returns the shared tracker stored under key, creating it on first use."""
+    with _shared_trackers_lock:
+        tracker = _shared_trackers.get(key)
+        if tracker is None:
+            tracker = factory()
+            tracker.start()
+            _shared_trackers[key] = tracker
+        tracker._users += 1
+        return tracker
+
+
+def acquire_shared_watcher(
+    credentials: KubernetesCredentials, namespace: str
+) -> SparkApplicationWatcher:
+    """Returns the process-wide watcher of all the sparkapplications in the
+    namespace, starting it on first use. All the runs tracked by the watcher
+    share a single list+watch stream, regardless of how many runs are waiting.
+    Each call must be paired with `release_shared_tracker`.
+
+    Args:
+        credentials: The credentials to configure a client from.
+        namespace: The namespace to watch the applications in.
+
+    Returns:
+        The shared `SparkApplicationWatcher` of the namespace.
+    """
+    return _acquire_shared_tracker(
+        (SparkApplicationWatcher, get_credentials_key(credentials), namespace),
+        lambda: SparkApplicationWatcher(credentials, namespace),
+    )
+
+
+def acquire_shared_poller(
+    credentials: KubernetesCredentials, namespace: str, interval_seconds: float
+) -> SparkApplicationBatchPoller:
+    """Returns the process-wide batch poller of the sparkapplications created by
+    this library in the namespace, starting it on first use. The runs sharing the
+    poller are refreshed together by one LIST call every `interval_seconds`.
+    Each call must be paired with `release_shared_tracker`.
+
+    Args:
+        credentials: The credentials to configure a client from.
+        namespace: The namespace to list the applications in.
+        interval_seconds: The number of seconds to wait between the LIST calls.
+
+    Returns:
+        The shared `SparkApplicationBatchPoller` of the namespace.
+    """
+    return _acquire_shared_tracker(
+        (
+            SparkApplicationBatchPoller,
+            get_credentials_key(credentials),
+            namespace,
+            interval_seconds,
+        ),
+        lambda: SparkApplicationBatchPoller(
+            credentials,
+            namespace,
+            label_selector=constants.MANAGED_BY_SELECTOR,
+            interval_seconds=interval_seconds,
+        ),
+    )
+
+
+def release_shared_tracker(tracker: SparkApplicationTracker):
+    """Releases a tracker returned by `acquire_shared_watcher` or
+    `acquire_shared_poller`. The tracker is stopped once it has no users left.
+    """
+    with _shared_trackers_lock:
+        tracker._users -= 1
+        if tracker._users > 0:
+            return
+        for key, shared_tracker in list(_shared_trackers.items()):
+            if shared_tracker is tracker:
+                del _shared_trackers[key]
+    tracker.stop()
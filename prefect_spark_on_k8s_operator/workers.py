@@ -0,0 +1,141 @@
+"""Module to run the blocking Kubernetes API calls on a dedicated thread pool"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import monotonic
+from typing import Any, Callable, Dict, Optional
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+
+constants = model()
+
+
+class IOExecutor:
+    """A bounded thread pool running the blocking Kubernetes API calls of the
+    library, apart from the default thread pool shared with the rest of the
+    process. It keeps metrics of the calls waiting for a thread, to tell when
+    it is saturated.
+
+    Args:
+        max_workers: The number of threads of the pool.
+    """
+
+    def __init__(self, max_workers: int = constants.IO_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="spark-application-io"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queue_depth = 0
+        self._submitted = 0
+        self._completed = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """The metrics of the pool.
+
+        Returns:
+            A dict with the `max_workers` of the pool, the calls waiting for a
+            thread (`queue_depth`) and `running` now, the `max_queue_depth`, the
+            number of `submitted` and `completed` calls, and the `mean` and `max`
+            seconds the started calls waited for a thread.
+        """
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "max_queue_depth": self._max_queue_depth,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "mean_wait_seconds": (
+                    self._total_wait_seconds / started if started else 0.0
+                ),
+                "max_wait_seconds": self._max_wait_seconds,
+            }
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Runs a blocking function on the pool and waits for its result.
+
+        Args:
+            func: The function to run.
+            *args: The positional arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            The result of the function.
+        """
+        submitted_at = monotonic()
+
+        def _run():
+            wait_seconds = monotonic() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._total_wait_seconds += wait_seconds
+                self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        with self._lock:
+            self._queued += 1
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+        future = self._executor.submit(_run)
+        future.add_done_callback(self._cancelled_callback)
+        return await asyncio.wrap_future(future)
+
+    def _cancelled_callback(self, future: Future):
+        """Forgets a call cancelled before it started."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def shutdown(self, wait: bool = True):
+        """Shuts the pool down once the submitted calls are done."""
+        self._executor.shutdown(wait=wait)
+
+
+_io_executor: Optional[IOExecutor] = None
+_io_executor_lock = threading.Lock()
+
+
+def get_io_executor() -> IOExecutor:
+    """Returns the process-wide executor of the blocking Kubernetes API calls,
+    creating it with `IO_MAX_WORKERS` threads on first use.
+    """
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = IOExecutor()
+        return _io_executor
+
+
+def configure_io_executor(max_workers: int) -> IOExecutor:
+    """Replaces the process-wide executor of the blocking Kubernetes API calls
+    with one of `max_workers` threads, to size it for the cluster. The calls
+    already submitted to the previous executor finish on it.
+
+    Args:
+        max_workers: The number of threads of the pool.
+
+    Returns:
+        The new executor.
+    """
+    global _io_executor
+    io_executor = IOExecutor(max_workers)
+    with _io_executor_lock:
+        previous, _io_executor = _io_executor, io_executor
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return io_executor
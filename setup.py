@@ -26,7 +26,11 @@ setup(
     packages=find_packages(exclude=("tests", "docs")),
     python_requires=">=3.7",
     install_requires=install_requires,
-    extras_require={"dev": dev_requires},
+    extras_require={
+        "dev": dev_requires,
+        "asyncio": ["kubernetes_asyncio>=24.2.3"],
+        "orjson": ["orjson>=3.6.0"],
+    },
     entry_points={
         "prefect.collections": [
             "prefect_spark_on_k8s_operator = prefect_spark_on_k8s_operator",
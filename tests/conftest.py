@@ -1,14 +1,37 @@
-from contextlib import contextmanager
+import copy
+import time
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import yaml
+from fake_kubernetes import FakeKubernetesServer, OperatorSimulator
 from kubernetes.client import CoreV1Api, CustomObjectsApi
-from kubernetes.client.models import V1ObjectMeta, V1Pod, V1PodList
+from kubernetes.client.models import (
+    CoreV1Event,
+    CoreV1EventList,
+    V1ContainerState,
+    V1ContainerStateWaiting,
+    V1ContainerStatus,
+    V1ObjectMeta,
+    V1ObjectReference,
+    V1Pod,
+    V1PodCondition,
+    V1PodList,
+    V1PodStatus,
+)
 from prefect.blocks.kubernetes import KubernetesClusterConfig
 from prefect_kubernetes.credentials import KubernetesCredentials
 
+from prefect_spark_on_k8s_operator.admission import _admission_controllers
+from prefect_spark_on_k8s_operator.client import (
+    _async_configurations,
+    _client_sessions,
+    _configurations,
+)
+from prefect_spark_on_k8s_operator.limiter import _rate_limiters
+from prefect_spark_on_k8s_operator.tracking import _shared_trackers
+
 BASEDIR = Path("tests")
 GOOD_CONFIG_FILE_PATH = BASEDIR / "kube_config.yaml"
 SPARK_APP_FIXTURES_BASEDIR = Path("tests/sample_spark_jobs")
@@ -19,6 +42,22 @@ EMPTY_JOB_YAML = SPARK_APP_FIXTURES_BASEDIR / "empty_job_status.yaml"
 HUNG_JOB_YAML = SPARK_APP_FIXTURES_BASEDIR / "hung_job_status.yaml"
 
 
+@pytest.fixture(autouse=True)
+def _reset_client_sessions():
+    # the sessions hold the clients mocked by each test.
+    yield
+    # the trackers left running would call the clients mocked by the next test.
+    for tracker in list(_shared_trackers.values()):
+        tracker.stop()
+        tracker.join()
+    _shared_trackers.clear()
+    _client_sessions.clear()
+    _rate_limiters.clear()
+    _configurations.clear()
+    _async_configurations.clear()
+    _admission_controllers.clear()
+
+
 @pytest.fixture
 def kube_config_dict():
     return yaml.safe_load(GOOD_CONFIG_FILE_PATH.read_text())
@@ -61,6 +100,71 @@ def v1_pod_list():
     )
 
 
+@pytest.fixture
+def unschedulable_driver_pod():
+    return V1Pod(
+        metadata=V1ObjectMeta(name="spark-pi-965y-driver"),
+        status=V1PodStatus(
+            phase="Pending",
+            conditions=[
+                V1PodCondition(
+                    type="PodScheduled",
+                    status="False",
+                    reason="Unschedulable",
+                    message="0/3 nodes are available: 3 Insufficient cpu.",
+                )
+            ],
+        ),
+    )
+
+
+@pytest.fixture
+def image_pull_driver_pod():
+    return V1Pod(
+        metadata=V1ObjectMeta(name="spark-pi-965y-driver"),
+        status=V1PodStatus(
+            phase="Pending",
+            container_statuses=[
+                V1ContainerStatus(
+                    name="spark-kubernetes-driver",
+                    image="apache/spark:v0.0.0",
+                    image_id="",
+                    ready=False,
+                    restart_count=0,
+                    state=V1ContainerState(
+                        waiting=V1ContainerStateWaiting(
+                            reason="ImagePullBackOff",
+                            message="Back-off pulling image",
+                        )
+                    ),
+                )
+            ],
+        ),
+    )
+
+
+@pytest.fixture
+def failed_mount_events():
+    return CoreV1EventList(
+        items=[
+            CoreV1Event(
+                metadata=V1ObjectMeta(name="spark-pi-965y-driver.1"),
+                involved_object=V1ObjectReference(name="spark-pi-965y-driver"),
+                type="Warning",
+                reason="FailedMount",
+                message='persistentvolumeclaim "data" not found',
+            )
+        ]
+    )
+
+
+@pytest.fixture
+def mock_read_namespaced_pod(_mock_kubernets_api_client, unschedulable_driver_pod):
+    mock_pod = _mock_kubernets_api_client.read_namespaced_pod
+    mock_pod.return_value = unschedulable_driver_pod
+    return mock_pod
+
+
 @pytest.fixture
 def pod_log():
     return "test-logs"
@@ -81,13 +185,9 @@ def _mock_kubernets_api_client(monkeypatch):
         spec=list(set(dir(CoreV1Api) + dir(CustomObjectsApi)))
     )
 
-    @contextmanager
-    def get_client(self, _):
-        yield custom_objects_client
-
     monkeypatch.setattr(
-        "prefect_kubernetes.credentials.KubernetesCredentials.get_client",
-        get_client,
+        "prefect_spark_on_k8s_operator.client.create_client",
+        lambda api_client, client_type: custom_objects_client,
     )
 
     return custom_objects_client
@@ -95,114 +195,251 @@ def _mock_kubernets_api_client(monkeypatch):
 
 @pytest.fixture
 def mock_create_namespaced_custom_object(
-    monkeypatch,
+    _mock_kubernets_api_client,
     sample_spark_app,
 ):
-    mock_v1_job = AsyncMock(return_value=sample_spark_app)
-    monkeypatch.setattr(
-        "prefect_kubernetes.custom_objects.create_namespaced_custom_object.fn",
-        mock_v1_job,
-    )
+    mock_v1_job = _mock_kubernets_api_client.create_namespaced_custom_object
+    mock_v1_job.return_value = sample_spark_app
     return mock_v1_job
 
 
 @pytest.fixture
 def mock_get_namespaced_custom_object_status_completed(
-    monkeypatch,
+    _mock_kubernets_api_client,
     completed_spark_app,
 ):
-    mock_completed_job = AsyncMock(return_value=completed_spark_app)
-    monkeypatch.setattr(
-        "prefect_kubernetes.custom_objects.get_namespaced_custom_object_status.fn",
-        mock_completed_job,
-    )
+    mock_completed_job = _mock_kubernets_api_client.get_namespaced_custom_object_status
+    mock_completed_job.return_value = completed_spark_app
     return mock_completed_job
 
 
 @pytest.fixture
 def mock_get_namespaced_custom_object_status_failed(
-    monkeypatch,
+    _mock_kubernets_api_client,
     failed_spark_app,
 ):
-    mock_failed_job = AsyncMock(return_value=failed_spark_app)
-    monkeypatch.setattr(
-        "prefect_kubernetes.custom_objects.get_namespaced_custom_object_status.fn",
-        mock_failed_job,
-    )
+    mock_failed_job = _mock_kubernets_api_client.get_namespaced_custom_object_status
+    mock_failed_job.return_value = failed_spark_app
     return mock_failed_job
 
 
+@pytest.fixture
+def mock_get_namespaced_custom_object_status_failing(
+    _mock_kubernets_api_client,
+    failed_spark_app,
+):
+    failed_spark_app["status"]["applicationState"]["state"] = "FAILING"
+    mock_failing_job = _mock_kubernets_api_client.get_namespaced_custom_object_status
+    mock_failing_job.return_value = failed_spark_app
+    return mock_failing_job
+
+
+@pytest.fixture
+def mock_get_namespaced_custom_object_status_submitted(
+    _mock_kubernets_api_client,
+    hung_spark_app,
+):
+    hung_spark_app["status"]["applicationState"]["state"] = "SUBMITTED"
+    mock_submitted_job = _mock_kubernets_api_client.get_namespaced_custom_object_status
+    mock_submitted_job.return_value = hung_spark_app
+    return mock_submitted_job
+
+
+@pytest.fixture
+def mock_get_namespaced_custom_object_status_running(
+    _mock_kubernets_api_client,
+    hung_spark_app,
+):
+    hung_spark_app["status"]["applicationState"]["state"] = "RUNNING"
+    mock_running_job = _mock_kubernets_api_client.get_namespaced_custom_object_status
+    mock_running_job.return_value = hung_spark_app
+    return mock_running_job
+
+
+@pytest.fixture
+def mock_status_with_executors(
+    mock_get_namespaced_custom_object_status_running,
+    completed_spark_app,
+    hung_spark_app,
+):
+    executors_pending = copy.deepcopy(hung_spark_app)
+    executors_pending["status"]["executorState"] = {"spark-pi-exec-1": "PENDING"}
+    executors_running = copy.deepcopy(hung_spark_app)
+    executors_running["metadata"]["resourceVersion"] = "221570"
+    executors_running["status"]["executorState"] = {"spark-pi-exec-1": "RUNNING"}
+    completed_spark_app["status"]["executorState"] = {"spark-pi-exec-1": "COMPLETED"}
+    mock_get_namespaced_custom_object_status_running.side_effect = [
+        executors_pending,
+        executors_running,
+        completed_spark_app,
+    ]
+    return mock_get_namespaced_custom_object_status_running
+
+
 @pytest.fixture
 def mock_get_namespaced_custom_object_status_init(
-    monkeypatch,
+    _mock_kubernets_api_client,
     empty_spark_app,
     completed_spark_app,
 ):
-    mock_empty_job = AsyncMock(
-        side_effect=(2 * [empty_spark_app] + 2 * [completed_spark_app])
-    )
-    monkeypatch.setattr(
-        "prefect_kubernetes.custom_objects.get_namespaced_custom_object_status.fn",
-        mock_empty_job,
-    )
+    mock_empty_job = _mock_kubernets_api_client.get_namespaced_custom_object_status
+    mock_empty_job.side_effect = 2 * [empty_spark_app] + 2 * [completed_spark_app]
     return mock_empty_job
 
 
 @pytest.fixture
 def mock_get_namespaced_custom_object_status_unknown(
-    monkeypatch,
+    _mock_kubernets_api_client,
     hung_spark_app,
 ):
-    mock_hung_job = AsyncMock(return_value=hung_spark_app)
-    monkeypatch.setattr(
-        "prefect_kubernetes.custom_objects.get_namespaced_custom_object_status.fn",
-        mock_hung_job,
-    )
+    mock_hung_job = _mock_kubernets_api_client.get_namespaced_custom_object_status
+    mock_hung_job.return_value = hung_spark_app
     return mock_hung_job
 
 
 @pytest.fixture
 def mock_get_namespaced_custom_object_status_recovered(
-    monkeypatch,
+    _mock_kubernets_api_client,
     hung_spark_app,
     completed_spark_app,
 ):
-    mock_recovered_job = AsyncMock(
-        side_effect=(4 * [hung_spark_app] + 2 * [completed_spark_app])
-    )
-    monkeypatch.setattr(
-        "prefect_kubernetes.custom_objects.get_namespaced_custom_object_status.fn",
-        mock_recovered_job,
-    )
+    mock_recovered_job = _mock_kubernets_api_client.get_namespaced_custom_object_status
+    mock_recovered_job.side_effect = 4 * [hung_spark_app] + 2 * [completed_spark_app]
     return mock_recovered_job
 
 
 @pytest.fixture
-def mock_delete_namespaced_custom_object(
-    monkeypatch,
-    deleted_spark_app,
-):
-    mock_deleted_job = AsyncMock(return_value=deleted_spark_app)
-    monkeypatch.setattr(
-        "prefect_kubernetes.custom_objects.delete_namespaced_custom_object.fn",
-        mock_deleted_job,
-    )
+def mock_get_namespaced_custom_object(_mock_kubernets_api_client, hung_spark_app):
+    mock_get_job = _mock_kubernets_api_client.get_namespaced_custom_object
+    mock_get_job.return_value = hung_spark_app
+    return mock_get_job
+
+
+@pytest.fixture
+def mock_list_namespaced_custom_object(_mock_kubernets_api_client, hung_spark_app):
+    hung_spark_app["metadata"]["annotations"] = {
+        "prefect-spark-on-k8s-operator/base-name": "spark-pi"
+    }
+    mock_list_jobs = _mock_kubernets_api_client.list_namespaced_custom_object
+    mock_list_jobs.return_value = {"items": [hung_spark_app]}
+    return mock_list_jobs
+
+
+@pytest.fixture
+def mock_delete_namespaced_custom_object(_mock_kubernets_api_client, deleted_spark_app):
+    mock_deleted_job = _mock_kubernets_api_client.delete_namespaced_custom_object
+    mock_deleted_job.return_value = deleted_spark_app
     return mock_deleted_job
 
 
 @pytest.fixture
-def mock_list_namespaced_pod(monkeypatch, v1_pod_list):
-    mock_v1_pod_list = AsyncMock(return_value=v1_pod_list)
-    monkeypatch.setattr(
-        "prefect_kubernetes.pods.list_namespaced_pod.fn", mock_v1_pod_list
-    )
+def mock_list_namespaced_pod(_mock_kubernets_api_client, v1_pod_list):
+    mock_v1_pod_list = _mock_kubernets_api_client.list_namespaced_pod
+    mock_v1_pod_list.return_value = v1_pod_list
     return mock_v1_pod_list
 
 
 @pytest.fixture
-def mock_read_namespaced_pod_log(monkeypatch, pod_log):
-    mock_pod_log = AsyncMock(return_value=pod_log)
+def mock_read_namespaced_pod_log(_mock_kubernets_api_client, pod_log):
+    mock_pod_log = _mock_kubernets_api_client.read_namespaced_pod_log
+    mock_pod_log.return_value = pod_log
+    return mock_pod_log
+
+
+class FakeAsyncApiException(Exception):
+    def __init__(self, status, reason=None):
+        self.status = status
+        self.reason = reason
+        self.body = None
+        self.headers = {}
+
+
+class FakeAsyncApi:
+    """Awaitable proxy of the methods of the mocked API client."""
+
+    def __init__(self, api_client):
+        self._api_client = api_client
+
+    def __getattr__(self, name):
+        method = getattr(self._api_client, name)
+
+        async def _call(**kwargs):
+            return method(**kwargs)
+
+        return _call
+
+
+@pytest.fixture
+def mock_kubernetes_asyncio(monkeypatch, _mock_kubernets_api_client):
+    async_api_client = MagicMock(close=AsyncMock())
+    async_client = MagicMock(
+        ApiClient=MagicMock(return_value=async_api_client),
+        CustomObjectsApi=lambda _: FakeAsyncApi(_mock_kubernets_api_client),
+        CoreV1Api=lambda _: FakeAsyncApi(_mock_kubernets_api_client),
+        ApiException=FakeAsyncApiException,
+    )
+    async_config = MagicMock(load_kube_config_from_dict=AsyncMock())
     monkeypatch.setattr(
-        "prefect_kubernetes.pods.read_namespaced_pod_log.fn", mock_pod_log
+        "prefect_spark_on_k8s_operator.client.async_client", async_client
     )
-    return mock_pod_log
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.client.async_config", async_config
+    )
+    return async_api_client
+
+
+class FakeWatch:
+    """Replays the given watch events on the first stream and idles afterwards."""
+
+    def __init__(self, events):
+        self.events = events
+        self.calls = []
+
+    def __call__(self):
+        return self
+
+    def stream(self, func, **kwargs):
+        self.calls.append(kwargs)
+        if len(self.calls) == 1:
+            for event in self.events:
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        else:
+            time.sleep(0.05)
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def fake_watch():
+    return FakeWatch
+
+
+@pytest.fixture
+def mock_watch_completed(monkeypatch, _mock_kubernets_api_client, completed_spark_app):
+    _mock_kubernets_api_client.list_namespaced_custom_object.return_value = {
+        "metadata": {"resourceVersion": "1"},
+        "items": [],
+    }
+    completed_spark_app["metadata"]["resourceVersion"] = "221561"
+    fake_watch = FakeWatch([{"type": "MODIFIED", "object": completed_spark_app}])
+    monkeypatch.setattr("kubernetes.watch.Watch", fake_watch)
+    return fake_watch
+
+
+@pytest.fixture
+def fake_kubernetes():
+    server = FakeKubernetesServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def operator_simulator(fake_kubernetes):
+    simulator = OperatorSimulator(fake_kubernetes.state)
+    simulator.start()
+    yield simulator
+    simulator.stop()
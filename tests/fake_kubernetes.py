@@ -0,0 +1,820 @@
+"""An in-process stand-in of the Kubernetes API server, serving the
+`sparkoperator.k8s.io/v1beta2` sparkapplications endpoints and the `core/v1` pod,
+pod log and event endpoints over real HTTP, with an operator simulator moving
+the created applications through the states of the spark-on-k8s-operator.
+
+The server supports create, get, list, delete and watch of sparkapplications,
+label and field selectors, paginated lists and injected failures. It exercises
+the `kubernetes` clients, connection pools, watches and timing of the library
+end to end without a cluster, and can be used to load test many concurrent runs:
+
+    server = FakeKubernetesServer()
+    simulator = OperatorSimulator(server.state, run_seconds=5, jitter=0.5)
+    server.start()
+    simulator.start()
+    credentials = server.credentials()
+"""
+
+import bisect
+import heapq
+import json
+import random
+import re
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from time import monotonic
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from prefect.blocks.kubernetes import KubernetesClusterConfig
+from prefect_kubernetes.credentials import KubernetesCredentials
+
+SPARK_APPLICATIONS_PATH = re.compile(
+    r"^/apis/sparkoperator\.k8s\.io/v1beta2/namespaces/(?P<namespace>[^/]+)"
+    r"/sparkapplications(?:/(?P<name>[^/]+)(?P<status>/status)?)?$"
+)
+PODS_PATH = re.compile(
+    r"^/api/v1/namespaces/(?P<namespace>[^/]+)/pods"
+    r"(?:/(?P<name>[^/]+)(?P<log>/log)?)?$"
+)
+EVENTS_PATH = re.compile(r"^/api/v1/namespaces/(?P<namespace>[^/]+)/events$")
+
+Key = Tuple[str, str]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _get_path(obj: Dict[str, Any], path: str) -> Optional[str]:
+    """Returns the value of a dotted field path of an object, e.g. `metadata.name`."""
+    value = obj
+    for field in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(field)
+    return value
+
+
+def parse_selector(selector: Optional[str]) -> Callable[[Dict[str, str]], bool]:
+    """Returns a predicate on a dict of labels or fields matching a selector made
+    of `key=value`, `key==value`, `key!=value` and `key` requirements.
+    """
+    requirements = []
+    for requirement in filter(None, (selector or "").split(",")):
+        if "!=" in requirement:
+            key, value = requirement.split("!=", 1)
+            requirements.append((key.strip(), "!=", value.strip()))
+        elif "=" in requirement:
+            key, value = requirement.replace("==", "=").split("=", 1)
+            requirements.append((key.strip(), "=", value.strip()))
+        else:
+            requirements.append((requirement.strip(), "exists", None))
+
+    def _matches(values: Dict[str, str]) -> bool:
+        for key, operator, value in requirements:
+            if operator == "exists" and key not in values:
+                return False
+            if operator == "=" and values.get(key) != value:
+                return False
+            if operator == "!=" and values.get(key) == value:
+                return False
+        return True
+
+    return _matches
+
+
+def _matcher(query: Dict[str, str]) -> Callable[[Dict[str, Any]], bool]:
+    """Returns a predicate on objects matching the selectors of a list query."""
+    labels_match = parse_selector(query.get("labelSelector"))
+    field_selector = query.get("fieldSelector")
+    fields_match = parse_selector(field_selector)
+    field_paths = [
+        re.split("!=|==|=", requirement)[0].strip()
+        for requirement in filter(None, (field_selector or "").split(","))
+    ]
+
+    def _matches(obj: Dict[str, Any]) -> bool:
+        labels = (obj.get("metadata") or {}).get("labels") or {}
+        fields = {path: _get_path(obj, path) for path in field_paths}
+        return labels_match(labels) and fields_match(fields)
+
+    return _matches
+
+
+class FakeKubernetesState:
+    """The objects stored by the fake API server, with the history of the
+    sparkapplications changes served to watches.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._resource_version = 0
+        self.applications: Dict[Key, Dict[str, Any]] = {}
+        self.pods: Dict[Key, Dict[str, Any]] = {}
+        self.pod_logs: Dict[Key, str] = {}
+        self.events: Dict[str, List[Dict[str, Any]]] = {}
+        self._history: List[Tuple[int, str, Dict[str, Any]]] = []
+        self._history_versions: List[int] = []
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.stopped = False
+
+    @property
+    def resource_version(self) -> str:
+        with self._condition:
+            return str(self._resource_version)
+
+    def _record(self, event_type: str, application: Dict[str, Any]):
+        """Bumps the resourceVersion of a changed application and records the
+        change for the watches. Must be called holding the condition.
+        """
+        self._resource_version += 1
+        application["metadata"]["resourceVersion"] = str(self._resource_version)
+        self._history.append(
+            (self._resource_version, event_type, json.loads(json.dumps(application)))
+        )
+        self._history_versions.append(self._resource_version)
+        self._condition.notify_all()
+
+    def create_application(
+        self, namespace: str, body: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Stores a new application, returns None if the name is taken."""
+        body = json.loads(json.dumps(body))
+        metadata = body.setdefault("metadata", {})
+        key = (namespace, metadata.get("name"))
+        with self._condition:
+            if key in self.applications:
+                return None
+            metadata.update(
+                namespace=namespace,
+                uid=str(uuid.uuid4()),
+                creationTimestamp=_now(),
+                generation=1,
+            )
+            body.pop("status", None)
+            self.applications[key] = body
+            self._record("ADDED", body)
+            application = json.loads(json.dumps(body))
+        for listener in self.listeners:
+            listener(application)
+        return application
+
+    def get_application(self, namespace: str, name: str) -> Optional[Dict[str, Any]]:
+        with self._condition:
+            application = self.applications.get((namespace, name))
+            return json.loads(json.dumps(application)) if application else None
+
+    def update_application(
+        self, namespace: str, name: str, mutate: Callable[[Dict[str, Any]], None]
+    ) -> Optional[Dict[str, Any]]:
+        """Applies mutate to a stored application, returns None if it is gone."""
+        with self._condition:
+            application = self.applications.get((namespace, name))
+            if application is None:
+                return None
+            mutate(application)
+            self._record("MODIFIED", application)
+            return json.loads(json.dumps(application))
+
+    def delete_application(self, namespace: str, name: str) -> Optional[Dict[str, Any]]:
+        """Deletes an application and its pods, returns None if it is gone."""
+        with self._condition:
+            application = self.applications.pop((namespace, name), None)
+            if application is None:
+                return None
+            self._record("DELETED", application)
+            for key, pod in list(self.pods.items()):
+                labels = pod["metadata"].get("labels") or {}
+                if (
+                    key[0] == namespace
+                    and labels.get("sparkoperator.k8s.io/app-name") == name
+                ):
+                    del self.pods[key]
+            return application
+
+    def list_applications(
+        self, namespace: str, matches: Callable[[Dict[str, Any]], bool]
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        with self._condition:
+            items = [
+                json.loads(json.dumps(application))
+                for (application_namespace, _), application in sorted(
+                    self.applications.items()
+                )
+                if application_namespace == namespace and matches(application)
+            ]
+            return items, str(self._resource_version)
+
+    def watch_applications(
+        self,
+        namespace: str,
+        resource_version: int,
+        matches: Callable[[Dict[str, Any]], bool],
+        deadline: float,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yields the changes of the matching applications made after
+        resource_version until the deadline or the server stops.
+        """
+        last = resource_version
+        while True:
+            with self._condition:
+                start = bisect.bisect_right(self._history_versions, last)
+                events = self._history[start:]
+                if not events:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0 or self.stopped:
+                        return
+                    self._condition.wait(remaining)
+                    continue
+            for version, event_type, application in events:
+                last = version
+                if application["metadata"].get("namespace") == namespace and matches(
+                    application
+                ):
+                    yield event_type, application
+
+    def set_pod(self, namespace: str, pod: Dict[str, Any], log: str = ""):
+        """Stores or replaces a pod and its log."""
+        key = (namespace, pod["metadata"]["name"])
+        with self._condition:
+            pod["metadata"]["namespace"] = namespace
+            self.pods[key] = pod
+            self.pod_logs[key] = log
+
+    def list_pods(
+        self, namespace: str, matches: Callable[[Dict[str, Any]], bool]
+    ) -> List[Dict[str, Any]]:
+        with self._condition:
+            return [
+                json.loads(json.dumps(pod))
+                for (pod_namespace, _), pod in sorted(self.pods.items())
+                if pod_namespace == namespace and matches(pod)
+            ]
+
+    def get_pod(self, namespace: str, name: str) -> Optional[Tuple[Dict, str]]:
+        """Returns a pod and its log, None if there is no such pod."""
+        with self._condition:
+            pod = self.pods.get((namespace, name))
+            if pod is None:
+                return None
+            return json.loads(json.dumps(pod)), self.pod_logs[(namespace, name)]
+
+    def stop(self):
+        """Ends the open watches."""
+        with self._condition:
+            self.stopped = True
+            self._condition.notify_all()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves the requests of the Kubernetes clients from the server state."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_HTTPServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _send(
+        self,
+        code: int,
+        body: Any,
+        content_type: str = "application/json",
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_status(
+        self, code: int, reason: str, message: str, headers: Dict[str, str] = None
+    ):
+        self._send(
+            code,
+            {
+                "kind": "Status",
+                "apiVersion": "v1",
+                "metadata": {},
+                "status": "Failure",
+                "message": message,
+                "reason": reason,
+                "code": code,
+            },
+            headers=headers,
+        )
+
+    def _handle(self, method: str):
+        fake = self.server.fake
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = self._read_body() if method in ("POST", "DELETE") else {}
+
+        for pattern, handler in (
+            (SPARK_APPLICATIONS_PATH, self._spark_applications),
+            (PODS_PATH, self._pods),
+            (EVENTS_PATH, self._events),
+        ):
+            match = pattern.match(url.path)
+            if match is not None:
+                break
+        else:
+            self._send_status(404, "NotFound", f"unknown path {url.path}")
+            return
+
+        resource = fake.count_request(method, url.path, match, query)
+        fault = fake.pop_fault(method, resource)
+        if fault is not None:
+            code, headers = fault
+            self._send_status(code, "Injected", "injected failure", headers)
+            return
+        handler(method, match.groupdict(), query, body)
+
+    def _spark_applications(self, method, path, query, body):
+        state = self.server.fake.state
+        namespace, name = path["namespace"], path["name"]
+        if name is None and method == "POST":
+            application = state.create_application(namespace, body)
+            if application is None:
+                self._send_status(
+                    409,
+                    "AlreadyExists",
+                    f'sparkapplications "{body["metadata"]["name"]}" already exists',
+                )
+            else:
+                self._send(201, application)
+        elif name is None and method == "GET":
+            if query.get("watch", "").lower() == "true":
+                self._watch(namespace, query)
+            else:
+                self._list(namespace, query)
+        elif method == "GET":
+            application = state.get_application(namespace, name)
+            if application is None:
+                self._not_found(name)
+            else:
+                self._send(200, application)
+        elif method == "DELETE":
+            application = state.delete_application(namespace, name)
+            if application is None:
+                self._not_found(name)
+            else:
+                self._send(
+                    200,
+                    {
+                        "kind": "Status",
+                        "apiVersion": "v1",
+                        "metadata": {},
+                        "status": "Success",
+                        "details": {
+                            "name": name,
+                            "group": "sparkoperator.k8s.io",
+                            "kind": "sparkapplications",
+                            "uid": application["metadata"]["uid"],
+                        },
+                    },
+                )
+        else:
+            self._send_status(405, "MethodNotAllowed", f"{method} not allowed")
+
+    def _not_found(self, name: str):
+        self._send_status(404, "NotFound", f'sparkapplications "{name}" not found')
+
+    def _list(self, namespace: str, query: Dict[str, str]):
+        items, resource_version = self.server.fake.state.list_applications(
+            namespace, _matcher(query)
+        )
+        start = int(query.get("continue") or 0)
+        limit = int(query.get("limit") or 0)
+        metadata = {"resourceVersion": resource_version}
+        if limit and start + limit < len(items):
+            metadata["continue"] = str(start + limit)
+            items = items[start : start + limit]
+        else:
+            items = items[start:]
+        self._send(
+            200,
+            {
+                "apiVersion": "sparkoperator.k8s.io/v1beta2",
+                "kind": "SparkApplicationList",
+                "metadata": metadata,
+                "items": items,
+            },
+        )
+
+    def _watch(self, namespace: str, query: Dict[str, str]):
+        state = self.server.fake.state
+        matches = _matcher(query)
+        deadline = monotonic() + float(query.get("timeoutSeconds") or 300)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        resource_version = query.get("resourceVersion")
+        if not resource_version or resource_version == "0":
+            # like the API server, start with the current state of the objects.
+            items, resource_version = state.list_applications(namespace, matches)
+            for application in items:
+                self._write_chunk({"type": "ADDED", "object": application})
+        try:
+            for event_type, application in state.watch_applications(
+                namespace, int(resource_version), matches, deadline
+            ):
+                self._write_chunk({"type": event_type, "object": application})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _write_chunk(self, event: Dict[str, Any]):
+        data = json.dumps(event).encode() + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _pods(self, method, path, query, body):
+        state = self.server.fake.state
+        namespace, name = path["namespace"], path["name"]
+        if method != "GET":
+            self._send_status(405, "MethodNotAllowed", f"{method} not allowed")
+            return
+        if name is None:
+            pods = state.list_pods(namespace, _matcher(query))
+            self._send(
+                200,
+                {"apiVersion": "v1", "kind": "PodList", "metadata": {}, "items": pods},
+            )
+            return
+        pod_and_log = state.get_pod(namespace, name)
+        if pod_and_log is None:
+            self._send_status(404, "NotFound", f'pods "{name}" not found')
+        elif path["log"]:
+            self._send(200, pod_and_log[1], "text/plain")
+        else:
+            self._send(200, pod_and_log[0])
+
+    def _events(self, method, path, query, body):
+        matches = _matcher(query)
+        events = [
+            event
+            for event in self.server.fake.state.events.get(path["namespace"], [])
+            if matches(event)
+        ]
+        self._send(
+            200,
+            {"apiVersion": "v1", "kind": "EventList", "metadata": {}, "items": events},
+        )
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeKubernetesServer"
+
+
+class FakeKubernetesServer:
+    """Serves a `FakeKubernetesState` over HTTP on a free local port.
+
+    Attributes:
+        state: The objects served.
+        requests: The number of requests per HTTP method and resource,
+            e.g. `GET sparkapplications/status` or `GET sparkapplications/watch`.
+    """
+
+    def __init__(self, state: Optional[FakeKubernetesState] = None):
+        self.state = state or FakeKubernetesState()
+        self.requests: Counter = Counter()
+        self._faults: List[List[Any]] = []
+        self._lock = threading.Lock()
+        self._server = _HTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-kubernetes", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self.state.stop()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def kube_config(self) -> Dict[str, Any]:
+        """Returns a kubeconfig dict pointing at the server."""
+        return {
+            "apiVersion": "v1",
+            "kind": "Config",
+            "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+            "contexts": [
+                {"name": "fake", "context": {"cluster": "fake", "user": "fake"}}
+            ],
+            "current-context": "fake",
+            "users": [{"name": "fake", "user": {"token": "fake-token"}}],
+        }
+
+    def credentials(self) -> KubernetesCredentials:
+        """Returns credentials pointing at the server."""
+        return KubernetesCredentials(
+            cluster_config=KubernetesClusterConfig(
+                context_name="fake", config=self.kube_config()
+            )
+        )
+
+    def fail_next(
+        self,
+        code: int,
+        times: int = 1,
+        resource: Optional[str] = None,
+        method: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """Answers the next matching requests with an error instead of serving them.
+
+        Args:
+            code: The HTTP status code of the error, e.g. `429`.
+            times: The number of requests to fail.
+            resource: Only fail the requests of this resource, e.g.
+                `sparkapplications/status`.
+            method: Only fail the requests of this HTTP method.
+            headers: The headers of the error, e.g. `{"Retry-After": "1"}`.
+        """
+        with self._lock:
+            self._faults.append([code, times, resource, method, headers or {}])
+
+    def pop_fault(
+        self, method: str, resource: str
+    ) -> Optional[Tuple[int, Dict[str, str]]]:
+        with self._lock:
+            for fault in self._faults:
+                code, times, fault_resource, fault_method, headers = fault
+                if fault_resource not in (None, resource):
+                    continue
+                if fault_method not in (None, method):
+                    continue
+                fault[1] -= 1
+                if fault[1] <= 0:
+                    self._faults.remove(fault)
+                return code, headers
+        return None
+
+    def count_request(
+        self, method: str, path: str, match: re.Match, query: Dict[str, str]
+    ) -> str:
+        """Counts a request and returns its resource."""
+        groups = match.groupdict()
+        if match.re is SPARK_APPLICATIONS_PATH:
+            resource = "sparkapplications"
+            if groups["status"]:
+                resource += "/status"
+            elif groups["name"] is None and query.get("watch", "").lower() == "true":
+                resource += "/watch"
+        elif match.re is PODS_PATH:
+            resource = "pods/log" if groups["log"] else "pods"
+        else:
+            resource = "events"
+        with self._lock:
+            self.requests[f"{method} {resource}"] += 1
+        return resource
+
+
+class OperatorSimulator:
+    """Moves the created applications through the states of the
+    spark-on-k8s-operator: SUBMITTED with a pending driver pod, RUNNING with
+    its executors, SUCCEEDING or FAILING and then COMPLETED or FAILED.
+
+    Args:
+        state: The state of the fake API server.
+        submit_seconds: The time from the creation to SUBMITTED.
+        start_seconds: The time from SUBMITTED to RUNNING.
+        run_seconds: The time from RUNNING to SUCCEEDING or FAILING.
+        finish_seconds: The time from SUCCEEDING or FAILING to the terminal state.
+        jitter: The fraction of each time randomly added or removed.
+        outcome: Returns the terminal state of an application, `COMPLETED` or
+            `FAILED`. Defaults to `COMPLETED`. Can be replaced through the
+            `outcome` attribute.
+
+    A step can be held with `hold`, to keep the applications in their state until
+    the test observed it and calls `release`.
+    """
+
+    def __init__(
+        self,
+        state: FakeKubernetesState,
+        submit_seconds: float = 0.05,
+        start_seconds: float = 0.05,
+        run_seconds: float = 0.1,
+        finish_seconds: float = 0.05,
+        jitter: float = 0.0,
+        outcome: Optional[Callable[[Dict[str, Any]], str]] = None,
+    ):
+        self.state = state
+        self._delays = {
+            "SUBMITTED": submit_seconds,
+            "RUNNING": start_seconds,
+            "FINISHING": run_seconds,
+            "TERMINAL": finish_seconds,
+        }
+        self._jitter = jitter
+        self.outcome = outcome or (lambda application: "COMPLETED")
+        self._schedule: List[Tuple[float, int, Key, str]] = []
+        self._sequence = count()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        self._held: Dict[str, List[Key]] = {}
+        state.listeners.append(self._on_added)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="operator-simulator", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def hold(self, step: str):
+        """Holds the applications before `step`, e.g. `FINISHING` to keep them
+        RUNNING, until `release`.
+        """
+        with self._condition:
+            self._held.setdefault(step, [])
+
+    def release(self, step: str):
+        """Moves the applications held before `step` on."""
+        with self._condition:
+            keys = self._held.pop(step, [])
+        for key in keys:
+            self._schedule_step(key, step)
+
+    def _schedule_step(self, key: Key, step: str):
+        delay = self._delays[step]
+        delay *= 1 + random.uniform(-self._jitter, self._jitter)
+        with self._condition:
+            heapq.heappush(
+                self._schedule,
+                (monotonic() + max(delay, 0), next(self._sequence), key, step),
+            )
+            self._condition.notify_all()
+
+    def _on_added(self, application: Dict[str, Any]):
+        metadata = application["metadata"]
+        self._schedule_step((metadata["namespace"], metadata["name"]), "SUBMITTED")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped and (
+                    not self._schedule or self._schedule[0][0] > monotonic()
+                ):
+                    timeout = (
+                        self._schedule[0][0] - monotonic() if self._schedule else None
+                    )
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+                _, _, key, step = heapq.heappop(self._schedule)
+                if step in self._held:
+                    self._held[step].append(key)
+                    continue
+            next_step = getattr(self, f"_{step.lower()}")(*key)
+            if next_step is not None:
+                self._schedule_step(key, next_step)
+
+    def _driver_pod(
+        self, namespace: str, name: str, status: Dict[str, Any], phase: str
+    ):
+        pod_name = f"{name}-driver"
+        self.state.set_pod(
+            namespace,
+            {
+                "apiVersion": "v1",
+                "kind": "Pod",
+                "metadata": {
+                    "name": pod_name,
+                    "labels": {
+                        "spark-app-selector": status["sparkApplicationId"],
+                        "sparkoperator.k8s.io/app-name": name,
+                        "sparkoperator.k8s.io/submission-id": status["submissionID"],
+                        "spark-role": "driver",
+                    },
+                },
+                "spec": {
+                    "containers": [
+                        {"name": "spark-kubernetes-driver", "image": "spark"}
+                    ]
+                },
+                "status": {"phase": phase},
+            },
+            log=f"logs of {pod_name}",
+        )
+
+    def _submitted(self, namespace: str, name: str) -> Optional[str]:
+        def _mutate(application):
+            application["status"] = {
+                "applicationState": {"state": "SUBMITTED"},
+                "driverInfo": {"podName": f"{name}-driver"},
+                "sparkApplicationId": f"spark-{uuid.uuid4().hex}",
+                "submissionID": str(uuid.uuid4()),
+                "submissionAttempts": 1,
+                "lastSubmissionAttemptTime": _now(),
+                "executionAttempts": 0,
+            }
+
+        application = self.state.update_application(namespace, name, _mutate)
+        if application is None:
+            return None
+        self._driver_pod(namespace, name, application["status"], "Pending")
+        return "RUNNING"
+
+    def _running(self, namespace: str, name: str) -> Optional[str]:
+        def _mutate(application):
+            instances = (
+                application.get("spec", {}).get("executor", {}).get("instances", 1)
+            )
+            status = application["status"]
+            status["applicationState"] = {"state": "RUNNING"}
+            status["executionAttempts"] = 1
+            status["executorState"] = {
+                f"{name}-exec-{index}": "RUNNING" for index in range(1, instances + 1)
+            }
+
+        application = self.state.update_application(namespace, name, _mutate)
+        if application is None:
+            return None
+        self._driver_pod(namespace, name, application["status"], "Running")
+        return "FINISHING"
+
+    def _finishing(self, namespace: str, name: str) -> Optional[str]:
+        application = self.state.get_application(namespace, name)
+        if application is None:
+            return None
+        completed = self.outcome(application) == "COMPLETED"
+
+        def _mutate(application):
+            status = application["status"]
+            status["applicationState"] = {
+                "state": "SUCCEEDING" if completed else "FAILING"
+            }
+            status["executorState"] = {
+                pod_name: "COMPLETED" if completed else "FAILED"
+                for pod_name in status.get("executorState", {})
+            }
+
+        application = self.state.update_application(namespace, name, _mutate)
+        if application is None:
+            return None
+        self._driver_pod(
+            namespace,
+            name,
+            application["status"],
+            "Succeeded" if completed else "Failed",
+        )
+        return "TERMINAL"
+
+    def _terminal(self, namespace: str, name: str) -> Optional[str]:
+        def _mutate(application):
+            status = application["status"]
+            if status["applicationState"]["state"] == "SUCCEEDING":
+                status["applicationState"] = {"state": "COMPLETED"}
+            else:
+                status["applicationState"] = {
+                    "state": "FAILED",
+                    "errorMessage": "driver container failed with ExitCode: 1, "
+                    "Reason: Error",
+                }
+            status["terminationTime"] = _now()
+
+        self.state.update_application(namespace, name, _mutate)
+        return None
@@ -0,0 +1,257 @@
+import asyncio
+import copy
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+from kubernetes.client.models import (
+    V1Container,
+    V1ListMeta,
+    V1Node,
+    V1NodeCondition,
+    V1NodeList,
+    V1NodeSpec,
+    V1NodeStatus,
+    V1ObjectMeta,
+    V1Pod,
+    V1PodList,
+    V1PodSpec,
+    V1ResourceQuota,
+    V1ResourceQuotaList,
+    V1ResourceQuotaStatus,
+    V1ResourceRequirements,
+)
+
+from prefect_spark_on_k8s_operator.admission import (
+    AdmissionController,
+    AdmissionPolicy,
+    ClusterCapacity,
+    estimate_resources,
+    fits_ever,
+    get_admission_controller,
+    get_node_capacity,
+    get_quota_capacity,
+    get_shortage,
+    parse_jvm_memory,
+)
+
+GI = 2**30
+MI = 2**20
+
+# one driver and two executors of 1 core and 1g + 384Mi of overhead each.
+SPEC = {
+    "type": "Scala",
+    "driver": {"cores": 1, "memory": "1g"},
+    "executor": {"cores": 1, "instances": 2, "memory": "1g"},
+}
+
+
+def _node(name, cpu="4", memory="8Gi", ready=True, unschedulable=None):
+    return V1Node(
+        metadata=V1ObjectMeta(name=name),
+        spec=V1NodeSpec(unschedulable=unschedulable),
+        status=V1NodeStatus(
+            allocatable={"cpu": cpu, "memory": memory},
+            conditions=[
+                V1NodeCondition(type="Ready", status="True" if ready else "False")
+            ],
+        ),
+    )
+
+
+def _pod(node_name=None, cpu="1", memory="1Gi"):
+    return V1Pod(
+        spec=V1PodSpec(
+            node_name=node_name,
+            containers=[
+                V1Container(
+                    name="main",
+                    resources=V1ResourceRequirements(
+                        requests={"cpu": cpu, "memory": memory}
+                    ),
+                )
+            ],
+        )
+    )
+
+
+def _quota(hard, used):
+    return V1ResourceQuota(status=V1ResourceQuotaStatus(hard=hard, used=used))
+
+
+@pytest.fixture
+def admission_client(_mock_kubernets_api_client):
+    _mock_kubernets_api_client.list_node.return_value = V1NodeList(
+        items=[_node("node-1")], metadata=V1ListMeta()
+    )
+    _mock_kubernets_api_client.list_pod_for_all_namespaces.return_value = V1PodList(
+        items=[], metadata=V1ListMeta()
+    )
+    _mock_kubernets_api_client.list_namespaced_resource_quota.return_value = (
+        V1ResourceQuotaList(items=[], metadata=V1ListMeta())
+    )
+    return _mock_kubernets_api_client
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("512m", 512 * MI), ("2g", 2 * GI), ("2GB", 2 * GI), ("1024", GI), (1, MI)],
+)
+def test_parse_jvm_memory(value, expected):
+    assert parse_jvm_memory(value) == expected
+
+
+def test_estimate_resources():
+    estimate = estimate_resources({"spec": SPEC})
+    assert estimate.cpu == 3
+    assert estimate.memory == 3 * (GI + 384 * MI)
+    assert estimate.pods == 3
+    assert estimate.pod_cpu == 1
+    assert estimate.pod_memory == GI + 384 * MI
+
+
+def test_estimate_resources_overrides():
+    spec = copy.deepcopy(SPEC)
+    spec["type"] = "Python"
+    spec["driver"].update(coreRequest="500m", coreLimit="2", memory="10g")
+    spec["executor"].update(memoryOverhead="1g")
+    spec["dynamicAllocation"] = {"enabled": True, "initialExecutors": 4}
+    estimate = estimate_resources({"spec": spec})
+    assert estimate.cpu == 4.5
+    assert estimate.cpu_limit == 6
+    # 40% of overhead for the non-JVM driver.
+    assert estimate.memory == 14 * GI + 4 * 2 * GI
+    assert estimate.pods == 5
+    assert estimate.pod_memory == 14 * GI
+
+
+def test_get_node_capacity():
+    nodes = [
+        _node("node-1"),
+        _node("node-2", ready=False),
+        _node("node-3", unschedulable=True),
+    ]
+    pods = [_pod("node-1", cpu="500m"), _pod("node-2"), _pod(None, memory="2Gi")]
+    allocatable, free, pending = get_node_capacity(nodes, pods, headroom=0.5)
+    assert allocatable == [(2, 4 * GI)]
+    assert free == [(1.5, 3 * GI)]
+    assert pending == (1, 2 * GI)
+
+
+def test_get_quota_capacity():
+    quota_hard, quota_free = get_quota_capacity(
+        [
+            _quota({"requests.cpu": "10", "pods": "20"}, {"requests.cpu": "4"}),
+            _quota({"cpu": "8", "services": "5"}, {"cpu": "7500m"}),
+        ]
+    )
+    assert quota_hard == {"cpu": 8, "pods": 20}
+    assert quota_free == {"cpu": 0.5, "pods": 20}
+
+
+def test_get_shortage():
+    estimate = estimate_resources({"spec": SPEC})
+    capacity = ClusterCapacity(read_at=0, allocatable=[(4, 8 * GI)], free=[(4, 8 * GI)])
+    assert get_shortage(estimate, capacity) is None
+    assert "cores requested" in get_shortage(estimate, capacity, [estimate])
+    assert "largest pod" in get_shortage(
+        estimate, capacity._replace(free=[(0.5, 8 * GI), (0.5, 8 * GI)])
+    )
+    quota = capacity._replace(quota_hard={"pods": 10}, quota_free={"pods": 2})
+    assert "pods requested" in get_shortage(estimate, quota)
+    assert fits_ever(estimate, quota)
+    assert not fits_ever(estimate, quota._replace(quota_hard={"pods": 2}))
+
+
+async def test_admit_holds_until_reservations_are_accounted_for(
+    kubernetes_credentials, admission_client
+):
+    controller = AdmissionController(
+        kubernetes_credentials,
+        "default",
+        AdmissionPolicy(headroom=0, refresh_interval_seconds=60),
+    )
+    manifest = {"spec": SPEC}
+    reservation = await controller.admit(manifest)
+
+    # the first application takes 3 of the 4 cores.
+    admit = asyncio.ensure_future(controller.admit(manifest))
+    await asyncio.sleep(0.1)
+    assert not admit.done()
+    assert controller.queued == 1
+
+    # the next read of the capacity accounts for its released reservation.
+    reservation.release()
+    admission_client.list_pod_for_all_namespaces.return_value = V1PodList(
+        items=[_pod("node-1", cpu="1")], metadata=V1ListMeta()
+    )
+    controller.policy.refresh_interval_seconds = 0
+    await asyncio.wait_for(admit, timeout=5)
+    assert controller.queued == 0
+    assert controller.counters["admitted"] == 2
+    assert controller.counters["admitted_unfit"] == 0
+
+
+async def test_admit_wakes_only_the_head_of_the_queue(
+    kubernetes_credentials, admission_client, monkeypatch
+):
+    controller = AdmissionController(
+        kubernetes_credentials,
+        "default",
+        AdmissionPolicy(headroom=0, refresh_interval_seconds=60),
+    )
+    reservation = await controller.admit({"spec": SPEC})
+    checks = []
+    refresh = controller._refresh
+
+    async def _refresh():
+        checks.append(None)
+        await refresh()
+
+    monkeypatch.setattr(controller, "_refresh", _refresh)
+    admits = [
+        asyncio.ensure_future(controller.admit({"spec": SPEC})) for _ in range(100)
+    ]
+    await asyncio.sleep(1.2)
+    # the queued applications sleep instead of polling the capacity.
+    assert controller.queued == 100
+    assert len(checks) == 1
+
+    reservation.release()
+    await asyncio.sleep(0.1)
+    assert len(checks) == 2
+
+    for admit in admits:
+        admit.cancel()
+    await asyncio.gather(*admits, return_exceptions=True)
+    assert controller.queued == 0
+
+
+async def test_admit_applications_never_fitting(
+    kubernetes_credentials, admission_client
+):
+    admission_client.list_namespaced_resource_quota.return_value = V1ResourceQuotaList(
+        items=[_quota({"pods": "2"}, {"pods": "0"})], metadata=V1ListMeta()
+    )
+    controller = AdmissionController(kubernetes_credentials, "default")
+    await asyncio.wait_for(controller.admit({"spec": SPEC}), timeout=5)
+    assert controller.counters["admitted_unfit"] == 1
+
+
+async def test_admit_without_nodes_permission(kubernetes_credentials, admission_client):
+    admission_client.list_node.side_effect = ApiException(status=403)
+    controller = AdmissionController(kubernetes_credentials, "default")
+    await asyncio.wait_for(controller.admit({"spec": SPEC}), timeout=5)
+
+    _, kwargs = admission_client.list_namespaced_resource_quota.call_args
+    assert kwargs["namespace"] == "default"
+    assert admission_client.list_node.call_count == 1
+    assert controller.counters["admitted"] == 1
+
+
+def test_get_admission_controller_is_shared_per_namespace(kubernetes_credentials):
+    controller = get_admission_controller(
+        kubernetes_credentials, "default", AdmissionPolicy(headroom=0.2)
+    )
+    assert get_admission_controller(kubernetes_credentials, "default") is controller
+    assert controller.policy.headroom == 0.2
+    assert get_admission_controller(kubernetes_credentials, "other") is not controller
@@ -1,7 +1,32 @@
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
+from kubernetes.client.exceptions import ApiException
 
-from prefect_spark_on_k8s_operator.app import SparkApplication, generate_pod_selectors
+from prefect_spark_on_k8s_operator.admission import (
+    AdmissionPolicy,
+    Reservation,
+    estimate_resources,
+)
+from prefect_spark_on_k8s_operator.app import (
+    SparkApplication,
+    SparkApplicationRun,
+    generate_pod_selectors,
+    merge_manifest,
+)
 from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.events import (
+    DriverAssigned,
+    ExecutorsChanged,
+    StateChanged,
+    TerminalStateReached,
+)
+from prefect_spark_on_k8s_operator.limiter import RateLimit
+from prefect_spark_on_k8s_operator.polling import DurationPrediction, PollingPolicy
+from prefect_spark_on_k8s_operator.status import get_decided_state
 
 constants = model()
 
@@ -76,6 +101,14 @@ async def test_trigger(
         app_run._spark_application.manifest.get(constants.METADATA).get(constants.NAME)
         == app_run._spark_application.name
     )
+    _, kwargs = mock_create_namespaced_custom_object.call_args
+    metadata = kwargs["body"][constants.METADATA]
+    assert metadata[constants.LABELS].items() >= constants.MANAGED_BY_LABEL.items()
+    assert metadata[constants.ANNOTATIONS][constants.BASE_NAME_ANNOTATION] == "spark-pi"
+
+    await spark_app.trigger()
+    _, kwargs = mock_create_namespaced_custom_object.call_args
+    assert kwargs["body"][constants.METADATA][constants.NAME].count("-") == 2
 
 
 async def test_wait_for_completion_completed(
@@ -180,12 +213,7 @@ async def test_wait_for_completion_recovered(
     )
     app_run = await spark_app.trigger()
     status = await app_run._fetch_status()
-    app_state = (
-        status.get(constants.STATUS)
-        .get(constants.APPLICATION_STATE)
-        .get(constants.STATE)
-    )
-    assert app_state == constants.UNKNOWN
+    assert status.state == constants.UNKNOWN
     await app_run.wait_for_completion()
     assert app_run._terminal_state == constants.COMPLETED
 
@@ -202,7 +230,7 @@ async def test_wait_for_completion_init(
     )
     app_run = await spark_app.trigger()
     status = await app_run._fetch_status()
-    assert constants.STATUS not in status
+    assert not status.has_status
     await app_run.wait_for_completion()
     assert app_run._terminal_state == constants.COMPLETED
 
@@ -221,3 +249,779 @@ async def test_clean_up(
     app_run = await spark_app.trigger()
     await app_run.wait_for_completion()
     assert app_run._cleanup_status
+
+
+async def test_wait_for_completion_watch(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_unknown,
+    mock_watch_completed,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=1,
+        status_tracking="watch",
+    )
+    app_run = await spark_app.trigger()
+    watched_app = mock_watch_completed.events[0]["object"]
+    watched_app["metadata"]["name"] = app_run._spark_application.name
+    await app_run.wait_for_completion()
+    assert app_run._terminal_state == constants.COMPLETED
+    assert mock_watch_completed.calls
+    assert app_run._tracker is None
+
+
+async def test_wait_for_completion_informer(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_unknown,
+    mock_watch_completed,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=1,
+        status_tracking="informer",
+    )
+    app_run = await spark_app.trigger()
+    watched_app = mock_watch_completed.events[0]["object"]
+    watched_app["metadata"]["name"] = app_run._spark_application.name
+    await app_run.wait_for_completion()
+    assert app_run._terminal_state == constants.COMPLETED
+    assert mock_watch_completed.calls[0]["field_selector"] is None
+
+
+async def test_wait_for_completion_batch(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_unknown,
+    completed_spark_app,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=1,
+        status_tracking="batch",
+    )
+    app_run = await spark_app.trigger()
+    completed_spark_app["metadata"]["name"] = app_run._spark_application.name
+    completed_spark_app["metadata"]["resourceVersion"] = "221561"
+    _mock_kubernets_api_client.list_namespaced_custom_object.return_value = {
+        "metadata": {"resourceVersion": "2"},
+        "items": [completed_spark_app],
+    }
+    await app_run.wait_for_completion()
+    assert app_run._terminal_state == constants.COMPLETED
+    assert app_run._tracker is None
+
+
+async def test_stop_tracking_does_not_block_the_event_loop(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+):
+    listing, listed = threading.Event(), threading.Event()
+
+    def _list(**kwargs):
+        listing.set()
+        listed.wait(5)
+        return {"metadata": {"resourceVersion": "1"}, "items": []}
+
+    _mock_kubernets_api_client.list_namespaced_custom_object.side_effect = _list
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        status_tracking="batch",
+    )
+    app_run = await spark_app.trigger()
+    app_run._start_tracking()
+    tracker = app_run._tracker
+    assert listing.wait(5)
+
+    stopping = asyncio.ensure_future(app_run._stop_tracking())
+    # the loop keeps running while the LIST in flight holds the poller.
+    await asyncio.sleep(0.2)
+    assert not stopping.done()
+    assert tracker.stopped
+    listed.set()
+    await asyncio.wait_for(stopping, timeout=5)
+    assert not tracker._thread.is_alive()
+
+
+async def test_wait_for_completion_failing_is_decided(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_failing,
+    mock_list_namespaced_pod,
+    mock_read_namespaced_pod_log,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=60,
+    )
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert mock_get_namespaced_custom_object_status_failing.call_count == 1
+    assert app_run._terminal_state == constants.FAILED
+    assert "ExitCode: 101" in app_run._error_msg
+    with pytest.raises(RuntimeError):
+        await app_run.fetch_result()
+
+
+def test_poll_interval(kubernetes_credentials):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=7,
+    )
+    app_run = SparkApplicationRun(spark_application=spark_app)
+    assert app_run._poll_interval(constants.SUBMITTED, 1) == 7
+    assert app_run._poll_interval(constants.RUNNING, 5) == 7
+
+    spark_app.polling_policy = PollingPolicy(
+        submitting_interval_seconds=1, running_interval_seconds=4, jitter=0
+    )
+    assert app_run._poll_interval(constants.SUBMITTED, 1) == 1
+    assert app_run._poll_interval(constants.RUNNING, 2) == 8
+
+
+async def test_wait_for_completion_records_duration(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_completed,
+    tmp_path,
+):
+    prediction = DurationPrediction(history_path=tmp_path / "history.json")
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        duration_prediction=prediction,
+    )
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+    assert app_run._predicted_duration is None
+    assert prediction.predict("spark-pi") is not None
+
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+    assert app_run._predicted_duration is not None
+
+
+async def test_wait_for_completion_pending_driver(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_submitted,
+    mock_read_namespaced_pod,
+    mock_delete_namespaced_custom_object,
+    failed_mount_events,
+):
+    _mock_kubernets_api_client.list_namespaced_event.return_value = failed_mount_events
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=0,
+        pending_timeout_seconds=0,
+        delete_after_completion=False,
+    )
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._timed_out
+    assert app_run._terminal_state == constants.SUBMITTED
+    assert app_run._error_msg.startswith(constants.INSUFFICIENT_RESOURCES)
+    assert app_run._cleanup_status
+    _, kwargs = mock_read_namespaced_pod.call_args
+    assert kwargs["name"] == "spark-pi-965y-driver"
+    with pytest.raises(RuntimeError, match=constants.INSUFFICIENT_RESOURCES):
+        await app_run.fetch_result()
+
+
+@pytest.mark.parametrize("collect_driver_logs", [True, False])
+async def test_wait_for_completion_max_runtime(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_running,
+    mock_list_namespaced_pod,
+    mock_read_namespaced_pod_log,
+    mock_delete_namespaced_custom_object,
+    collect_driver_logs,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=60,
+        max_runtime_seconds=1,
+        collect_driver_logs=collect_driver_logs,
+        delete_after_completion=False,
+    )
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._deadline_exceeded
+    assert app_run._terminal_state == constants.RUNNING
+    assert app_run._cleanup_status
+    assert mock_read_namespaced_pod_log.called == collect_driver_logs
+    with pytest.raises(RuntimeError, match="max_runtime_seconds=1"):
+        await app_run.fetch_result()
+
+
+async def test_wait_for_completion_skips_unchanged_status(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_running,
+    completed_spark_app,
+    hung_spark_app,
+    monkeypatch,
+):
+    mock_get_namespaced_custom_object_status_running.side_effect = 3 * [
+        hung_spark_app
+    ] + [completed_spark_app]
+    mock_get_decided_state = MagicMock(side_effect=get_decided_state)
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.app.get_decided_state", mock_get_decided_state
+    )
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=0,
+        delete_after_completion=False,
+    )
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._terminal_state == constants.COMPLETED
+    assert mock_get_namespaced_custom_object_status_running.call_count == 4
+    assert mock_get_decided_state.call_count == 2
+
+
+async def test_wait_for_completion_records_timeline(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_failed,
+    mock_list_namespaced_pod,
+    mock_read_namespaced_pod_log,
+    monkeypatch,
+):
+    mock_publish_timeline = AsyncMock()
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.app.publish_timeline", mock_publish_timeline
+    )
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+    )
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert [event.event for event in app_run.timeline] == [
+        constants.TRIGGERED,
+        constants.FIRST_STATUS,
+        constants.FAILED,
+        constants.LOGS_COLLECTED,
+        constants.CLEANED_UP,
+    ]
+    assert app_run.timeline[0].detail == app_run._spark_application.name
+    args, _ = mock_publish_timeline.call_args
+    assert args[0].events == app_run.timeline
+    assert args[1] == "spark-pi"
+
+
+async def test_wait_for_completion_tracks_executors(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_status_with_executors,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=0,
+        delete_after_completion=False,
+    )
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run.executor_progress[constants.COMPLETED] == 1
+    summary = app_run.executor_summary
+    assert summary["requested"] == 1
+    assert summary["observed"] == 1
+    assert summary["max_running"] == 1
+    assert summary["never_started"] == 0
+    assert summary["max_startup_seconds"] >= 0
+
+
+async def test_attach(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_get_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_completed,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+    )
+    app_run = await SparkApplicationRun.attach(
+        spark_app, "spark-pi-965y", namespace="spark-operator"
+    )
+
+    _, kwargs = mock_get_namespaced_custom_object.call_args
+    assert kwargs["name"] == "spark-pi-965y"
+    assert kwargs["namespace"] == "spark-operator"
+    assert spark_app.namespace == "default"
+    assert app_run._spark_application.name == "spark-pi-965y"
+    assert app_run._base_name == "spark-pi-965y"
+    assert app_run.timeline[0].event == constants.ATTACHED
+    # timed from the creation of the application.
+    assert app_run.timeline[0].elapsed_seconds > 3600
+
+    await app_run.wait_for_completion()
+    assert app_run._terminal_state == constants.COMPLETED
+
+
+@pytest.mark.parametrize("state, reattached", [("RUNNING", True), ("FAILED", False)])
+async def test_trigger_reattach(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_list_namespaced_custom_object,
+    hung_spark_app,
+    monkeypatch,
+    state,
+    reattached,
+):
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.app._get_flow_run_id", lambda: "flow-run-id"
+    )
+    hung_spark_app["status"]["applicationState"]["state"] = state
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        reattach=True,
+    )
+    app_run = await spark_app.trigger()
+
+    _, kwargs = mock_list_namespaced_custom_object.call_args
+    assert kwargs["label_selector"] == "prefect.io/flow-run-id=flow-run-id"
+    assert mock_create_namespaced_custom_object.called != reattached
+    if reattached:
+        assert app_run._spark_application.name == "spark-pi-965y"
+        assert app_run.timeline[0].event == constants.ATTACHED
+    else:
+        _, kwargs = mock_create_namespaced_custom_object.call_args
+        labels = kwargs["body"]["metadata"]["labels"]
+        assert labels["prefect.io/flow-run-id"] == "flow-run-id"
+
+
+async def test_events(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_status_with_executors,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=0,
+        delete_after_completion=False,
+    )
+    app_run = await spark_app.trigger()
+    events = [event async for event in app_run.events()]
+
+    assert events[:3] == [
+        StateChanged(None, constants.RUNNING),
+        DriverAssigned("spark-pi-965y-driver"),
+        ExecutorsChanged(
+            {"PENDING": 1, "RUNNING": 0, "COMPLETED": 0, "FAILED": 0, "UNKNOWN": 0}
+        ),
+    ]
+    assert isinstance(events[3], ExecutorsChanged)
+    assert events[4] == StateChanged(constants.RUNNING, constants.COMPLETED)
+    assert isinstance(events[5], ExecutorsChanged)
+    assert events[-1] == TerminalStateReached(
+        constants.COMPLETED, True, app_run._error_msg
+    )
+    # the stream replays the events once the run is over.
+    assert [event async for event in app_run.events()] == events
+
+
+async def test_events_share_the_wait_for_completion_loop(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_status_with_executors,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=0,
+        delete_after_completion=False,
+    )
+    app_run = await spark_app.trigger()
+    waiter = asyncio.ensure_future(app_run.wait_for_completion())
+    async for event in app_run.events():
+        if event == StateChanged(None, constants.RUNNING):
+            break
+    await app_run.wait_for_completion()
+    await waiter
+
+    assert app_run._terminal_state == constants.COMPLETED
+    assert mock_status_with_executors.call_count == 3
+
+
+async def test_hooks(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_status_with_executors,
+    mock_delete_namespaced_custom_object,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=0,
+    )
+    calls = []
+
+    @spark_app.on_running
+    async def on_running(run):
+        calls.append(("on_running", run))
+
+    spark_app.on_state_change(lambda run, *states: calls.append(states))
+    spark_app.on_submitted(lambda run: calls.append("on_submitted"))
+    spark_app.on_cleanup(lambda run, deleted: calls.append(("on_cleanup", deleted)))
+    spark_app.on_terminal(lambda run, state: calls.append(("on_terminal", state)))
+
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert ("on_running", app_run) in calls
+    assert (None, constants.RUNNING) in calls
+    assert (constants.RUNNING, constants.COMPLETED) in calls
+    assert ("on_cleanup", True) in calls
+    assert ("on_terminal", constants.COMPLETED) in calls
+    assert "on_submitted" not in calls
+    assert len(calls) == 5
+    assert "_hooks" not in spark_app.dict()
+
+
+async def test_wait_for_completion_asyncio_backend(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_kubernetes_asyncio,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_failed,
+    mock_list_namespaced_pod,
+    mock_read_namespaced_pod_log,
+    mock_delete_namespaced_custom_object,
+):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        client_backend="asyncio",
+    )
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert mock_create_namespaced_custom_object.called
+    assert app_run._terminal_state == constants.FAILED
+    assert app_run.application_logs.get("spark-pi-khha-driver") == "test-logs"
+    assert app_run._cleanup_status
+    # one session for the trigger and one for the run.
+    assert mock_kubernetes_asyncio.close.await_count == 2
+
+
+async def test_wait_for_completion_retries_throttled_status_checks(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_completed,
+    completed_spark_app,
+):
+    throttled = ApiException(status=429, reason="Too Many Requests")
+    throttled.headers = {"Retry-After": "0"}
+    mock_get_namespaced_custom_object_status_completed.side_effect = [
+        throttled,
+        completed_spark_app,
+    ]
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+    )
+
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._terminal_state == constants.COMPLETED
+    assert spark_app.rate_limiter.counters["throttled"] == 1
+    assert spark_app.rate_limiter.counters["retried"] == 1
+
+
+async def test_wait_for_completion_fast_status_decode(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_completed,
+    completed_spark_app,
+):
+    response = MagicMock(data=json.dumps(completed_spark_app).encode())
+    mock_get_namespaced_custom_object_status_completed.return_value = response
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        fast_status_decode=True,
+    )
+
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._terminal_state == constants.COMPLETED
+    _, kwargs = mock_get_namespaced_custom_object_status_completed.call_args
+    assert kwargs["_preload_content"] is False
+    response.release_conn.assert_called()
+
+
+def test_merge_manifest():
+    manifest = {"metadata": {"name": "spark-pi"}, "spec": {"arguments": ["1"]}}
+    merged = merge_manifest(
+        manifest, {"metadata": {"labels": {"day": "1"}}, "spec": {"arguments": ["2"]}}
+    )
+    assert merged == {
+        "metadata": {"name": "spark-pi", "labels": {"day": "1"}},
+        "spec": {"arguments": ["2"]},
+    }
+    assert manifest == {"metadata": {"name": "spark-pi"}, "spec": {"arguments": ["1"]}}
+
+
+async def test_trigger_many(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    sample_spark_app,
+    monkeypatch,
+):
+    monkeypatch.setattr("prefect_spark_on_k8s_operator.app.sleep", AsyncMock())
+    mock_create_namespaced_custom_object.side_effect = [
+        ApiException(status=503),
+        sample_spark_app,
+        ApiException(status=400),
+        sample_spark_app,
+    ]
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+    )
+    result = await spark_app.trigger_many(
+        overrides=[{"spec": {"arguments": [str(day)]}} for day in range(3)],
+        max_concurrency=1,
+    )
+
+    assert isinstance(result.runs[0], SparkApplicationRun)
+    assert result.runs[1] is None
+    assert isinstance(result.runs[2], SparkApplicationRun)
+    assert list(result.errors) == [1]
+    assert result.errors[1].status == 400
+    bodies = [
+        kwargs["body"]
+        for _, kwargs in mock_create_namespaced_custom_object.call_args_list
+    ]
+    assert [body["spec"]["arguments"] for body in bodies] == [
+        ["0"],
+        ["0"],
+        ["1"],
+        ["2"],
+    ]
+    # the block itself isn't triggered.
+    assert not spark_app.name
+
+
+def _stamp_attempts(mock_create_namespaced_custom_object, errors):
+    """Fails the creations with the errors, recording the attempt stamps."""
+    stamps = []
+
+    def _create(body, **kwargs):
+        stamps.append(body["metadata"]["annotations"][constants.ATTEMPT_ANNOTATION])
+        raise errors.pop(0)
+
+    mock_create_namespaced_custom_object.side_effect = _create
+    return stamps
+
+
+async def test_trigger_many_adopts_application_created_by_failed_attempt(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object,
+    hung_spark_app,
+    monkeypatch,
+):
+    monkeypatch.setattr("prefect_spark_on_k8s_operator.app.sleep", AsyncMock())
+    stamps = _stamp_attempts(
+        mock_create_namespaced_custom_object,
+        [ApiException(status=504), ApiException(status=409)],
+    )
+    mock_get_namespaced_custom_object.side_effect = lambda **kwargs: {
+        **hung_spark_app,
+        "metadata": {
+            **hung_spark_app["metadata"],
+            "annotations": {constants.ATTEMPT_ANNOTATION: stamps[0]},
+        },
+    }
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+    )
+    result = await spark_app.trigger_many(manifests=[spark_app.manifest])
+
+    assert not result.errors
+    assert result.runs[0]._spark_application.name == "spark-pi-965y"
+    assert len(set(stamps)) == 2
+    names = [
+        kwargs["body"]["metadata"]["name"]
+        for _, kwargs in mock_create_namespaced_custom_object.call_args_list
+    ]
+    _, kwargs = mock_get_namespaced_custom_object.call_args
+    assert kwargs["name"] == names[0] == names[1]
+
+
+async def test_trigger_many_renames_application_not_created_by_failed_attempt(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object,
+    sample_spark_app,
+    monkeypatch,
+):
+    monkeypatch.setattr("prefect_spark_on_k8s_operator.app.sleep", AsyncMock())
+    errors = [ApiException(status=503), ApiException(status=409)]
+    names = []
+
+    def _create(body, **kwargs):
+        names.append(body["metadata"]["name"])
+        if errors:
+            raise errors.pop(0)
+        return sample_spark_app
+
+    mock_create_namespaced_custom_object.side_effect = _create
+    # the conflicting application was created by someone else.
+    mock_get_namespaced_custom_object.return_value = {
+        "metadata": {"annotations": {constants.ATTEMPT_ANNOTATION: "other"}}
+    }
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+    )
+    result = await spark_app.trigger_many(manifests=[spark_app.manifest])
+
+    assert not result.errors
+    assert isinstance(result.runs[0], SparkApplicationRun)
+    assert mock_get_namespaced_custom_object.call_count == 1
+    assert names[0] == names[1] != names[2]
+
+
+async def test_trigger_many_does_not_retry_throttled_creations(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    monkeypatch,
+):
+    monkeypatch.setattr("prefect_spark_on_k8s_operator.app.sleep", AsyncMock())
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        rate_limit=RateLimit(max_retries=0),
+    )
+    mock_create_namespaced_custom_object.side_effect = ApiException(status=429)
+    result = await spark_app.trigger_many(manifests=[spark_app.manifest])
+
+    assert result.errors[0].status == 429
+    assert mock_create_namespaced_custom_object.call_count == 1
+
+
+async def test_trigger_many_shares_hooks_with_the_block(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_completed,
+):
+    class Collector:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.states = []
+
+        def on_terminal(self, run, state):
+            with self.lock:
+                self.states.append(state)
+
+    collector = Collector()
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+    )
+    spark_app.on_terminal(collector.on_terminal)
+    result = await spark_app.trigger_many(manifests=[spark_app.manifest] * 2)
+    assert not result.errors
+
+    for app_run in result.runs:
+        await app_run.wait_for_completion()
+    assert collector.states == [constants.COMPLETED] * 2
+
+
+async def test_trigger_many_requires_overrides_or_manifests(kubernetes_credentials):
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+    )
+    with pytest.raises(ValueError):
+        await spark_app.trigger_many()
+
+
+async def test_trigger_admission(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_completed,
+    monkeypatch,
+):
+    reservations = []
+    create_calls = []
+
+    async def _admit(self, manifest):
+        # admitted before the application is created.
+        assert mock_create_namespaced_custom_object.call_count == create_calls[-1]
+        reservations.append(Reservation(estimate_resources(manifest)))
+        return reservations[-1]
+
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.admission.AdmissionController.admit", _admit
+    )
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        admission=AdmissionPolicy(),
+    )
+    create_calls.append(mock_create_namespaced_custom_object.call_count)
+    app_run = await spark_app.trigger()
+    assert reservations[0].released_at is None
+    assert reservations[0].estimate.pods == 2
+
+    await app_run.wait_for_completion()
+    assert reservations[0].released_at is not None
+
+    # the reservation of an application failing to be created is released.
+    mock_create_namespaced_custom_object.side_effect = ApiException(status=400)
+    create_calls.append(mock_create_namespaced_custom_object.call_count)
+    with pytest.raises(ApiException):
+        await spark_app.trigger()
+    assert reservations[1].released_at is not None
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+from urllib3.util.retry import Retry
+
+from prefect_spark_on_k8s_operator import client
+from prefect_spark_on_k8s_operator.client import (
+    AsyncKubernetesClientSession,
+    KubernetesClientSession,
+    acquire_client_session,
+    get_configuration,
+    release_client_session,
+)
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+
+constants = model()
+
+
+@pytest.fixture
+def client_contexts(monkeypatch):
+    contexts = {"entered": [], "exited": 0}
+
+    def create_client(api_client, client_type):
+        contexts["entered"].append(client_type)
+        return MagicMock(name=client_type)
+
+    def close(self):
+        contexts["exited"] += 1
+
+    monkeypatch.setattr(client, "create_client", create_client)
+    monkeypatch.setattr("kubernetes.client.ApiClient.close", close)
+    return contexts
+
+
+async def test_session_reuses_clients(kubernetes_credentials, client_contexts):
+    session = KubernetesClientSession(kubernetes_credentials)
+    api_client = session.client("custom_objects")
+    api_client.get_namespaced_custom_object_status.return_value = {}
+    for _ in range(3):
+        assert (
+            await session.call(
+                "custom_objects", "get_namespaced_custom_object_status", name="spark-pi"
+            )
+            == {}
+        )
+    await session.call("core", "read_namespaced_pod_log", name="spark-pi-driver")
+    assert client_contexts["entered"] == ["custom_objects", "core"]
+    assert not client_contexts["exited"]
+
+    session.close()
+    assert client_contexts["exited"] == 1
+    with pytest.raises(RuntimeError):
+        session.client("core")
+
+
+async def test_shared_session_is_refcounted(kubernetes_credentials, client_contexts):
+    session = acquire_client_session(kubernetes_credentials)
+    assert acquire_client_session(kubernetes_credentials) is session
+    session.client("core")
+
+    await release_client_session(session)
+    assert not client_contexts["exited"]
+    await release_client_session(session)
+    assert client_contexts["exited"] == 1
+    other_session = acquire_client_session(kubernetes_credentials)
+    assert other_session is not session
+    await release_client_session(other_session)
+
+
+async def test_async_session_call(
+    kubernetes_credentials, _mock_kubernets_api_client, mock_kubernetes_asyncio
+):
+    _mock_kubernets_api_client.read_namespaced_pod_log.return_value = "logs"
+    session = acquire_client_session(kubernetes_credentials, "asyncio")
+    assert isinstance(session, AsyncKubernetesClientSession)
+    assert acquire_client_session(kubernetes_credentials) is not session
+
+    assert await session.call("core", "read_namespaced_pod_log", name="pod") == "logs"
+    _mock_kubernets_api_client.read_namespaced_pod.side_effect = (
+        client.async_client.ApiException(404, "Not Found")
+    )
+    with pytest.raises(ApiException) as exc_info:
+        await session.call("core", "read_namespaced_pod", name="pod")
+    assert exc_info.value.status == 404
+
+    await release_client_session(session)
+    mock_kubernetes_asyncio.close.assert_awaited_once()
+
+
+def test_async_session_requires_kubernetes_asyncio(kubernetes_credentials, monkeypatch):
+    monkeypatch.setattr("prefect_spark_on_k8s_operator.client.async_client", None)
+    with pytest.raises(ImportError, match="asyncio"):
+        AsyncKubernetesClientSession(kubernetes_credentials)
+
+
+def test_session_disables_urllib3_retries(kubernetes_credentials):
+    session = KubernetesClientSession(kubernetes_credentials)
+    rest_client = session.client("custom_objects").api_client.rest_client
+    # urllib3 doesn't absorb the throttled calls, the limiter sees and retries them.
+    pool = rest_client.pool_manager.connection_from_url("https://localhost:9443")
+    retries = Retry.from_int(pool.retries)
+    assert not retries.is_retry("GET", 429, has_retry_after=True)
+    session.close()
+
+
+async def test_session_coalesces_identical_reads(
+    kubernetes_credentials, client_contexts
+):
+    session = KubernetesClientSession(kubernetes_credentials)
+    api_client = session.client("custom_objects")
+
+    def _get(name, **kwargs):
+        time.sleep(0.05)
+        return {"name": name}
+
+    api_client.get_namespaced_custom_object_status.side_effect = _get
+    results = await asyncio.gather(
+        *[
+            session.call(
+                "custom_objects", "get_namespaced_custom_object_status", name=name
+            )
+            for name in ["spark-pi", "spark-pi", "spark-pi", "other"]
+        ]
+    )
+    assert results == [{"name": "spark-pi"}] * 3 + [{"name": "other"}]
+    assert api_client.get_namespaced_custom_object_status.call_count == 2
+    assert session.single_flight.coalesced == 2
+
+    await asyncio.gather(
+        *[
+            session.call("custom_objects", "create_namespaced_custom_object", body={})
+            for _ in range(2)
+        ]
+    )
+    assert api_client.create_namespaced_custom_object.call_count == 2
+    session.close()
+
+
+async def test_session_call_raw(kubernetes_credentials, client_contexts):
+    session = KubernetesClientSession(kubernetes_credentials)
+    api_client = session.client("custom_objects")
+    response = api_client.get_namespaced_custom_object_status.return_value
+    response.data = b'{"status": {}}'
+
+    assert (
+        await session.call_raw(
+            "custom_objects", "get_namespaced_custom_object_status", name="spark-pi"
+        )
+        == b'{"status": {}}'
+    )
+    api_client.get_namespaced_custom_object_status.assert_called_once_with(
+        _preload_content=False, name="spark-pi"
+    )
+    response.release_conn.assert_called_once()
+    session.close()
+
+
+def test_configuration_is_resolved_once(kubernetes_credentials, monkeypatch):
+    loads = []
+    load_configuration = client._load_configuration
+
+    def _load_configuration(credentials):
+        loads.append(credentials)
+        return load_configuration(credentials)
+
+    monkeypatch.setattr(client, "_load_configuration", _load_configuration)
+    configuration = get_configuration(kubernetes_credentials)
+    assert configuration.host == "https://localhost:9443"
+    assert "testtoken" in str(configuration.api_key)
+    assert get_configuration(kubernetes_credentials.copy()) is configuration
+    assert len(loads) == 1
+
+
+async def test_sessions_share_the_configuration(
+    kubernetes_credentials, client_contexts
+):
+    sessions = [KubernetesClientSession(kubernetes_credentials) for _ in range(2)]
+    for session in sessions:
+        session.client("core")
+    api_clients = [session._api_client for session in sessions]
+    assert api_clients[0] is not api_clients[1]
+    assert api_clients[0].configuration is api_clients[1].configuration
+    assert api_clients[0].configuration is get_configuration(kubernetes_credentials)
+    for session in sessions:
+        session.close()
+
+
+async def test_throttled_reads_reach_the_rate_limiter(fake_kubernetes):
+    credentials = fake_kubernetes.credentials()
+    fake_kubernetes.state.create_application("default", {"metadata": {"name": "a"}})
+    fake_kubernetes.fail_next(
+        429, resource="sparkapplications/status", headers={"Retry-After": "0"}
+    )
+    session = KubernetesClientSession(credentials)
+    try:
+        application = await session.call(
+            constants.CUSTOM_OBJECTS_CLIENT,
+            "get_namespaced_custom_object_status",
+            group=constants.GROUP,
+            version=constants.VERSION,
+            plural=constants.PLURAL,
+            name="a",
+            namespace="default",
+        )
+    finally:
+        session.close()
+    assert application["metadata"]["name"] == "a"
+    # urllib3 doesn't absorb the 429, the limiter sees and retries it.
+    assert session.rate_limiter.counters["throttled"] == 1
+    assert session.rate_limiter.counters["retried"] == 1
@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from prefect_spark_on_k8s_operator import decode
+from prefect_spark_on_k8s_operator.decode import decode_status, loads, project_status
+from prefect_spark_on_k8s_operator.status import SparkApplicationStatus
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "json"])
+def json_decoder(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(decode, "orjson", None)
+    elif decode.orjson is None:
+        pytest.skip("orjson is not installed")
+
+
+def test_loads(json_decoder):
+    assert loads(b'{"a": [1, "b"]}') == {"a": [1, "b"]}
+    assert loads('{"a": null}') == {"a": None}
+
+
+def test_project_status(completed_spark_app):
+    projection = project_status(completed_spark_app)
+    assert set(projection) == {"metadata", "status"}
+    assert set(projection["metadata"]) <= {"name", "resourceVersion"}
+    assert projection["status"] == completed_spark_app["status"]
+    projected = SparkApplicationStatus.from_object(projection)
+    full = SparkApplicationStatus.from_object(completed_spark_app)
+    for field in SparkApplicationStatus.__slots__:
+        assert getattr(projected, field) == getattr(full, field)
+
+
+def test_project_status_without_status():
+    projection = project_status(
+        {"metadata": {"name": "spark-pi", "labels": {}}, "spec": {}}
+    )
+    assert projection == {"metadata": {"name": "spark-pi"}}
+    assert not SparkApplicationStatus.from_object(projection).has_status
+
+
+def test_decode_status(json_decoder, completed_spark_app):
+    data = json.dumps(completed_spark_app).encode()
+    assert decode_status(data) == project_status(completed_spark_app)
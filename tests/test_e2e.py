@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+
+from prefect_spark_on_k8s_operator import PollingPolicy, RateLimit, SparkApplication
+from prefect_spark_on_k8s_operator.client import KubernetesClientSession
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.tracking import SparkApplicationBatchPoller
+
+constants = model()
+
+MANY_RUNS = 200
+
+FAST_POLLING = PollingPolicy(
+    submitting_interval_seconds=0.02,
+    running_interval_seconds=0.02,
+    max_running_interval_seconds=0.05,
+    finishing_interval_seconds=0.02,
+)
+
+
+def _spark_app(fake_kubernetes, **kwargs) -> SparkApplication:
+    kwargs.setdefault("polling_policy", FAST_POLLING)
+    return SparkApplication.from_yaml_file(
+        credentials=fake_kubernetes.credentials(),
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        **kwargs,
+    )
+
+
+async def test_run_completes(fake_kubernetes, operator_simulator):
+    # each state is held until the run observed it, whatever the polling.
+    operator_simulator.hold("RUNNING")
+    operator_simulator.hold("FINISHING")
+    spark_app = _spark_app(fake_kubernetes)
+    spark_app.on_submitted(lambda run: operator_simulator.release("RUNNING"))
+    spark_app.on_running(lambda run: operator_simulator.release("FINISHING"))
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._terminal_state == constants.COMPLETED
+    assert app_run._completed
+    events = [timeline_event.event for timeline_event in app_run.timeline]
+    assert constants.SUBMITTED in events
+    assert constants.RUNNING in events
+    assert app_run.executor_summary["observed"] == 1
+    assert app_run._cleanup_status
+    assert not fake_kubernetes.state.applications
+    assert not fake_kubernetes.state.pods
+
+
+async def test_run_fails_and_collects_driver_logs(fake_kubernetes, operator_simulator):
+    operator_simulator.outcome = lambda application: constants.FAILED
+    spark_app = _spark_app(fake_kubernetes)
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    driver_pod_name = f"{spark_app.name}-driver"
+    assert app_run._terminal_state == constants.FAILED
+    assert not app_run._completed
+    assert app_run.application_logs == {driver_pod_name: f"logs of {driver_pod_name}"}
+
+
+@pytest.mark.parametrize("status_tracking", ["watch", "informer"])
+async def test_run_tracked_by_watch(
+    fake_kubernetes, operator_simulator, status_tracking
+):
+    app_run = await _spark_app(
+        fake_kubernetes, status_tracking=status_tracking
+    ).trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._terminal_state == constants.COMPLETED
+    assert fake_kubernetes.requests["GET sparkapplications/watch"] >= 1
+
+
+@pytest.mark.parametrize("status_tracking", ["batch", "informer"])
+async def test_many_concurrent_runs(
+    fake_kubernetes, operator_simulator, status_tracking
+):
+    # enough runs to drain the token bucket, and throttled by the server too.
+    rate_limit = RateLimit(qps=200, burst=50)
+    fake_kubernetes.fail_next(
+        429,
+        times=5,
+        resource="sparkapplications",
+        method="POST",
+        headers={"Retry-After": "0"},
+    )
+    spark_apps = [
+        _spark_app(
+            fake_kubernetes,
+            status_tracking=status_tracking,
+            interval_seconds=1,
+            rate_limit=rate_limit,
+        )
+        for _ in range(MANY_RUNS)
+    ]
+    # the random suffixes of that many runs sharing a name may collide.
+    for index, spark_app in enumerate(spark_apps):
+        spark_app.manifest[constants.METADATA][constants.NAME] += f"-{index}"
+    app_runs = await asyncio.gather(*[spark_app.trigger() for spark_app in spark_apps])
+    await asyncio.gather(*[app_run.wait_for_completion() for app_run in app_runs])
+
+    assert all(app_run._terminal_state == constants.COMPLETED for app_run in app_runs)
+    assert not fake_kubernetes.state.applications
+    # the runs share one tracker of the namespace.
+    if status_tracking == "batch":
+        assert fake_kubernetes.requests["GET sparkapplications"] < len(app_runs)
+    else:
+        assert fake_kubernetes.requests["GET sparkapplications/watch"] == 1
+    counters = spark_apps[0].rate_limiter.counters
+    assert counters["throttled"] == 5
+    assert counters["waited_seconds"] > 0
+    assert not counters["failed"]
+
+
+async def test_throttled_status_checks_are_retried(fake_kubernetes, operator_simulator):
+    fake_kubernetes.fail_next(
+        429, times=2, resource="sparkapplications/status", headers={"Retry-After": "0"}
+    )
+    spark_app = _spark_app(fake_kubernetes)
+    app_run = await spark_app.trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._terminal_state == constants.COMPLETED
+    assert spark_app.rate_limiter.counters["throttled"] == 2
+
+
+async def test_fast_status_decode(fake_kubernetes, operator_simulator):
+    app_run = await _spark_app(fake_kubernetes, fast_status_decode=True).trigger()
+    await app_run.wait_for_completion()
+
+    assert app_run._terminal_state == constants.COMPLETED
+    assert app_run._status.spark_application_id.startswith("spark-")
+
+
+def test_paginated_list(fake_kubernetes):
+    for index in range(5):
+        metadata = {"name": f"app-{index}", "labels": constants.MANAGED_BY_LABEL}
+        fake_kubernetes.state.create_application("default", {"metadata": metadata})
+    fake_kubernetes.state.create_application(
+        "default", {"metadata": {"name": "unmanaged"}}
+    )
+    credentials = fake_kubernetes.credentials()
+    poller = SparkApplicationBatchPoller(
+        credentials,
+        "default",
+        label_selector=constants.MANAGED_BY_SELECTOR,
+        interval_seconds=1,
+        page_size=2,
+    )
+    session = KubernetesClientSession(credentials)
+    try:
+        applications, resource_version = poller._list(
+            session.client(constants.CUSTOM_OBJECTS_CLIENT)
+        )
+    finally:
+        session.close()
+
+    assert sorted(application["metadata"]["name"] for application in applications) == [
+        f"app-{index}" for index in range(5)
+    ]
+    assert resource_version == fake_kubernetes.state.resource_version
+    assert fake_kubernetes.requests["GET sparkapplications"] == 3
+
+
+async def test_trigger_many(fake_kubernetes, operator_simulator, monkeypatch):
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.app.sleep", lambda seconds: asyncio.sleep(0)
+    )
+    fake_kubernetes.fail_next(503, times=3, resource="sparkapplications", method="POST")
+    spark_app = _spark_app(fake_kubernetes, status_tracking="batch")
+    result = await spark_app.trigger_many(
+        overrides=[{"spec": {"arguments": [str(day)]}} for day in range(30)],
+        max_concurrency=8,
+    )
+
+    assert not result.errors
+    assert len({app_run._spark_application.name for app_run in result.runs}) == 30
+    assert fake_kubernetes.requests["POST sparkapplications"] == 33
+    await asyncio.gather(*[app_run.wait_for_completion() for app_run in result.runs])
+    assert all(
+        app_run._terminal_state == constants.COMPLETED for app_run in result.runs
+    )
@@ -0,0 +1,49 @@
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.executors import ExecutorProgress
+
+constants = model()
+
+
+def test_executor_progress_counts():
+    progress = ExecutorProgress(requested=3)
+    progress.update(constants.RUNNING, {"exec-1": "RUNNING", "exec-2": "PENDING"})
+    assert progress.counts == {
+        "PENDING": 1,
+        "RUNNING": 1,
+        "COMPLETED": 0,
+        "FAILED": 0,
+        "UNKNOWN": 0,
+    }
+    progress.update(
+        constants.RUNNING,
+        {"exec-1": "COMPLETED", "exec-2": "RUNNING", "exec-3": "PENDING"},
+    )
+    assert progress.counts[constants.COMPLETED] == 1
+    assert progress.counts[constants.EXECUTOR_PENDING] == 1
+    assert len(progress.startup_seconds) == 2
+
+
+def test_executor_progress_summary():
+    progress = ExecutorProgress(requested=2)
+    assert progress.summary()["min_startup_seconds"] is None
+
+    progress.update(constants.RUNNING, {"exec-1": "PENDING", "exec-2": "PENDING"})
+    progress.update(constants.RUNNING, {"exec-1": "RUNNING", "exec-2": "PENDING"})
+    progress.update(constants.SUCCEEDING, {"exec-1": "COMPLETED", "exec-2": "FAILED"})
+
+    summary = progress.summary()
+    assert summary["requested"] == 2
+    assert summary["observed"] == 2
+    assert summary["max_running"] == 1
+    assert summary["never_started"] == 0
+    assert summary["counts"][constants.FAILED] == 1
+    assert 0 <= summary["min_startup_seconds"] <= summary["max_startup_seconds"]
+
+
+def test_executor_progress_never_started():
+    progress = ExecutorProgress()
+    progress.update(constants.RUNNING, {"exec-1": "PENDING"})
+    progress.update(constants.FAILING, {"exec-1": "PENDING"})
+    summary = progress.summary()
+    assert summary["never_started"] == 1
+    assert summary["median_startup_seconds"] is None
@@ -0,0 +1,102 @@
+import threading
+from unittest.mock import MagicMock
+
+from prefect_spark_on_k8s_operator.app import SparkApplication
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.events import (
+    CleanedUp,
+    StateChanged,
+    TerminalStateReached,
+)
+from prefect_spark_on_k8s_operator.hooks import HookDispatcher
+
+constants = model()
+
+
+async def test_dispatch_event_runs_sync_and_async_hooks():
+    run = MagicMock()
+    calls = []
+    threads = []
+
+    async def on_running(run):
+        calls.append(constants.ON_RUNNING)
+
+    def on_state_change(run, previous_state, state):
+        threads.append(threading.current_thread().name)
+        calls.append((previous_state, state))
+
+    dispatcher = HookDispatcher(
+        run,
+        {
+            constants.ON_RUNNING: [on_running],
+            constants.ON_STATE_CHANGE: [on_state_change],
+            constants.ON_CLEANUP: [lambda run, deleted: calls.append(deleted)],
+            constants.ON_TERMINAL: [lambda run, state: calls.append(state)],
+        },
+    )
+    dispatcher.dispatch_event(StateChanged(constants.SUBMITTED, constants.RUNNING))
+    dispatcher.dispatch_event(CleanedUp(True))
+    dispatcher.dispatch_event(TerminalStateReached(constants.COMPLETED, True, ""))
+    await dispatcher.drain()
+
+    assert sorted(map(str, calls)) == sorted(
+        map(
+            str,
+            [
+                constants.ON_RUNNING,
+                (constants.SUBMITTED, constants.RUNNING),
+                True,
+                constants.COMPLETED,
+            ],
+        )
+    )
+    assert threads[0].startswith("spark-application-hooks")
+
+
+async def test_failing_hook_is_logged():
+    run = MagicMock()
+
+    async def on_terminal(run, state):
+        raise ValueError("boom")
+
+    dispatcher = HookDispatcher(run, {constants.ON_TERMINAL: [on_terminal]})
+    dispatcher.dispatch_event(TerminalStateReached(constants.FAILED, False, ""))
+    await dispatcher.drain()
+
+    (message,), _ = run.logger.warning.call_args
+    assert "on_terminal" in message and "boom" in message
+
+
+async def test_terminal_hooks_run_before_logs_and_cleanup(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    mock_create_namespaced_custom_object,
+    mock_get_namespaced_custom_object_status_failing,
+    mock_list_namespaced_pod,
+    mock_read_namespaced_pod_log,
+    mock_delete_namespaced_custom_object,
+):
+    calls = []
+    spark_app = SparkApplication.from_yaml_file(
+        credentials=kubernetes_credentials,
+        manifest_path="tests/sample_spark_jobs/sample_job.yaml",
+        interval_seconds=60,
+    )
+
+    @spark_app.on_terminal
+    async def on_terminal(run, state):
+        calls.append(
+            (
+                constants.ON_TERMINAL,
+                mock_read_namespaced_pod_log.called,
+                mock_delete_namespaced_custom_object.called,
+            )
+        )
+
+    spark_app.on_cleanup(lambda run, deleted: calls.append(constants.ON_CLEANUP))
+    app_run = await spark_app.trigger()
+    events = [event async for event in app_run.events()]
+
+    assert calls == [(constants.ON_TERMINAL, False, False), constants.ON_CLEANUP]
+    assert [type(event) for event in events[-2:]] == [TerminalStateReached, CleanedUp]
+    assert mock_read_namespaced_pod_log.called
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+from prefect_spark_on_k8s_operator.limiter import (
+    RateLimit,
+    RateLimiter,
+    get_rate_limiter,
+    get_retry_after,
+    is_read,
+)
+
+
+def _api_exception(status, headers=None):
+    exc = ApiException(status=status, reason="reason")
+    exc.headers = headers
+    return exc
+
+
+def _failing(*errors, result="ok"):
+    calls = []
+
+    async def _call():
+        calls.append(time.monotonic())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return _call, calls
+
+
+@pytest.fixture
+def fast_retries():
+    return RateLimit(backoff_seconds=0.01, max_backoff_seconds=0.02, max_retries=2)
+
+
+def test_is_read():
+    assert is_read("get_namespaced_custom_object_status")
+    assert is_read("list_namespaced_pod")
+    assert is_read("read_namespaced_pod_log")
+    assert not is_read("create_namespaced_custom_object")
+    assert not is_read("delete_namespaced_custom_object")
+
+
+def test_get_retry_after():
+    assert get_retry_after(_api_exception(429)) is None
+    assert get_retry_after(_api_exception(429, {"Retry-After": "2"})) == 2
+    assert get_retry_after(_api_exception(429, {"Retry-After": "-1"})) == 0
+    assert get_retry_after(_api_exception(429, {"Retry-After": "soon"})) is None
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    retry_after = get_retry_after(
+        _api_exception(429, {"Retry-After": format_datetime(retry_at, usegmt=True)})
+    )
+    assert 28 < retry_after <= 30
+
+
+def test_acquire_waits_for_tokens():
+    limiter = RateLimiter(RateLimit(qps=20, burst=2))
+
+    async def _acquire_all():
+        started = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        return time.monotonic() - started
+
+    # the burst is free, the next two calls wait for the refill.
+    assert asyncio.run(_acquire_all()) >= 0.09
+    assert limiter.counters["calls"] == 4
+    assert limiter.counters["waited_seconds"] > 0
+
+
+def test_acquire_sync_waits_for_tokens():
+    limiter = RateLimiter(RateLimit(qps=20, burst=1))
+    started = time.monotonic()
+    limiter.acquire_sync()
+    limiter.acquire_sync()
+    assert time.monotonic() - started >= 0.045
+
+
+def test_call_retries_throttled_call_after_retry_after(fast_retries):
+    limiter = RateLimiter(fast_retries)
+    func, calls = _failing(_api_exception(429, {"Retry-After": "0.1"}))
+
+    assert asyncio.run(limiter.call("create_namespaced_custom_object", func)) == "ok"
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.09
+    counters = limiter.counters
+    assert counters["throttled"] == 1
+    assert counters["retried"] == 1
+    assert counters["failed"] == 0
+
+
+def test_retry_after_pauses_all_calls(fast_retries):
+    limiter = RateLimiter(fast_retries)
+    limiter.throttled(_api_exception(429, {"Retry-After": "0.1"}))
+    started = time.monotonic()
+    limiter.acquire_sync()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_call_retries_reads_on_server_errors(fast_retries):
+    limiter = RateLimiter(fast_retries)
+    func, calls = _failing(_api_exception(503), _api_exception(500))
+
+    assert asyncio.run(limiter.call("list_namespaced_pod", func)) == "ok"
+    assert len(calls) == 3
+    assert limiter.counters["retried"] == 2
+    assert limiter.counters["throttled"] == 0
+
+
+@pytest.mark.parametrize(
+    "method, status",
+    [
+        ("create_namespaced_custom_object", 503),
+        ("get_namespaced_custom_object", 404),
+    ],
+)
+def test_call_does_not_retry(fast_retries, method, status):
+    limiter = RateLimiter(fast_retries)
+    func, calls = _failing(_api_exception(status))
+
+    with pytest.raises(ApiException):
+        asyncio.run(limiter.call(method, func))
+    assert len(calls) == 1
+    assert limiter.counters["failed"] == 1
+
+
+def test_call_gives_up_after_max_retries(fast_retries):
+    limiter = RateLimiter(fast_retries)
+    func, calls = _failing(*[_api_exception(429)] * 3)
+
+    with pytest.raises(ApiException):
+        asyncio.run(limiter.call("get_namespaced_custom_object", func))
+    assert len(calls) == 3
+    counters = limiter.counters
+    assert counters["throttled"] == 3
+    assert counters["retried"] == 2
+    assert counters["failed"] == 1
+
+
+def test_get_rate_limiter_is_shared_per_cluster():
+    limiter = get_rate_limiter("cluster", RateLimit(qps=5))
+    assert get_rate_limiter("cluster") is limiter
+    assert get_rate_limiter("cluster", RateLimit(qps=10)).rate_limit.qps == 5
+    assert get_rate_limiter("other-cluster") is not limiter
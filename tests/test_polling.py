@@ -0,0 +1,68 @@
+import pytest
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.polling import DurationPrediction, PollingPolicy
+
+constants = model()
+
+
+@pytest.mark.parametrize(
+    "app_state", [constants.NEW, constants.SUBMITTED, constants.PENDING_RERUN]
+)
+def test_next_interval_submitting(app_state):
+    policy = PollingPolicy(submitting_interval_seconds=0.5)
+    assert policy.next_interval(app_state, 1) == 0.5
+    assert policy.next_interval(app_state, 10) == 0.5
+
+
+@pytest.mark.parametrize(
+    "app_state", [constants.SUCCEEDING, constants.FAILING, constants.SUBMISSION_FAILED]
+)
+def test_next_interval_finishing(app_state):
+    policy = PollingPolicy(finishing_interval_seconds=0.25)
+    assert policy.next_interval(app_state, 3) == 0.25
+
+
+def test_next_interval_running_backs_off():
+    policy = PollingPolicy(
+        running_interval_seconds=5,
+        max_running_interval_seconds=30,
+        backoff_factor=2,
+        jitter=0,
+    )
+    intervals = [policy.next_interval(constants.RUNNING, n) for n in range(1, 6)]
+    assert intervals == [5, 10, 20, 30, 30]
+    assert policy.next_interval(constants.UNKNOWN, 4) == 5
+
+
+def test_next_interval_running_jitter():
+    policy = PollingPolicy(running_interval_seconds=10, jitter=0.1)
+    for _ in range(20):
+        assert 9 <= policy.next_interval(constants.RUNNING, 1) <= 11
+
+
+def test_duration_prediction_records_median(tmp_path):
+    prediction = DurationPrediction(
+        history_path=tmp_path / "history.json", max_records=3
+    )
+    assert prediction.predict("spark-pi") is None
+    for duration in [100, 10, 20, 30]:
+        prediction.record("spark-pi", duration)
+    assert prediction.predict("spark-pi") == 20
+    assert prediction.predict("spark-other") is None
+
+
+def test_duration_prediction_next_interval(tmp_path):
+    prediction = DurationPrediction(
+        history_path=tmp_path / "history.json", max_interval_seconds=600
+    )
+    assert prediction.next_interval(0, 7200, 5) == 600
+    assert prediction.next_interval(7000, 7200, 5) == 100
+    assert prediction.next_interval(7195, 7200, 5) == 5
+    assert prediction.next_interval(8000, 7200, 5) == 5
+
+    elapsed, polls = 0, 0
+    while elapsed < 7200:
+        elapsed += prediction.next_interval(elapsed, 7200, 5)
+        polls += 1
+    assert polls < 0.05 * 7200 / 5
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from prefect_spark_on_k8s_operator.singleflight import SingleFlight, get_call_key
+
+
+def test_get_call_key():
+    assert get_call_key("core", "read_namespaced_pod", {"name": "a"}) == (
+        "core",
+        "read_namespaced_pod",
+        (("name", "a"),),
+    )
+    assert get_call_key("core", "list_namespaced_pod", {"b": 1, "a": 2}) == (
+        get_call_key("core", "list_namespaced_pod", {"a": 2, "b": 1})
+    )
+    assert get_call_key("core", "delete_namespaced_pod", {"name": "a"}) is None
+    assert get_call_key("core", "read_namespaced_pod", {"headers": {}}) is None
+
+
+def _counting_call(result="result", error=None):
+    calls = []
+
+    async def _call():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        if error is not None:
+            raise error
+        return result
+
+    return _call, calls
+
+
+def test_concurrent_calls_share_one_call():
+    single_flight = SingleFlight()
+    func, calls = _counting_call()
+
+    async def _run():
+        return await asyncio.gather(*[single_flight.do("key", func) for _ in range(3)])
+
+    assert asyncio.run(_run()) == ["result"] * 3
+    assert len(calls) == 1
+    assert single_flight.coalesced == 2
+
+
+def test_sequential_calls_are_not_shared():
+    single_flight = SingleFlight()
+    func, calls = _counting_call()
+
+    async def _run():
+        await single_flight.do("key", func)
+        await single_flight.do("key", func)
+
+    asyncio.run(_run())
+    assert len(calls) == 2
+    assert single_flight.coalesced == 0
+
+
+def test_error_is_shared():
+    single_flight = SingleFlight()
+    func, calls = _counting_call(error=ValueError("boom"))
+
+    async def _run():
+        return await asyncio.gather(
+            *[single_flight.do("key", func) for _ in range(2)], return_exceptions=True
+        )
+
+    results = asyncio.run(_run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(calls) == 1
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    single_flight = SingleFlight()
+    func, calls = _counting_call()
+
+    async def _run():
+        first = asyncio.ensure_future(single_flight.do("key", func))
+        second = asyncio.ensure_future(single_flight.do("key", func))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(_run()) == "result"
+    assert len(calls) == 1
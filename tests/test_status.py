@@ -0,0 +1,115 @@
+import pytest
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.status import (
+    SparkApplicationStatus,
+    classify_pending_driver,
+    get_decided_state,
+    should_retry,
+)
+
+constants = model()
+
+NEVER = {"restartPolicy": {"type": "Never"}}
+ALWAYS = {"restartPolicy": {"type": "Always"}}
+ON_FAILURE = {
+    "restartPolicy": {
+        "type": "OnFailure",
+        "onFailureRetries": 2,
+        "onSubmissionFailureRetries": 1,
+    }
+}
+
+
+@pytest.mark.parametrize(
+    "app_state, spec, decided_state",
+    [
+        (constants.COMPLETED, NEVER, constants.COMPLETED),
+        (constants.FAILED, ALWAYS, constants.FAILED),
+        (constants.SUCCEEDING, NEVER, constants.COMPLETED),
+        (constants.SUCCEEDING, {}, constants.COMPLETED),
+        (constants.SUCCEEDING, ON_FAILURE, constants.COMPLETED),
+        (constants.SUCCEEDING, ALWAYS, None),
+        (constants.FAILING, NEVER, constants.FAILED),
+        (constants.FAILING, ALWAYS, None),
+        (constants.SUBMISSION_FAILED, NEVER, constants.FAILED),
+        (constants.SUBMISSION_FAILED, ALWAYS, None),
+        (constants.NEW, NEVER, None),
+        (constants.SUBMITTED, NEVER, None),
+        (constants.RUNNING, NEVER, None),
+        (constants.UNKNOWN, NEVER, None),
+        (constants.INVALIDATING, NEVER, None),
+        (constants.PENDING_RERUN, NEVER, None),
+    ],
+)
+def test_get_decided_state(app_state, spec, decided_state):
+    status = SparkApplicationStatus(state=app_state)
+    assert get_decided_state(app_state, spec, status) == decided_state
+
+
+def test_should_retry_on_failure_counts_attempts():
+    def _status(**fields):
+        return SparkApplicationStatus(**fields)
+
+    assert should_retry(constants.FAILING, ON_FAILURE, _status(execution_attempts=2))
+    assert not should_retry(
+        constants.FAILING, ON_FAILURE, _status(execution_attempts=3)
+    )
+    assert should_retry(
+        constants.SUBMISSION_FAILED, ON_FAILURE, _status(submission_attempts=1)
+    )
+    assert not should_retry(
+        constants.SUBMISSION_FAILED, ON_FAILURE, _status(submission_attempts=2)
+    )
+    assert not should_retry(
+        constants.FAILING, {"restartPolicy": {"type": "OnFailure"}}, _status()
+    )
+
+
+def test_status_snapshot(completed_spark_app, empty_spark_app):
+    status = SparkApplicationStatus.from_object(completed_spark_app)
+    assert status.name == "spark-pi-965y"
+    assert status.resource_version == "221600"
+    assert status.has_status
+    assert status.state == constants.COMPLETED
+    assert status.spark_application_id == "spark-dbc38ace05ab47e8ad3cd094a179aa9e"
+    assert status.driver_info["podName"] == "spark-pi-965y-driver"
+    with pytest.raises(AttributeError):
+        status.state = constants.FAILED
+
+    status = SparkApplicationStatus.from_object(empty_spark_app)
+    assert not status.has_status
+    assert status.state == constants.NEW
+    assert status.executor_state == {}
+    assert status.execution_attempts == 0
+
+
+def test_transitions_cover_all_states():
+    states = set(constants.APPLICATION_STATE_TRANSITIONS)
+    for next_states in constants.APPLICATION_STATE_TRANSITIONS.values():
+        assert set(next_states) <= states
+    assert set(constants.RETRY_TRANSITIONS.values()) <= states
+
+
+def test_classify_pending_driver(
+    unschedulable_driver_pod, image_pull_driver_pod, failed_mount_events
+):
+    assert classify_pending_driver(None, [])[0] == constants.DRIVER_NOT_CREATED
+    assert classify_pending_driver(unschedulable_driver_pod, []) == (
+        constants.INSUFFICIENT_RESOURCES,
+        "Unschedulable: 0/3 nodes are available: 3 Insufficient cpu.",
+    )
+    assert classify_pending_driver(image_pull_driver_pod, [])[0] == (
+        constants.IMAGE_PULL_ERROR
+    )
+
+    unschedulable_driver_pod.status.conditions = []
+    assert classify_pending_driver(
+        unschedulable_driver_pod, failed_mount_events.items
+    ) == (constants.VOLUME_ERROR, 'FailedMount: persistentvolumeclaim "data" not found')
+    assert classify_pending_driver(unschedulable_driver_pod, [])[0] == (
+        constants.DRIVER_PENDING
+    )
+
+    unschedulable_driver_pod.status.phase = "Running"
+    assert classify_pending_driver(unschedulable_driver_pod, []) is None
@@ -0,0 +1,60 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.timeline import (
+    RunTimeline,
+    get_artifact_key,
+    publish_timeline,
+)
+
+constants = model()
+
+
+def test_timeline_to_table():
+    timeline = RunTimeline()
+    timeline.record(constants.TRIGGERED, "spark-pi-965y")
+    timeline.record(constants.RUNNING)
+    timeline.record(constants.COMPLETED)
+
+    rows = timeline.to_table()
+    assert [row["event"] for row in rows] == [
+        constants.TRIGGERED,
+        constants.RUNNING,
+        constants.COMPLETED,
+    ]
+    assert rows[0]["detail"] == "spark-pi-965y"
+    assert rows[-1]["elapsed_seconds"] >= rows[0]["elapsed_seconds"]
+    assert all(row["step_seconds"] >= 0 for row in rows)
+
+
+def test_get_artifact_key():
+    assert get_artifact_key("spark-pi") == "spark-pi-timeline"
+    assert get_artifact_key("Spark.Pi_v2") == "spark-pi-v2-timeline"
+
+
+async def test_publish_timeline_outside_of_a_run(monkeypatch):
+    mock_create_table_artifact = AsyncMock()
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.timeline.create_table_artifact",
+        mock_create_table_artifact,
+    )
+    assert await publish_timeline(RunTimeline(), "spark-pi", "") is None
+    mock_create_table_artifact.assert_not_called()
+
+
+async def test_publish_timeline_in_a_flow_run(monkeypatch):
+    mock_create_table_artifact = AsyncMock(return_value="artifact-id")
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.timeline.create_table_artifact",
+        mock_create_table_artifact,
+    )
+    monkeypatch.setattr(
+        "prefect_spark_on_k8s_operator.timeline.FlowRunContext.get", MagicMock()
+    )
+    timeline = RunTimeline()
+    timeline.record(constants.TRIGGERED)
+
+    assert await publish_timeline(timeline, "spark-pi", "desc") == "artifact-id"
+    _, kwargs = mock_create_table_artifact.call_args
+    assert kwargs["key"] == "spark-pi-timeline"
+    assert kwargs["table"] == timeline.to_table()
@@ -0,0 +1,211 @@
+import asyncio
+import threading
+
+from kubernetes.client.exceptions import ApiException
+
+from prefect_spark_on_k8s_operator.constants import SparkApplicationModel as model
+from prefect_spark_on_k8s_operator.tracking import (
+    SparkApplicationBatchPoller,
+    SparkApplicationWatcher,
+    acquire_shared_poller,
+    acquire_shared_watcher,
+    get_resource_version,
+    release_shared_tracker,
+)
+
+constants = model()
+
+
+async def _wait_until(predicate, timeout=5):
+    for _ in range(int(timeout / 0.05)):
+        if predicate():
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+def test_get_resource_version(completed_spark_app):
+    assert get_resource_version(completed_spark_app) == "221600"
+    assert get_resource_version(None) is None
+    assert get_resource_version({}) is None
+
+
+async def test_watcher_relists_into_index(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    monkeypatch,
+    fake_watch,
+    hung_spark_app,
+):
+    _mock_kubernets_api_client.list_namespaced_custom_object.return_value = {
+        "metadata": {"resourceVersion": "1"},
+        "items": [hung_spark_app],
+    }
+    monkeypatch.setattr("kubernetes.watch.Watch", fake_watch([]))
+    watcher = SparkApplicationWatcher(kubernetes_credentials, "spark-operator")
+    watcher.start()
+    try:
+        assert await _wait_until(lambda: watcher.synced)
+        application = await watcher.wait_for_change("spark-pi-965y", None, timeout=1)
+        assert application.resource_version == "221560"
+        assert application.state == constants.UNKNOWN
+        assert (
+            await watcher.wait_for_change("spark-pi-965y", "221560", timeout=0.1)
+            is None
+        )
+    finally:
+        watcher.stop()
+
+
+async def test_watcher_wakes_waiters(
+    kubernetes_credentials, mock_watch_completed, completed_spark_app
+):
+    watcher = SparkApplicationWatcher(
+        kubernetes_credentials,
+        "spark-operator",
+        field_selector="metadata.name=spark-pi-965y",
+    )
+    watcher.start()
+    try:
+        application = await watcher.wait_for_change("spark-pi-965y", "221560", 5)
+        assert application.resource_version == "221561"
+        assert application.state == constants.COMPLETED
+        assert mock_watch_completed.calls[0]["resource_version"] == "1"
+        assert (
+            mock_watch_completed.calls[0]["field_selector"]
+            == "metadata.name=spark-pi-965y"
+        )
+    finally:
+        watcher.stop()
+
+
+async def test_watcher_relists_on_gone(
+    kubernetes_credentials, _mock_kubernets_api_client, monkeypatch, fake_watch
+):
+    _mock_kubernets_api_client.list_namespaced_custom_object.return_value = {
+        "metadata": {"resourceVersion": "1"},
+        "items": [],
+    }
+    monkeypatch.setattr("kubernetes.watch.Watch", fake_watch([ApiException(410)]))
+    watcher = SparkApplicationWatcher(kubernetes_credentials, "spark-operator")
+    watcher.start()
+    try:
+        assert await _wait_until(
+            lambda: _mock_kubernets_api_client.list_namespaced_custom_object.call_count
+            >= 2
+        )
+    finally:
+        watcher.stop()
+
+
+async def test_watcher_stop_closes_the_stream(
+    kubernetes_credentials, _mock_kubernets_api_client
+):
+    closed = threading.Event()
+
+    class Response:
+        def stream(self, **kwargs):
+            # blocks like a stream without events until the server side timeout.
+            closed.wait(10)
+            yield from ()
+
+        def shutdown(self):
+            closed.set()
+
+        def close(self):
+            pass
+
+        def release_conn(self):
+            pass
+
+    def _list(**kwargs):
+        if kwargs.get("watch"):
+            return Response()
+        return {"metadata": {"resourceVersion": "1"}, "items": []}
+
+    _mock_kubernets_api_client.list_namespaced_custom_object.side_effect = _list
+    watcher = SparkApplicationWatcher(kubernetes_credentials, "spark-operator")
+    watcher.start()
+    assert await _wait_until(lambda: watcher._response is not None)
+    watcher.stop()
+    # the stream is open until the server side watch timeout otherwise.
+    watcher.join(timeout=2)
+    assert not watcher._thread.is_alive()
+
+
+async def test_shared_watcher_is_reused(
+    kubernetes_credentials, _mock_kubernets_api_client, monkeypatch, fake_watch
+):
+    _mock_kubernets_api_client.list_namespaced_custom_object.return_value = {
+        "metadata": {"resourceVersion": "1"},
+        "items": [],
+    }
+    monkeypatch.setattr("kubernetes.watch.Watch", fake_watch([]))
+    watcher = acquire_shared_watcher(kubernetes_credentials, "spark-operator")
+    other_watcher = acquire_shared_watcher(kubernetes_credentials, "spark-operator")
+    assert watcher is other_watcher
+    assert acquire_shared_watcher(kubernetes_credentials, "default") is not watcher
+
+    release_shared_tracker(other_watcher)
+    assert not watcher._stopped.is_set()
+    release_shared_tracker(watcher)
+    assert watcher._stopped.is_set()
+    release_shared_tracker(acquire_shared_watcher(kubernetes_credentials, "default"))
+
+
+async def test_batch_poller_wakes_waiters_per_tick(
+    kubernetes_credentials,
+    _mock_kubernets_api_client,
+    hung_spark_app,
+    completed_spark_app,
+):
+    completed_spark_app["metadata"]["resourceVersion"] = "221561"
+    other_app = {"metadata": {"name": "spark-pi-other", "resourceVersion": "7"}}
+    _mock_kubernets_api_client.list_namespaced_custom_object.side_effect = [
+        {"metadata": {"resourceVersion": "1"}, "items": [hung_spark_app]},
+        {
+            "metadata": {"resourceVersion": "2"},
+            "items": [completed_spark_app, other_app],
+        },
+    ] + 100 * [{"metadata": {"resourceVersion": "3"}, "items": []}]
+    poller = SparkApplicationBatchPoller(
+        kubernetes_credentials,
+        "spark-operator",
+        label_selector="app.kubernetes.io/managed-by=prefect-spark-on-k8s-operator",
+        interval_seconds=0.2,
+    )
+    poller.start()
+    try:
+        assert await _wait_until(lambda: poller.synced)
+        application = await poller.wait_for_change("spark-pi-965y", "221560", 5)
+        assert application.name == "spark-pi-965y"
+        assert application.state == constants.COMPLETED
+        _, kwargs = _mock_kubernets_api_client.list_namespaced_custom_object.call_args
+        assert kwargs["label_selector"] == (
+            "app.kubernetes.io/managed-by=prefect-spark-on-k8s-operator"
+        )
+    finally:
+        poller.stop()
+
+
+def test_shared_poller_is_keyed_by_interval(
+    kubernetes_credentials, _mock_kubernets_api_client
+):
+    _mock_kubernets_api_client.list_namespaced_custom_object.return_value = {
+        "metadata": {"resourceVersion": "1"},
+        "items": [],
+    }
+    poller = acquire_shared_poller(kubernetes_credentials, "spark-operator", 5)
+    try:
+        assert acquire_shared_poller(kubernetes_credentials, "spark-operator", 5) is (
+            poller
+        )
+        release_shared_tracker(poller)
+        other_poller = acquire_shared_poller(
+            kubernetes_credentials, "spark-operator", 10
+        )
+        assert other_poller is not poller
+        release_shared_tracker(other_poller)
+    finally:
+        release_shared_tracker(poller)
+    assert poller.stopped
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from prefect_spark_on_k8s_operator import workers
+from prefect_spark_on_k8s_operator.workers import (
+    IOExecutor,
+    configure_io_executor,
+    get_io_executor,
+)
+
+
+@pytest.fixture
+def io_executor():
+    io_executor = IOExecutor(max_workers=1)
+    yield io_executor
+    io_executor.shutdown()
+
+
+def test_run(io_executor):
+    result = asyncio.run(io_executor.run(lambda a, b=0: a + b, 1, b=2))
+    assert result == 3
+    metrics = io_executor.metrics
+    assert metrics["submitted"] == metrics["completed"] == 1
+    assert metrics["queue_depth"] == metrics["running"] == 0
+
+
+def test_run_raises(io_executor):
+    def _fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        asyncio.run(io_executor.run(_fail))
+    assert io_executor.metrics["completed"] == 1
+
+
+def test_metrics_of_a_saturated_pool(io_executor):
+    async def _run():
+        return await asyncio.gather(
+            *[io_executor.run(time.sleep, 0.05) for _ in range(3)]
+        )
+
+    asyncio.run(_run())
+    metrics = io_executor.metrics
+    assert metrics["max_workers"] == 1
+    assert metrics["max_queue_depth"] >= 2
+    assert metrics["completed"] == 3
+    # the last call waited for the two before it.
+    assert metrics["max_wait_seconds"] >= 0.09
+    assert 0 < metrics["mean_wait_seconds"] < metrics["max_wait_seconds"]
+
+
+def test_cancelled_call_leaves_the_queue(io_executor):
+    started = threading.Event()
+    release = threading.Event()
+
+    def _block():
+        started.set()
+        release.wait()
+
+    async def _run():
+        blocking = asyncio.ensure_future(io_executor.run(_block))
+        queued = asyncio.ensure_future(io_executor.run(lambda: None))
+        await asyncio.sleep(0)
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        assert io_executor.metrics["queue_depth"] == 1
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await blocking
+
+    asyncio.run(_run())
+    assert io_executor.metrics["queue_depth"] == 0
+
+
+def test_configure_io_executor(monkeypatch):
+    monkeypatch.setattr(workers, "_io_executor", None)
+    default_executor = get_io_executor()
+    assert default_executor is get_io_executor()
+
+    io_executor = configure_io_executor(max_workers=2)
+    assert io_executor.max_workers == 2
+    assert get_io_executor() is io_executor
+    assert default_executor._executor._shutdown
+    io_executor.shutdown()